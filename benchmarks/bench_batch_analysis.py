@@ -0,0 +1,145 @@
+"""Batch analysis benchmark: serial run_plugin_analysis vs BatchAnalysisExecutor.
+
+Fills a temporary project database with N experiments and runs a CPU-bound
+test plugin (a fixed amount of pure-Python work per experiment) over all of
+them: first serially through PluginManagerClean.run_plugin_analysis (one
+transaction per result), then with the process-pool executor at 1 worker and
+at --workers (default: CPU count), all with the result cache bypassed.
+Finally re-runs the batch with the cache on, where every experiment is a
+hit. Reports wall time, throughput and the speed-up, and checks that every
+experiment has a stored result.
+
+Usage:
+    python benchmarks/bench_batch_analysis.py [--experiments 1000] [--work-ms 20] [--workers N]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from mus1.core.metadata import PluginMetadata
+from mus1.plugins.base_plugin import BasePlugin
+
+CAPABILITY = "burn"
+WORK_MS = 20.0  # overridden in workers through MUS1_BENCH_WORK_MS
+
+
+class BurnPlugin(BasePlugin):
+    """Test plugin that spends a fixed amount of CPU time per experiment."""
+
+    def plugin_self_metadata(self) -> PluginMetadata:
+        return PluginMetadata(name="bench_burn", date_created=datetime(2024, 1, 1), version="1.0",
+                              description="CPU-bound benchmark plugin", author="benchmarks",
+                              plugin_type="analysis", analysis_capabilities=[CAPABILITY])
+
+    def validate_experiment(self, experiment, project_config):
+        pass
+
+    def readable_data_formats(self):
+        return []
+
+    def analysis_capabilities(self):
+        return [CAPABILITY]
+
+    def cache_inputs(self, experiment, plugin_service, capability, project_config):
+        return {"work_ms": float(os.environ.get("MUS1_BENCH_WORK_MS", WORK_MS))}
+
+    def analyze_experiment(self, experiment, plugin_service, capability, project_config):
+        deadline = time.process_time() + float(os.environ.get("MUS1_BENCH_WORK_MS", WORK_MS)) / 1000
+        total = iterations = 0
+        while time.process_time() < deadline:
+            for i in range(1000):
+                total += i * i
+            iterations += 1000
+        return {"status": "success", "capability_executed": capability,
+                "result_data": {"iterations": iterations, "checksum": total % 997}}
+
+
+def _populate(db, count):
+    from mus1.core.metadata import Sex, SubjectDesignation, ProcessingStage
+    from mus1.core.schema import SubjectModel, ExperimentModel
+
+    base = datetime(2024, 1, 1)
+    with db.engine.begin() as conn:
+        conn.execute(SubjectModel.__table__.insert(), [
+            {"id": f"S{i:05d}", "colony_id": None, "sex": Sex.MALE, "designation": SubjectDesignation.EXPERIMENTAL,
+             "birth_date": base, "death_date": None, "individual_genotype": "WT", "individual_treatment": None,
+             "notes": "", "date_added": base}
+            for i in range(count)
+        ])
+        conn.execute(ExperimentModel.__table__.insert(), [
+            {"id": f"E{i:05d}", "subject_id": f"S{i:05d}", "experiment_type": "OpenField",
+             "date_recorded": base + timedelta(minutes=i), "processing_stage": ProcessingStage.PLANNED,
+             "experiment_subtype": None, "notes": "", "date_added": base}
+            for i in range(count)
+        ])
+
+
+def _stored_results(db) -> int:
+    from sqlalchemy import text
+    with db.engine.connect() as conn:
+        return conn.execute(text(
+            "SELECT COUNT(DISTINCT experiment_id) FROM plugin_results WHERE plugin_name = 'bench_burn'"
+        )).scalar()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--experiments", type=int, default=1000)
+    parser.add_argument("--work-ms", type=float, default=WORK_MS)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--skip-serial", action="store_true", help="Only time the executor")
+    args = parser.parse_args()
+    os.environ["MUS1_BENCH_WORK_MS"] = str(args.work_ms)
+
+    import logging
+    logging.getLogger("mus1").setLevel(logging.WARNING)
+
+    from mus1.core.batch_analysis import BatchAnalysisExecutor
+    from mus1.core.metadata import ProjectConfig
+    from mus1.core.plugin_manager_clean import PluginManagerClean
+    from mus1.core.schema import get_database
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = get_database(Path(tmp) / "mus1.db")
+        _populate(db, args.experiments)
+        manager = PluginManagerClean(db)
+        manager.register_plugin(BurnPlugin())
+        config = ProjectConfig(name="bench")
+        ids = [f"E{i:05d}" for i in range(args.experiments)]
+        ideal = args.experiments * args.work_ms / 1000
+
+        print(f"{args.experiments} experiments x {args.work_ms:g} ms CPU each "
+              f"({ideal:.1f} s of work), {os.cpu_count()} CPUs")
+        timings = {}
+        if not args.skip_serial:
+            start = time.perf_counter()
+            for experiment_id in ids:
+                manager.run_plugin_analysis(experiment_id, "bench_burn", CAPABILITY, config, use_cache=False)
+            timings["serial"] = time.perf_counter() - start
+
+        for workers in sorted({1, args.workers}):
+            executor = BatchAnalysisExecutor(manager, "bench_burn", CAPABILITY, config, workers=workers,
+                                             use_cache=False)
+            report = executor.run(ids)
+            timings[f"executor x{workers}"] = report["elapsed_seconds"]
+            if report["succeeded"] != args.experiments:
+                print(f"  executor x{workers}: {report['message']}")
+
+        executor = BatchAnalysisExecutor(manager, "bench_burn", CAPABILITY, config, workers=args.workers)
+        report = executor.run(ids)
+        timings[f"cached x{args.workers}"] = report["elapsed_seconds"]
+        print(f"cache hits on re-run: {report['cached']}/{args.experiments}")
+
+        baseline = timings.get("serial") or timings["executor x1"]
+        for label, elapsed in timings.items():
+            print(f"{label:<14} {elapsed:7.2f} s  {args.experiments / elapsed:8.1f} exp/s  "
+                  f"({baseline / elapsed:.1f}x vs {'serial' if 'serial' in timings else 'x1'})")
+        print(f"experiments with stored results: {_stored_results(db)}/{args.experiments}")
+
+
+if __name__ == "__main__":
+    main()
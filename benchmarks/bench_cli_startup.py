@@ -0,0 +1,140 @@
+"""CLI startup budget check based on `python -X importtime`.
+
+Runs `import mus1.core.simple_cli` in a fresh interpreter with -X importtime
+and reports the total and the heaviest modules, failing if any module that
+should load lazily (SQLAlchemy, pandas, matplotlib, ...) is imported at
+startup. Then times trivial commands end to end (median of --runs, against
+a throwaway MUS1_ROOT) and compares them with the budget.
+
+The budget is strict by default. On a shared or virtualized machine even the
+median of a run set moves by up to ~10% between invocations, so the median
+is taken over 15 runs, and --tolerance-pct lets a noisy host report a median
+that far over the budget as "within tolerance" rather than failing.
+
+Help output is timed for reference only: typer's rich help renderer imports
+rich.markdown and pygments on demand (~100 ms), outside this package.
+
+Exits with status 1 when the budget is exceeded, so it can be used as a
+regression check.
+
+Usage:
+    python benchmarks/bench_cli_startup.py [--budget-ms 200] [--tolerance-pct 0] [--runs 15] [--top 15]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+SRC = Path(__file__).resolve().parent.parent / "src"
+
+# Must not be imported just to start the CLI
+LAZY_MODULES = ("sqlalchemy", "pandas", "numpy", "matplotlib", "shapely", "google.cloud", "PyQt6", "pydantic")
+
+# Held to the budget
+COMMANDS = (
+    ("project", "list"),
+)
+# Reported only
+REFERENCE_COMMANDS = (
+    ("--help",),
+    ("project", "--help"),
+)
+
+
+def _env(root: Path) -> dict:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(SRC), env.get("PYTHONPATH")]))
+    env["MUS1_ROOT"] = str(root)
+    env["PYTHONWARNINGS"] = "ignore"
+    return env
+
+
+def import_profile(env: dict):
+    """Return [(module, self_us, cumulative_us)] for importing the CLI module."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import mus1.core.simple_cli"],
+        env=env, capture_output=True, text=True, check=True,
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((name.strip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+def time_command(args, env: dict, runs: int) -> float:
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-m", "mus1", *args], env=env,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--budget-ms", type=float, default=200.0)
+    parser.add_argument("--tolerance-pct", type=float, default=0.0,
+                        help="Allowed overshoot of the median over the budget, in percent")
+    parser.add_argument("--runs", type=int, default=15)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    root = Path(tempfile.mkdtemp(prefix="mus1_bench_"))
+    (root / "config").mkdir(parents=True)
+    (root / "config" / "config.db").touch()  # marks a valid root
+    env = _env(root)
+    failures = []
+
+    rows = import_profile(env)
+    total_ms = next(cum for name, _, cum in rows if name == "mus1.core.simple_cli") / 1000
+    print(f"import mus1.core.simple_cli: {total_ms:.1f} ms cumulative")
+    print("heaviest modules (cumulative):")
+    for name, self_us, cumulative_us in sorted(rows, key=lambda r: r[2], reverse=True)[:args.top]:
+        print(f"  {cumulative_us / 1000:8.1f} ms  {self_us / 1000:7.1f} ms self  {name}")
+
+    eager = sorted({name for name, _, _ in rows
+                    if any(name == lazy or name.startswith(lazy + ".") for lazy in LAZY_MODULES)})
+    roots = sorted({name.split(".")[0] for name in eager})
+    if eager:
+        failures.append(f"imported at startup: {', '.join(roots)}")
+
+    samples = []
+    for _ in range(args.runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", "pass"], env=env)
+        samples.append((time.perf_counter() - start) * 1000)
+    print(f"bare interpreter: {statistics.median(samples):.0f} ms")
+
+    limit_ms = args.budget_ms * (1 + args.tolerance_pct / 100)
+    for command in COMMANDS:
+        elapsed = time_command(command, env, args.runs)
+        if elapsed <= args.budget_ms:
+            status = "ok"
+        elif elapsed <= limit_ms:
+            status = "within tolerance"
+        else:
+            status = "OVER BUDGET"
+        print(f"mus1 {' '.join(command):<16} {elapsed:7.0f} ms  (budget {args.budget_ms:.0f} ms)  {status}")
+        if elapsed > limit_ms:
+            failures.append(f"'mus1 {' '.join(command)}' took {elapsed:.0f} ms")
+    for command in REFERENCE_COMMANDS:
+        elapsed = time_command(command, env, args.runs)
+        print(f"mus1 {' '.join(command):<16} {elapsed:7.0f} ms  (reference)")
+
+    if failures:
+        print("FAIL: " + "; ".join(failures))
+        sys.exit(1)
+    print("PASS")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""ConfigManager.get() microbenchmark: compiled lookup table vs scope walk.
+
+Fills the five scopes with nested settings, then times hierarchical and
+scope-specific gets against the previous implementation (sort the active
+scopes, walk each one's nested dicts with split('.')). Also times the table
+rebuild that follows a set(). Results of both lookups are compared.
+
+Usage:
+    python benchmarks/bench_config_lookup.py [--keys 2000] [--gets 200000]
+"""
+
+import argparse
+import random
+import tempfile
+import time
+from pathlib import Path
+
+
+def _legacy_get(cm, key, default=None, scope=None):
+    if scope:
+        scope_obj = cm._scopes.get(scope)
+        if scope_obj and scope_obj.is_active:
+            return cm._get_nested_value(scope_obj.data, key, default)
+        return default
+    sorted_scopes = sorted(
+        [s for s in cm._scopes.values() if s.is_active],
+        key=lambda s: s.level,
+        reverse=True
+    )
+    for scope_obj in sorted_scopes:
+        value = cm._get_nested_value(scope_obj.data, key)
+        if value is not None:
+            return value
+    return default
+
+
+def _per_get_ns(fn, keys):
+    start = time.perf_counter()
+    for key in keys:
+        fn(key)
+    return (time.perf_counter() - start) / len(keys) * 1e9
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--keys", type=int, default=2000)
+    parser.add_argument("--gets", type=int, default=200000)
+    args = parser.parse_args()
+
+    from mus1.core.config_manager import ConfigManager
+
+    root = Path(tempfile.mkdtemp(prefix="mus1_bench_"))
+    cm = ConfigManager(root / "config.db")
+    scopes = ["install", "user", "lab", "project", "runtime"]
+    keys = [f"section{i % 20}.group{i % 7}.key{i}" for i in range(args.keys)]
+    rng = random.Random(0)
+    for key in keys:
+        for scope in rng.sample(scopes, 2):
+            cm.set(key, f"{scope}:{key}", scope=scope, persist=False)
+
+    lookups = [rng.choice(keys) for _ in range(args.gets)]
+    lookups += ["missing.key.path"] * (args.gets // 10)
+    rng.shuffle(lookups)
+
+    mismatches = sum(cm.get(k) != _legacy_get(cm, k) for k in keys[:500])
+    mismatches += sum(cm.get(k, scope="user") != _legacy_get(cm, k, scope="user") for k in keys[:500])
+
+    start = time.perf_counter()
+    cm._compile()
+    rebuild_ms = (time.perf_counter() - start) * 1000
+
+    compiled = _per_get_ns(cm.get, lookups)
+    legacy = _per_get_ns(lambda k: _legacy_get(cm, k), lookups)
+    compiled_scope = _per_get_ns(lambda k: cm.get(k, scope="lab"), lookups)
+    legacy_scope = _per_get_ns(lambda k: _legacy_get(cm, k, scope="lab"), lookups)
+
+    print(f"{args.keys} keys x 2 scopes, {len(lookups)} gets (10% misses)")
+    print(f"hierarchical get:   compiled {compiled:7.0f} ns   legacy {legacy:7.0f} ns   ({legacy / compiled:.0f}x)")
+    print(f"scope-specific get: compiled {compiled_scope:7.0f} ns   legacy {legacy_scope:7.0f} ns   ({legacy_scope / compiled_scope:.0f}x)")
+    print(f"table rebuild after a set(): {rebuild_ms:.2f} ms")
+    print(f"result mismatches vs legacy: {mismatches}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""Startup/latency benchmark for the process-wide database registry.
+
+Simulates the lab/settings screens (get_labs, lab_exists, get_lab_members,
+get_lab_colonies per lab) and repeated project opens, comparing the registry
+against the previous behaviour of building a fresh engine and running
+create_tables() on every call.
+
+Usage:
+    python benchmarks/bench_database_registry.py [--labs 10] [--rounds 20]
+"""
+
+import argparse
+import os
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+
+def _legacy_get_database(self):
+    from mus1.core.schema import Database
+    from mus1.core.config_manager import get_config_manager
+    db = Database(str(get_config_manager().db_path))
+    db.create_tables()
+    return db
+
+
+def _time(fn, rounds):
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), max(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--labs", type=int, default=10)
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    root = Path(tempfile.mkdtemp(prefix="mus1_bench_"))
+    os.environ["MUS1_ROOT"] = str(root)
+    (root / "config").mkdir(parents=True, exist_ok=True)
+
+    from mus1.core.config_manager import init_config_manager
+    from mus1.core.metadata import LabDTO
+    from mus1.core.project_manager_clean import ProjectManagerClean
+    from mus1.core.schema import dispose_databases
+    from mus1.core.setup_service import SetupService
+
+    init_config_manager(root / "config" / "config.db")
+    service = SetupService.get_instance()
+
+    start = time.perf_counter()
+    service._get_database()
+    print(f"first _get_database (schema check): {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    for i in range(args.labs):
+        service.create_lab(LabDTO(id=f"lab{i}", name=f"Lab {i}", creator_id="bench"))
+
+    def lab_screen():
+        labs = service.get_labs()
+        for lab_id in labs:
+            service.lab_exists(lab_id)
+            service.get_lab_members(lab_id)
+            service.get_lab_colonies(lab_id)
+
+    project_path = root / "projects" / "bench_project"
+    project_path.mkdir(parents=True)
+    ProjectManagerClean(project_path)
+
+    def open_project():
+        ProjectManagerClean(project_path)
+
+    results = {}
+    results["registry"] = (_time(lab_screen, args.rounds), _time(open_project, args.rounds))
+
+    original = SetupService._get_database
+    SetupService._get_database = _legacy_get_database
+    try:
+        from mus1.core import project_manager_clean as pm_module
+        original_get = pm_module.get_database
+
+        def legacy_get(path):
+            from mus1.core.schema import Database
+            db = Database(str(path))
+            db.create_tables()
+            return db
+
+        pm_module.get_database = legacy_get
+        try:
+            results["per-call engine"] = (_time(lab_screen, args.rounds), _time(open_project, args.rounds))
+        finally:
+            pm_module.get_database = original_get
+    finally:
+        SetupService._get_database = original
+        dispose_databases()
+
+    print(f"{args.labs} labs, {args.rounds} rounds (median / max ms)")
+    print(f"{'mode':<16}{'lab screen':>22}{'project open':>22}")
+    for mode, ((lab_med, lab_max), (open_med, open_max)) in results.items():
+        print(f"{mode:<16}{lab_med:>12.2f} / {lab_max:<7.2f}{open_med:>12.2f} / {open_max:<7.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Listing benchmark: ORM find_all() vs the Core select() record path.
+
+Fills a temporary project database with N subjects and N experiments, then
+lists them with SubjectRepository/ExperimentRepository.find_all() (ORM
+instances copied into dataclasses) and list_records() (slotted records built
+from Core rows). Reports median wall time and the memory held by the result.
+
+Usage:
+    python benchmarks/bench_select_fast_path.py [--rows 100000] [--rounds 5]
+"""
+
+import argparse
+import gc
+import statistics
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from pathlib import Path
+
+
+def _populate(db, rows):
+    from mus1.core.metadata import Sex, SubjectDesignation, ProcessingStage
+    from mus1.core.schema import SubjectModel, ExperimentModel
+
+    base = datetime(2024, 1, 1)
+    sexes = list(Sex)
+    stages = list(ProcessingStage)
+    with db.engine.begin() as conn:
+        conn.execute(SubjectModel.__table__.insert(), [
+            {
+                "id": f"S{i:06d}", "colony_id": None, "sex": sexes[i % len(sexes)],
+                "designation": SubjectDesignation.EXPERIMENTAL, "birth_date": base - timedelta(days=i % 400),
+                "death_date": None, "individual_genotype": "WT" if i % 2 else "KO",
+                "individual_treatment": None, "notes": "", "date_added": base + timedelta(seconds=i),
+            }
+            for i in range(rows)
+        ])
+        conn.execute(ExperimentModel.__table__.insert(), [
+            {
+                "id": f"E{i:06d}", "subject_id": f"S{i:06d}", "experiment_type": "OpenField",
+                "date_recorded": base + timedelta(minutes=i), "processing_stage": stages[i % len(stages)],
+                "experiment_subtype": None, "notes": "", "date_added": base + timedelta(seconds=i),
+            }
+            for i in range(rows)
+        ])
+
+
+def _measure(fn, rounds):
+    samples = []
+    for _ in range(rounds):
+        gc.collect()
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    gc.collect()
+    tracemalloc.start()
+    result = fn()
+    retained = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return statistics.median(samples), retained / (1024 * 1024)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    from mus1.core.schema import get_database
+    from mus1.core.repository import RepositoryFactory
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = get_database(Path(tmp) / "mus1.db")
+        _populate(db, args.rows)
+        repos = RepositoryFactory(db)
+
+        cases = [
+            ("subjects    find_all()", repos.subjects.find_all),
+            ("subjects    list_records()", repos.subjects.list_records),
+            ("experiments find_all()", repos.experiments.find_all),
+            ("experiments list_records()", repos.experiments.list_records),
+        ]
+        print(f"{args.rows} rows per table, median of {args.rounds} rounds")
+        print(f"{'case':<28}{'time (ms)':>12}{'retained (MiB)':>16}")
+        for label, fn in cases:
+            ms, mib = _measure(fn, args.rounds)
+            print(f"{label:<28}{ms:>12.1f}{mib:>16.1f}")
+        db.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,8 @@
 """Executable entrypoint for `python -m mus1`.
 
-Delegates to the clean simple CLI.
+Delegates to the clean simple CLI, through the daemon client (see core/daemon.py).
 """
-from .core.simple_cli import app
+from .core.daemon import main
 
 if __name__ == "__main__":
-    app()
+    main()
@@ -3,38 +3,50 @@ Clean Core Package for MUS1
 Exposes simplified functionalities using the new architecture.
 """
 
-# Import clean domain models and DTOs
-from .metadata import (
-    # Enums
-    Sex, ProcessingStage, SubjectDesignation, InheritancePattern, WorkerProvider, ScanTargetKind,
-    # Domain Models
-    PluginMetadata, Subject, Experiment, VideoFile, Worker, ScanTarget,
-    # DTOs
-    SubjectDTO, ExperimentDTO, VideoFileDTO, WorkerDTO, ScanTargetDTO,
-    # Simple Config
-    ProjectConfig,
-    # Utilities
-    validate_subject_id, validate_experiment_id
-)
-
-# Import clean services and managers
-from .project_manager_clean import ProjectManagerClean
-from .repository import RepositoryFactory, SubjectRepository, ExperimentRepository
-from .service_factory import ProjectServiceFactory
-
-# Keep existing config system (it's already clean)
-from .config_manager import (
-    ConfigManager,
-    get_config_manager,
-    init_config_manager,
-    get_config,
-    set_config,
-    delete_config
-)
+# Exports are resolved lazily (PEP 562) so that importing a light submodule
+# such as mus1.core.config_manager, as the CLI does, does not pull in
+# SQLAlchemy, the repositories and the plugin system.
+_LAZY_EXPORTS = {
+    # Domain models, enums and DTOs
+    **{name: ".metadata" for name in (
+        "Sex", "ProcessingStage", "SubjectDesignation", "InheritancePattern", "WorkerProvider", "ScanTargetKind",
+        "PluginMetadata", "Subject", "Experiment", "VideoFile", "Worker", "ScanTarget",
+        "SubjectDTO", "ExperimentDTO", "VideoFileDTO", "WorkerDTO", "ScanTargetDTO",
+        "ProjectConfig",
+        "validate_subject_id", "validate_experiment_id",
+    )},
+    # Clean services and managers
+    "ProjectManagerClean": ".project_manager_clean",
+    "RepositoryFactory": ".repository",
+    "SubjectRepository": ".repository",
+    "ExperimentRepository": ".repository",
+    "ProjectServiceFactory": ".service_factory",
+    "ProjectReadOnlyError": ".project_lease",
+    # Keep existing config system (it's already clean)
+    **{name: ".config_manager" for name in (
+        "ConfigManager", "get_config_manager", "init_config_manager",
+        "get_config", "set_config", "delete_config",
+    )},
+}
 
 # Clean plugin system (imported separately to avoid circular imports)
 # from .plugin_manager_clean import PluginManagerClean, PluginService
 
+
+def __getattr__(name):
+    module = _LAZY_EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from importlib import import_module
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_EXPORTS))
+
+
 __all__ = [
     # Enums
     "Sex", "ProcessingStage", "SubjectDesignation", "InheritancePattern", "WorkerProvider", "ScanTargetKind",
@@ -48,6 +60,7 @@ __all__ = [
     "validate_subject_id", "validate_experiment_id",
     # Services
     "ProjectManagerClean", "RepositoryFactory", "SubjectRepository", "ExperimentRepository", "ProjectServiceFactory",
+    "ProjectReadOnlyError",
     # Config system
     "ConfigManager", "get_config_manager", "init_config_manager",
     "get_config", "set_config", "delete_config",
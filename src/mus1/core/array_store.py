@@ -0,0 +1,146 @@
+"""
+Side-store for large array results.
+
+Plugin results are stored as JSON in plugin_results.result_data. Per-frame
+arrays (positions, speeds, ...) are written instead as .npy files under the
+project directory and referenced from the JSON by a small marker dict:
+
+    {"__mus1_array__": "plugin_arrays/<id>/<name>.npy", "dtype": "float64", "shape": [9000, 2]}
+
+Reads memory-map the files, so only the pages a caller touches are loaded.
+Small arrays and scalars stay inline.
+"""
+
+import logging
+import shutil
+import uuid
+from pathlib import Path
+from typing import Any, Dict, Mapping
+
+logger = logging.getLogger(__name__)
+
+ARRAY_REF_KEY = "__mus1_array__"
+ARRAY_STORE_DIRNAME = "plugin_arrays"
+INLINE_ARRAY_MAX_BYTES = 64 * 1024  # arrays smaller than this stay inline as JSON lists
+
+
+def is_array_ref(value: Any) -> bool:
+    """Return True if value is a side-store array reference."""
+    return isinstance(value, dict) and ARRAY_REF_KEY in value
+
+
+class ArrayStore:
+    """Writes and memory-maps .npy array files under <project>/plugin_arrays."""
+
+    def __init__(self, project_dir: Path):
+        self.project_dir = Path(project_dir)
+        self.root = self.project_dir / ARRAY_STORE_DIRNAME
+
+    def offload(self, data: Any, pending: Dict[str, Any], *, force: bool = False, prefix: str = "") -> Any:
+        """Return a JSON-safe copy of data, moving large numeric arrays into pending.
+
+        Each offloaded array is replaced by a reference and recorded in
+        pending as {file_name: array}; write_result() then writes them. Small
+        arrays become lists; force=True offloads every numeric array.
+        """
+        import numpy as np
+
+        if isinstance(data, np.ndarray):
+            if data.dtype.hasobject:
+                return data.tolist()
+            if force or data.nbytes >= INLINE_ARRAY_MAX_BYTES:
+                file_name = _unique_file_name(prefix or "array", pending)
+                pending[file_name] = data
+                return {ARRAY_REF_KEY: file_name, "dtype": str(data.dtype), "shape": list(data.shape)}
+            return data.tolist()
+        if isinstance(data, np.generic):
+            return data.item()
+        if isinstance(data, Mapping):
+            return {
+                key: self.offload(value, pending, force=force, prefix=f"{prefix}.{key}" if prefix else str(key))
+                for key, value in data.items()
+            }
+        if isinstance(data, (list, tuple)):
+            return [
+                self.offload(value, pending, force=force, prefix=f"{prefix}.{i}" if prefix else str(i))
+                for i, value in enumerate(data)
+            ]
+        return data
+
+    def write_result(self, pending: Dict[str, Any]) -> Path:
+        """Write pending arrays into a new result directory and return its path.
+
+        Files are written to a hidden staging directory that is renamed into
+        place only once every array is on disk.
+        """
+        import numpy as np
+
+        name = uuid.uuid4().hex
+        staging = self.root / f".tmp-{name}"
+        staging.mkdir(parents=True)
+        try:
+            for file_name, array in pending.items():
+                np.save(staging / file_name, np.ascontiguousarray(array), allow_pickle=False)
+            final = self.root / name
+            staging.rename(final)
+        except Exception:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+        return final
+
+    def discard(self, path: Path) -> None:
+        """Remove a result directory, ignoring errors."""
+        shutil.rmtree(path, ignore_errors=True)
+
+    def finalize_refs(self, data: Any, result_dir: Path) -> Any:
+        """Rewrite staging-relative references to paths relative to the project directory."""
+        if is_array_ref(data):
+            rel = (result_dir / data[ARRAY_REF_KEY]).relative_to(self.project_dir)
+            return {**data, ARRAY_REF_KEY: rel.as_posix()}
+        if isinstance(data, dict):
+            return {key: self.finalize_refs(value, result_dir) for key, value in data.items()}
+        if isinstance(data, list):
+            return [self.finalize_refs(value, result_dir) for value in data]
+        return data
+
+    def load(self, ref: Dict[str, Any], mmap: bool = True):
+        """Load a referenced array, memory-mapped read-only by default."""
+        import numpy as np
+
+        path = self.project_dir / ref[ARRAY_REF_KEY]
+        return np.load(path, mmap_mode="r" if mmap else None, allow_pickle=False)
+
+    def resolve(self, data: Any, mmap: bool = True) -> Any:
+        """Return data with every array reference replaced by the (memory-mapped) array."""
+        if is_array_ref(data):
+            try:
+                return self.load(data, mmap=mmap)
+            except OSError as e:
+                logger.error(f"Missing array for result reference {data[ARRAY_REF_KEY]}: {e}")
+                return None
+        if isinstance(data, dict):
+            return {key: self.resolve(value, mmap=mmap) for key, value in data.items()}
+        if isinstance(data, list):
+            return [self.resolve(value, mmap=mmap) for value in data]
+        return data
+
+    def result_dirs(self, data: Any) -> set:
+        """Return the result directories referenced by data."""
+        dirs = set()
+        if is_array_ref(data):
+            dirs.add((self.project_dir / data[ARRAY_REF_KEY]).parent)
+        elif isinstance(data, dict):
+            for value in data.values():
+                dirs |= self.result_dirs(value)
+        elif isinstance(data, list):
+            for value in data:
+                dirs |= self.result_dirs(value)
+        return dirs
+
+
+def _unique_file_name(name: str, taken: Mapping[str, Any]) -> str:
+    base = "".join(c if c.isalnum() or c in "-_." else "_" for c in str(name)).strip(".") or "array"
+    candidate, n = f"{base}.npy", 1
+    while candidate in taken:
+        candidate, n = f"{base}_{n}.npy", n + 1
+    return candidate
@@ -0,0 +1,421 @@
+"""
+Batch execution of plugin analyses across many experiments.
+
+One plugin capability is run over a batch (or any list of experiments) in a
+pool of worker processes:
+
+- Each worker opens the project database and instantiates the plugin once,
+  then runs analyze_experiment for one experiment at a time.
+- Tasks are handed out over one pipe per worker, so the parent always knows
+  what each worker is running. A task past its timeout is stopped by
+  terminating its worker, which is replaced; cancel() stops dispatching and
+  terminates the busy workers. Workers that keep dying without finishing a
+  task (e.g. a native crash while loading the plugin) are not replaced
+  forever: after MAX_IDLE_RESPAWNS in a row the batch is aborted and the
+  remaining experiments are reported as failed.
+- Workers compute each experiment's memoization key (see result_cache) and
+  report a cache hit instead of running the plugin when the stored result
+  was computed from the same inputs.
+- Results are sent back to the parent and persisted with
+  PluginService.save_analysis_results, many per transaction.
+- Progress is published on the LoggingEventBus (throttled) and passed to an
+  optional progress(done, total) callback.
+
+Plugin classes must be importable by module path, since workers are started
+with the "spawn" method by default (forking a process that holds database
+connections or a Qt event loop is not safe).
+"""
+
+import logging
+import multiprocessing
+import os
+import signal
+import threading
+import time
+from collections import deque
+from multiprocessing.connection import wait
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional
+
+from .logging_bus import LoggingEventBus
+from .metadata import ProjectConfig
+from .plugin_manager_clean import PluginManagerClean, PluginService
+from .schema import Database
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_COMMIT_EVERY = 50
+FLUSH_INTERVAL = 2.0      # seconds between result commits while a batch runs
+PROGRESS_INTERVAL = 1.0   # seconds between progress events on the logging bus
+TERMINATE_GRACE = 2.0     # seconds to wait after SIGTERM before SIGKILL
+MAX_IDLE_RESPAWNS = 3     # consecutive worker deaths without a finished task before aborting
+
+_LOG_SOURCE = "BatchAnalysis"
+
+
+# ===========================================
+# WORKER PROCESS
+# ===========================================
+
+def _worker_main(conn, db_path: str, video_root: Optional[Path], plugin_cls: type,
+                 capability: str, project_config: ProjectConfig, use_cache: bool) -> None:
+    # Ctrl-C reaches the whole process group; the parent decides what to cancel
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    try:
+        db = Database(db_path)
+        db.video_root = video_root
+        service = PluginService(db)
+        plugin = plugin_cls()
+    except Exception as e:
+        conn.send(("init_failed", None, f"{type(e).__name__}: {e}", None))
+        return
+    conn.send(("ready", None, None, None))
+
+    while True:
+        try:
+            experiment_id = conn.recv()
+        except EOFError:
+            break
+        if experiment_id is None:
+            break
+        cache_key = None
+        try:
+            experiment = service.get_experiment_by_id(experiment_id)
+            if experiment is None:
+                conn.send(("missing", experiment_id, f"Experiment {experiment_id} not found", None))
+                continue
+            try:
+                cache_key = service.result_cache_key(plugin, experiment, capability, project_config)
+            except Exception as e:
+                logger.warning(f"Could not compute cache key for {experiment_id}; result will not be memoized: {e}")
+            if use_cache and cache_key and service.result_cache.lookup(cache_key, experiment_id) is not None:
+                conn.send(("cached", experiment_id, None, cache_key))
+                continue
+            result = plugin.analyze_experiment(experiment, service, capability, project_config)
+        except Exception as e:
+            result = {"status": "failed", "error": str(e), "capability_executed": capability}
+        try:
+            conn.send(("done", experiment_id, result, cache_key))
+        except Exception as e:
+            conn.send(("done", experiment_id, {
+                "status": "failed", "error": f"Result could not be returned: {e}", "capability_executed": capability,
+            }, None))
+    db.dispose()
+
+
+class _Worker:
+    """Parent-side handle of one worker process."""
+
+    def __init__(self, ctx, args: tuple):
+        self.conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(target=_worker_main, args=(child_conn,) + args, daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.ready = False
+        self.task: Optional[str] = None
+        self.started = 0.0
+
+    def assign(self, experiment_id: str) -> None:
+        self.conn.send(experiment_id)
+        self.task = experiment_id
+        self.started = time.monotonic()
+
+    def stop(self, graceful: bool = True) -> None:
+        if graceful and self.process.is_alive():
+            try:
+                self.conn.send(None)
+            except OSError:
+                pass
+            self.process.join(TERMINATE_GRACE)
+        if self.process.is_alive():
+            self.process.terminate()
+            self.process.join(TERMINATE_GRACE)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.conn.close()
+
+
+# ===========================================
+# EXECUTOR
+# ===========================================
+
+class BatchAnalysisExecutor:
+    """Run one plugin capability over many experiments in worker processes."""
+
+    def __init__(self, plugin_manager: PluginManagerClean, plugin_name: str, capability: str,
+                 project_config: ProjectConfig, workers: Optional[int] = None,
+                 task_timeout: Optional[float] = None, commit_every: int = DEFAULT_COMMIT_EVERY,
+                 use_cache: bool = True, start_method: str = "spawn"):
+        self.plugin_manager = plugin_manager
+        self.plugin_service = plugin_manager.plugin_service
+        self.plugin_name = plugin_name
+        self.capability = capability
+        self.project_config = project_config
+        self.workers = workers or os.cpu_count() or 1
+        self.task_timeout = task_timeout
+        self.commit_every = max(commit_every, 1)
+        self.use_cache = use_cache
+        self.plugin_version = ""
+        self._ctx = multiprocessing.get_context(start_method)
+        self._cancel = threading.Event()
+        self._bus = LoggingEventBus.get_instance()
+
+    def cancel(self) -> None:
+        """Stop the running batch: no new tasks, busy workers are terminated. Thread-safe."""
+        self._cancel.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    def run_batch(self, batch_id: str, progress: Optional[Callable[[int, int], None]] = None) -> Dict[str, Any]:
+        """Analyse every experiment of a stored batch."""
+        batch = self.plugin_service.repos.batches.get(batch_id)
+        if batch is None:
+            return {"success": False, "message": f"Batch '{batch_id}' not found"}
+        return self.run(batch["experiment_ids"], progress=progress)
+
+    def run(self, experiment_ids: Iterable[str],
+            progress: Optional[Callable[[int, int], None]] = None) -> Dict[str, Any]:
+        """Analyse the given experiments and persist their results.
+
+        Returns {success, message, total, succeeded, cached, failed,
+        timed_out, cancelled, elapsed_seconds, results}; results lists
+        {experiment_id, status, error, cached} for every experiment.
+        succeeded includes the cache hits counted in cached.
+        """
+        plugin = self.plugin_manager.get_plugin_by_name(self.plugin_name)
+        if plugin is None:
+            return {"success": False, "message": f"Plugin {self.plugin_name} not found"}
+        if self.capability not in (plugin.analysis_capabilities() or []):
+            return {"success": False, "message": f"Plugin {self.plugin_name} does not provide '{self.capability}'"}
+        db_file = self.plugin_service.db.engine.url.database
+        if not db_file or db_file == ":memory:":
+            return {"success": False, "message": "Batch analysis needs a file-backed project database"}
+
+        self._cancel.clear()
+        self.plugin_version = plugin.plugin_self_metadata().version
+        run = _BatchRun(self, list(dict.fromkeys(experiment_ids)), progress,
+                        (db_file, self.plugin_service.db.video_root, type(plugin), self.capability,
+                         self.project_config, self.use_cache))
+        return run.execute()
+
+
+class _BatchRun:
+    """State of one BatchAnalysisExecutor.run call."""
+
+    def __init__(self, executor: BatchAnalysisExecutor, experiment_ids: List[str],
+                 progress: Optional[Callable[[int, int], None]], worker_args: tuple):
+        self.ex = executor
+        self.experiment_ids = experiment_ids
+        self.total = len(experiment_ids)
+        self.pending: Deque[str] = deque(experiment_ids)
+        self.progress = progress
+        self.worker_args = worker_args
+        self.workers: List[_Worker] = []
+        self.outcomes: Dict[str, Dict[str, Any]] = {}
+        self.to_save: List[Dict[str, Any]] = []
+        self.last_flush = self.last_progress = time.monotonic()
+        self.init_error: Optional[str] = None
+        self.idle_respawns = 0  # workers replaced since the last finished task
+
+    # ---------- main loop ----------
+    def execute(self) -> Dict[str, Any]:
+        ex = self.ex
+        started = time.monotonic()
+        self._log(f"Running {ex.plugin_name}/{ex.capability} on {self.total} experiments "
+                  f"with {min(ex.workers, self.total)} workers")
+        try:
+            self.workers = [_Worker(ex._ctx, self.worker_args) for _ in range(min(ex.workers, self.total))]
+            while self.pending or any(w.task for w in self.workers):
+                try:
+                    self._step()
+                except KeyboardInterrupt:
+                    ex.cancel()
+                if self.init_error:
+                    self._abandon_remaining("failed", self.init_error)
+                    break
+                if ex.cancelled:
+                    self._abandon_remaining("cancelled", "")
+                    self._log(f"Cancelled {ex.plugin_name}/{ex.capability} batch", "warning")
+                    break
+        finally:
+            for worker in self.workers:
+                worker.stop(graceful=worker.task is None)
+            self._flush()
+        return self._report(time.monotonic() - started)
+
+    def _step(self) -> None:
+        for worker in self.workers:
+            if worker.ready and worker.task is None and self.pending and not self.ex.cancelled:
+                worker.assign(self.pending.popleft())
+
+        by_conn = {w.conn: w for w in self.workers}
+        by_sentinel = {w.process.sentinel: w for w in self.workers}
+        for ready in wait(list(by_conn) + list(by_sentinel), timeout=self._wait_timeout()):
+            worker = by_conn.get(ready) or by_sentinel[ready]
+            if worker not in self.workers:
+                continue  # already replaced in this round
+            if ready in by_conn:
+                try:
+                    self._receive(worker, *worker.conn.recv())
+                    continue
+                except (EOFError, OSError):
+                    pass
+            if not worker.process.is_alive() or ready not in by_conn:
+                worker.process.join(TERMINATE_GRACE)  # the sentinel fires before the exit code is available
+                self._replace(worker, f"Worker exited with code {worker.process.exitcode}")
+
+        if self.ex.task_timeout:
+            now = time.monotonic()
+            for worker in list(self.workers):
+                if worker.task and now - worker.started > self.ex.task_timeout:
+                    self._replace(worker, f"Timed out after {self.ex.task_timeout:g}s", status="timed_out")
+
+        now = time.monotonic()
+        if len(self.to_save) >= self.ex.commit_every or (self.to_save and now - self.last_flush >= FLUSH_INTERVAL):
+            self._flush()
+        if now - self.last_progress >= PROGRESS_INTERVAL:
+            self._publish_progress()
+
+    def _wait_timeout(self) -> float:
+        timeout = PROGRESS_INTERVAL
+        if self.ex.task_timeout:
+            now = time.monotonic()
+            for worker in self.workers:
+                if worker.task:
+                    timeout = min(timeout, max(worker.started + self.ex.task_timeout - now, 0.0))
+        return timeout
+
+    def _receive(self, worker: _Worker, kind: str, experiment_id: Optional[str], payload: Any,
+                 cache_key: Optional[str]) -> None:
+        if kind in ("missing", "cached", "done"):
+            self.idle_respawns = 0
+        if kind == "ready":
+            worker.ready = True
+        elif kind == "init_failed":
+            self.init_error = f"Plugin {self.ex.plugin_name} could not start in a worker: {payload}"
+            self._log(self.init_error, "error")
+        elif kind == "missing":
+            worker.task = None
+            self._record(experiment_id, "failed", payload)
+        elif kind == "cached":
+            worker.task = None
+            self._record(experiment_id, "success", "", cached=True)
+        elif kind == "done":
+            worker.task = None
+            status = payload.get("status", "success")
+            error = payload.get("error", "")
+            self.to_save.append({
+                "experiment_id": experiment_id,
+                "plugin_name": self.ex.plugin_name,
+                "capability": self.ex.capability,
+                "result_data": payload.get("result_data", {}),
+                "status": status,
+                "error_message": error,
+                "output_files": payload.get("output_file_paths", []),
+                "arrays": payload.get("result_arrays"),
+                "cache_key": cache_key,
+                "plugin_version": self.ex.plugin_version,
+            })
+            self._record(experiment_id, status, error)
+
+    def _replace(self, worker: _Worker, error: str, status: str = "failed") -> None:
+        # Terminate a stuck or dead worker, fail its task, and start a fresh one
+        task = worker.task
+        worker.stop(graceful=False)
+        self.workers.remove(worker)
+        if task:
+            logger.warning(f"{self.ex.plugin_name}/{self.ex.capability} on {task}: {error}")
+            self.to_save.append({
+                "experiment_id": task, "plugin_name": self.ex.plugin_name, "capability": self.ex.capability,
+                "result_data": {}, "status": "failed", "error_message": error,
+            })
+            self._record(task, status, error)
+        else:
+            # Died without a task: likely crashing on startup, so do not respawn forever
+            self.idle_respawns += 1
+            if self.idle_respawns >= MAX_IDLE_RESPAWNS and not self.init_error:
+                self.init_error = (f"Workers for {self.ex.plugin_name} exited {self.idle_respawns} times in a row "
+                                   f"without finishing a task ({error})")
+                self._log(self.init_error, "error")
+        if self.pending and not self.ex.cancelled and not self.init_error:
+            self.workers.append(_Worker(self.ex._ctx, self.worker_args))
+
+    def _abandon_remaining(self, status: str, error: str) -> None:
+        # Stop busy workers and give their tasks and every pending experiment a final status
+        for worker in list(self.workers):
+            if worker.task:
+                task = worker.task
+                worker.stop(graceful=False)
+                self.workers.remove(worker)
+                self.outcomes[task] = {"experiment_id": task, "status": status, "error": error, "cached": False}
+        while self.pending:
+            task = self.pending.popleft()
+            self.outcomes[task] = {"experiment_id": task, "status": status, "error": error, "cached": False}
+
+    # ---------- results ----------
+    def _record(self, experiment_id: str, status: str, error: str, cached: bool = False) -> None:
+        self.outcomes[experiment_id] = {"experiment_id": experiment_id, "status": status, "error": error,
+                                        "cached": cached}
+        if self.progress:
+            self.progress(len(self.outcomes), self.total)
+
+    def _flush(self) -> None:
+        self.last_flush = time.monotonic()
+        if not self.to_save:
+            return
+        records, self.to_save = self.to_save, []
+        try:
+            self.ex.plugin_service.save_analysis_results(records)
+        except Exception as e:
+            # Fall back to one transaction per result so one bad result does not lose the rest
+            logger.warning(f"Saving {len(records)} results in one transaction failed ({e}); saving individually")
+            for record in records:
+                try:
+                    self.ex.plugin_service.save_analysis_results([record])
+                except Exception as record_error:
+                    logger.error(f"Could not save result for {record['experiment_id']}: {record_error}")
+                    self.outcomes[record["experiment_id"]].update(
+                        status="failed", error=f"Result not saved: {record_error}")
+
+    def _publish_progress(self) -> None:
+        self.last_progress = time.monotonic()
+        failed = sum(1 for o in self.outcomes.values() if o["status"] not in ("success", "cancelled"))
+        cached = sum(1 for o in self.outcomes.values() if o["cached"])
+        self._log(f"{self.ex.plugin_name}/{self.ex.capability}: {len(self.outcomes)}/{self.total} done"
+                  + (f", {cached} from cache" if cached else "") + (f", {failed} failed" if failed else ""))
+
+    def _report(self, elapsed: float) -> Dict[str, Any]:
+        results = [self.outcomes[e] for e in self.experiment_ids if e in self.outcomes]
+        counts = {status: sum(1 for r in results if r["status"] == status)
+                  for status in ("success", "timed_out", "cancelled")}
+        failed = len(results) - sum(counts.values())
+        succeeded = counts["success"]
+        cached = sum(1 for r in results if r["cached"])
+        if self.init_error:
+            message = self.init_error
+        else:
+            message = f"Analysed {succeeded}/{self.total} experiments in {elapsed:.1f}s"
+            extras = [f"{n} {label}" for n, label in ((cached, "from cache"), (failed, "failed"),
+                                                      (counts["timed_out"], "timed out"),
+                                                      (counts["cancelled"], "cancelled")) if n]
+            if extras:
+                message += f" ({', '.join(extras)})"
+        self._log(message, "error" if self.init_error else "success" if succeeded == self.total else "warning")
+        return {
+            "success": self.init_error is None and not self.ex.cancelled,
+            "message": message,
+            "total": self.total,
+            "succeeded": succeeded,
+            "cached": cached,
+            "failed": failed,
+            "timed_out": counts["timed_out"],
+            "cancelled": counts["cancelled"],
+            "elapsed_seconds": round(elapsed, 3),
+            "results": results,
+        }
+
+    def _log(self, message: str, level: str = "info") -> None:
+        self.ex._bus.log(message, level, _LOG_SOURCE)
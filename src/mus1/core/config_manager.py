@@ -11,6 +11,12 @@ Configuration Hierarchy (highest to lowest precedence):
 4. User Profile
 5. Installation Defaults
 
+Change notification: subscribe(prefix, callback) delivers coalesced
+{key: value} events for changes made through this manager, and
+poll_changes() picks up changes made by other processes (or other
+ConfigManager instances) from a version counter kept by triggers on
+config_entries.
+
 
 Date: 2025-09-14
 """
@@ -20,8 +26,9 @@ import json
 import sqlite3
 import logging
 import platform
+import threading
 from pathlib import Path
-from typing import Dict, Any, Optional, List, Union, Callable
+from typing import Dict, Any, Optional, List, Union, Callable, Tuple
 from dataclasses import dataclass, field
 from datetime import datetime
 from contextlib import contextmanager
@@ -232,8 +239,17 @@ class ConfigManager:
     """
     Unified configuration manager that provides hierarchical configuration
     with SQLite persistence and automatic migration support.
+
+    Lookups go through a compiled table: every dotted key path of every
+    active scope, resolved by precedence into one flat dict, so get() is a
+    single dict lookup. The table is rebuilt lazily on the first get() after
+    set(), delete(), import or scope (de)activation marks it dirty.
+    Scope-specific lookups are memoized the same way, one table per scope.
     """
 
+    # How often GUI components should call poll_changes()
+    POLL_INTERVAL_MS = 2000
+
     # Configuration scope levels (higher = higher precedence)
     SCOPE_INSTALL = 10
     SCOPE_USER = 20
@@ -263,14 +279,20 @@ class ConfigManager:
 
         self._connection: Optional[sqlite3.Connection] = None
         # Use thread-local storage to avoid cross-thread sqlite usage
-        import threading
         self._local = threading.local()
         self._scopes: Dict[str, ConfigScope] = {}
-        self._cache: Dict[str, Any] = {}
-        self._cache_dirty = False
+        self._cache: Dict[str, Any] = {}  # dotted key -> resolved value
+        self._scope_cache: Dict[str, Dict[str, Any]] = {}  # scope -> dotted key -> value
+        self._cache_dirty = True
+        # Values set with persist=False, re-applied when scopes are reloaded
+        self._volatile: Dict[str, Dict[str, Any]] = {}
+        self._subscribers: Dict[int, Tuple[str, Callable[[Dict[str, Any]], None]]] = {}
+        self._next_subscription = 0
+        self._subscribers_lock = threading.Lock()
 
         # Initialize database and scopes
         self._init_database()
+        self._seen_version = self.config_version()
         self._init_scopes()
 
         logger.info(f"ConfigManager initialized with database at {self.db_path}")
@@ -299,6 +321,46 @@ class ConfigManager:
             # Keep thread-local connection alive for performance within the same thread
             pass
 
+    @contextmanager
+    def batch(self):
+        """Group set()/delete() calls on this thread into one SQLite transaction.
+
+        Nested batches join the outermost one, which commits on exit and then
+        notifies subscribers once. On an exception the transaction is rolled
+        back and the scopes touched in the batch are reloaded from the database.
+        """
+        depth = getattr(self._local, "batch_depth", 0)
+        if depth == 0:
+            self._local.batch_scopes = set()
+            self._local.batch_changes = set()
+        self._local.batch_depth = depth + 1
+        with self._get_connection() as conn:
+            pass
+        try:
+            yield self
+            if depth == 0:
+                conn.commit()
+        except BaseException:
+            if depth == 0:
+                conn.rollback()
+                for scope in self._local.batch_scopes:
+                    self._load_scope_data(scope)
+            raise
+        finally:
+            self._local.batch_depth = depth
+        if depth == 0:
+            # One coalesced event per subscriber for the whole batch
+            self._dispatch(self._local.batch_changes)
+
+    transaction = batch
+
+    def _commit(self, conn: sqlite3.Connection, scope: str):
+        """Commit now, or leave it to the enclosing batch()."""
+        if getattr(self._local, "batch_depth", 0):
+            self._local.batch_scopes.add(scope)
+        else:
+            conn.commit()
+
     def _init_database(self):
         """Initialize the database schema."""
         with self._get_connection() as conn:
@@ -344,6 +406,23 @@ class ConfigManager:
                 ON config_entries(scope_name, key_path)
             """)
 
+            # Change counter for cross-process polling, bumped by any writer
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS config_version (
+                    id INTEGER PRIMARY KEY CHECK (id = 1),
+                    version INTEGER NOT NULL
+                )
+            """)
+            conn.execute("INSERT OR IGNORE INTO config_version (id, version) VALUES (1, 0)")
+            for event in ("INSERT", "UPDATE", "DELETE"):
+                conn.execute(f"""
+                    CREATE TRIGGER IF NOT EXISTS config_entries_version_{event.lower()}
+                    AFTER {event} ON config_entries
+                    BEGIN
+                        UPDATE config_version SET version = version + 1 WHERE id = 1;
+                    END
+                """)
+
             conn.commit()
 
     def _init_scopes(self):
@@ -385,11 +464,20 @@ class ConfigManager:
                 except json.JSONDecodeError as e:
                     logger.warning(f"Failed to decode config value for {row['key_path']}: {e}")
 
-            self._scopes[scope_name] = ConfigScope(
-                name=scope_name,
-                level=self._get_scope_level(scope_name),
-                data=scope_data
-            )
+            for key_path, value in self._volatile.get(scope_name, {}).items():
+                self._set_nested_value(scope_data, key_path, value)
+
+            existing = self._scopes.get(scope_name)
+            if existing is not None:
+                # Reload: keep the scope's path and active state
+                existing.data = scope_data
+            else:
+                self._scopes[scope_name] = ConfigScope(
+                    name=scope_name,
+                    level=self._get_scope_level(scope_name),
+                    data=scope_data
+                )
+            self._cache_dirty = True
 
     def _get_scope_level(self, scope_name: str) -> int:
         """Get the precedence level for a scope."""
@@ -426,6 +514,30 @@ class ConfigManager:
         except (KeyError, TypeError):
             return default
 
+    def _flatten(self, data: dict, prefix: str, out: Dict[str, Any]):
+        """Add every dotted key path of a nested dict (intermediate dicts included) to out."""
+        for key, value in data.items():
+            # Keys containing dots are unreachable through dot notation
+            if not isinstance(key, str) or '.' in key:
+                continue
+            path = f"{prefix}.{key}" if prefix else key
+            out[path] = value
+            if isinstance(value, dict):
+                self._flatten(value, path, out)
+
+    def _compile(self):
+        """Rebuild the flat lookup table from the active scopes."""
+        # Cleared first: a set() racing the rebuild marks it dirty again
+        self._cache_dirty = False
+        table: Dict[str, Any] = {}
+        for scope_obj in sorted((s for s in self._scopes.values() if s.is_active), key=lambda s: s.level):
+            flat: Dict[str, Any] = {}
+            self._flatten(scope_obj.data, "", flat)
+            # Lowest precedence first; None never shadows a lower scope's value
+            table.update((k, v) for k, v in flat.items() if v is not None)
+        self._scope_cache = {}
+        self._cache = table
+
     def get(self, key: str, default=None, scope: Optional[str] = None) -> Any:
         """
         Get a configuration value using hierarchical lookup.
@@ -438,26 +550,24 @@ class ConfigManager:
         Returns:
             Configuration value or default
         """
+        if self._cache_dirty:
+            self._compile()
+
         if scope:
             # Query specific scope only
             scope_obj = self._scopes.get(scope)
-            if scope_obj and scope_obj.is_active:
-                return self._get_nested_value(scope_obj.data, key, default)
-            return default
-
-        # Hierarchical lookup (highest precedence first)
-        sorted_scopes = sorted(
-            [s for s in self._scopes.values() if s.is_active],
-            key=lambda s: s.level,
-            reverse=True
-        )
-
-        for scope_obj in sorted_scopes:
-            value = self._get_nested_value(scope_obj.data, key)
-            if value is not None:
-                return value
-
-        return default
+            if not (scope_obj and scope_obj.is_active):
+                return default
+            table = self._scope_cache.get(scope)
+            if table is None:
+                table = {}
+                self._flatten(scope_obj.data, "", table)
+                self._scope_cache[scope] = table
+            return table.get(key, default)
+
+        # Hierarchical lookup, precompiled by precedence
+        value = self._cache.get(key)
+        return default if value is None else value
 
     def set(self, key: str, value: Any, scope: str = "user", persist: bool = True):
         """
@@ -476,11 +586,15 @@ class ConfigManager:
         self._set_nested_value(scope_obj.data, key, value)
 
         if persist:
+            self._volatile.get(scope, {}).pop(key, None)
             self._persist_value(scope, key, value)
+        else:
+            self._volatile.setdefault(scope, {})[key] = value
 
         # Invalidate cache
         self._cache_dirty = True
         logger.debug(f"Set config {scope}.{key} = {value}")
+        self._notify(key)
 
     def _persist_value(self, scope: str, key: str, value: Any):
         """Persist a configuration value to the database."""
@@ -493,7 +607,7 @@ class ConfigManager:
                 VALUES (?, ?, ?, CURRENT_TIMESTAMP)
             """, (scope, key, value_json))
 
-            conn.commit()
+            self._commit(conn, scope)
 
     def delete(self, key: str, scope: str):
         """Delete a configuration key."""
@@ -502,15 +616,17 @@ class ConfigManager:
 
         scope_obj = self._scopes[scope]
         self._delete_nested_value(scope_obj.data, key)
+        self._volatile.get(scope, {}).pop(key, None)
 
         with self._get_connection() as conn:
             conn.execute("""
                 DELETE FROM config_entries
                 WHERE scope_name = ? AND key_path = ?
             """, (scope, key))
-            conn.commit()
+            self._commit(conn, scope)
 
         self._cache_dirty = True
+        self._notify(key)
 
     def _delete_nested_value(self, data: dict, key_path: str):
         """Delete a value from a nested dictionary using dot notation."""
@@ -552,6 +668,8 @@ class ConfigManager:
             raise ValueError(f"Unknown scope: {scope}")
 
         self._scopes[scope].is_active = True
+        self._cache_dirty = True
+        self._notify_scope(scope)
 
         with self._get_connection() as conn:
             conn.execute("""
@@ -577,6 +695,7 @@ class ConfigManager:
             conn.commit()
 
         self._cache_dirty = True
+        self._notify_scope(scope)
 
     def get_all_scopes(self) -> Dict[str, ConfigScope]:
         """Get all configuration scopes."""
@@ -601,21 +720,28 @@ class ConfigManager:
         with open(file_path, 'r') as f:
             data = json.load(f)
 
-        if not merge:
-            # Clear existing data for this scope
-            self._clear_scope_data(scope)
+        # One transaction for the whole import
+        with self.batch():
+            if not merge:
+                # Clear existing data for this scope
+                self._clear_scope_data(scope)
 
-        # Import the new data
-        self._import_nested_data(scope, data, "")
+            # Import the new data
+            self._import_nested_data(scope, data, "")
 
     def _clear_scope_data(self, scope: str):
         """Clear all data for a scope."""
         if scope in self._scopes:
+            cleared = self._leaf_keys(self._scopes[scope].data)
             self._scopes[scope].data.clear()
+            self._volatile.pop(scope, None)
+            self._cache_dirty = True
+            for key in cleared:
+                self._notify(key)
 
         with self._get_connection() as conn:
             conn.execute("DELETE FROM config_entries WHERE scope_name = ?", (scope,))
-            conn.commit()
+            self._commit(conn, scope)
 
     def _import_nested_data(self, scope: str, data: dict, prefix: str):
         """Recursively import nested configuration data."""
@@ -627,6 +753,92 @@ class ConfigManager:
             else:
                 self.set(full_key, value, scope)
 
+    # ---------- change subscriptions ----------
+    def subscribe(self, prefix: str, callback: Callable[[Dict[str, Any]], None]) -> Callable[[], None]:
+        """Call callback({key: effective value}) when keys under prefix change.
+
+        prefix "ui" matches "ui", "ui.theme", ... and also changes to a parent
+        such as set("ui", {...}); "" matches everything. Changes inside a
+        batch() arrive as one event. Callbacks run on the thread that made
+        the change or called poll_changes(). Returns an unsubscribe function.
+        """
+        with self._subscribers_lock:
+            token = self._next_subscription
+            self._next_subscription += 1
+            self._subscribers[token] = (prefix, callback)
+
+        def unsubscribe():
+            with self._subscribers_lock:
+                self._subscribers.pop(token, None)
+
+        return unsubscribe
+
+    def _notify(self, key: str):
+        if getattr(self._local, "batch_depth", 0):
+            self._local.batch_changes.add(key)
+        else:
+            self._dispatch({key})
+
+    def _leaf_keys(self, data: dict) -> set:
+        flat: Dict[str, Any] = {}
+        self._flatten(data, "", flat)
+        return {key for key, value in flat.items() if not isinstance(value, dict)}
+
+    def _notify_scope(self, scope: str):
+        keys = self._leaf_keys(self._scopes[scope].data)
+        if getattr(self._local, "batch_depth", 0):
+            self._local.batch_changes.update(keys)
+        else:
+            self._dispatch(keys)
+
+    def _dispatch(self, keys):
+        if not keys:
+            return
+        with self._subscribers_lock:
+            subscribers = list(self._subscribers.values())
+        for prefix, callback in subscribers:
+            relevant = [key for key in keys if _key_related(key, prefix)]
+            if not relevant:
+                continue
+            try:
+                callback({key: self.get(key) for key in relevant})
+            except Exception as e:
+                logger.warning(f"Config change subscriber for '{prefix}' failed: {e}")
+
+    def config_version(self) -> int:
+        """Counter bumped by every write to config_entries, from any process."""
+        with self._get_connection() as conn:
+            row = conn.execute("SELECT version FROM config_version WHERE id = 1").fetchone()
+        return row[0] if row else 0
+
+    def poll_changes(self) -> Dict[str, Any]:
+        """Reload if another writer changed the database; notify and return changed keys.
+
+        Costs one single-row query when nothing changed, so it can be called
+        from a timer (see POLL_INTERVAL_MS).
+        """
+        version = self.config_version()
+        if version == self._seen_version:
+            return {}
+        self._seen_version = version
+        if self._cache_dirty:
+            self._compile()
+        before = self._cache
+        for scope_name in list(self._scopes):
+            self._load_scope_data(scope_name)
+        self._compile()
+        after = self._cache
+        # Leaf keys only; our own writes reload to identical values
+        changed = {
+            key for key in before.keys() | after.keys()
+            if before.get(key) != after.get(key)
+            and not (isinstance(before.get(key), dict) and isinstance(after.get(key), dict))
+        }
+        if changed:
+            logger.debug(f"Config changed externally: {sorted(changed)}")
+            self._dispatch(changed)
+        return {key: after.get(key) for key in changed}
+
     def get_config_hash(self) -> str:
         """Get a hash of the current configuration state."""
         config_str = json.dumps(self._get_hierarchical_config(), sort_keys=True, default=str)
@@ -665,6 +877,12 @@ class ConfigManager:
         logger.info("ConfigManager cleanup completed")
 
 
+def _key_related(key: str, prefix: str) -> bool:
+    """True if key is prefix, lies under it, or is one of its parents."""
+    return (not prefix or key == prefix or key.startswith(prefix + ".")
+            or prefix.startswith(key + "."))
+
+
 # Global configuration manager instance
 _config_manager: Optional[ConfigManager] = None
 
@@ -680,6 +898,10 @@ def get_config_manager() -> ConfigManager:
 def init_config_manager(db_path: Optional[Path] = None) -> ConfigManager:
     """Initialize the global configuration manager."""
     global _config_manager
+    if _config_manager is not None:
+        # Root change: drop cached SQLAlchemy engines bound to the previous root
+        from .schema import dispose_databases
+        dispose_databases()
     _config_manager = ConfigManager(db_path)
     return _config_manager
 
@@ -700,6 +922,11 @@ def delete_config(key: str, scope: str):
     get_config_manager().delete(key, scope)
 
 
+def config_batch():
+    """Group set_config()/delete_config() calls into one transaction (context manager)."""
+    return get_config_manager().batch()
+
+
 # ===========================================
 # Convenience helpers for app/lab paths
 # ===========================================
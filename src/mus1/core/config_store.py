@@ -0,0 +1,191 @@
+"""
+Write-behind, atomic persistence for project.json.
+
+Settings mutations used to rewrite project.json synchronously and in place,
+so a crash mid-write left a truncated file. ConfigStore instead:
+
+- coalesces saves inside a short debounce window and writes once, from a
+  timer thread, with the latest state;
+- writes through a temp file + fsync + atomic rename (plus a directory
+  fsync), so readers see either the old or the new file, never a partial one;
+- keeps large settings sections (batches, scan targets) in sibling files
+  (project.<section>.json) that are only rewritten when they change.
+
+flush() writes pending state immediately; it is called from
+ProjectManagerClean.cleanup() and, for every live store, at interpreter exit.
+"""
+
+import atexit
+import json
+import logging
+import os
+import threading
+import uuid
+import weakref
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DEBOUNCE = 0.5  # seconds
+SECTION_KEYS = ("batches", "scan_targets")
+
+
+def atomic_write_json(path: Path, data: Any, indent: Optional[int] = None) -> None:
+    """Write JSON to path via temp file, fsync and atomic rename."""
+    path = Path(path)
+    tmp = path.with_name(f".{path.name}.{uuid.uuid4().hex[:8]}.tmp")
+    try:
+        with open(tmp, "w") as f:
+            json.dump(data, f, indent=indent)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
+        raise
+    _fsync_dir(path.parent)
+
+
+def _fsync_dir(directory: Path) -> None:
+    # Makes the rename itself durable; not supported on every platform/filesystem
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def section_path(config_path: Path, key: str) -> Path:
+    """Sibling file holding one large settings section of config_path."""
+    config_path = Path(config_path)
+    return config_path.with_name(f"{config_path.stem}.{key}.json")
+
+
+def config_files(config_path: Path) -> List[Path]:
+    """project.json plus its existing section files."""
+    config_path = Path(config_path)
+    files = [config_path] if config_path.exists() else []
+    files.extend(sorted(config_path.parent.glob(f"{config_path.stem}.*.json")))
+    return files
+
+
+class ConfigStore:
+    """Debounced, atomic writer for one project.json and its section files."""
+
+    def __init__(self, path: Path, debounce: float = DEFAULT_DEBOUNCE, sections: Sequence[str] = SECTION_KEYS):
+        self.path = Path(path)
+        self.debounce = debounce
+        self.sections = tuple(sections)
+        self._lock = threading.RLock()
+        self._pending: Optional[Dict[str, Any]] = None
+        self._timer: Optional[threading.Timer] = None
+        self._written: Dict[str, str] = {}  # section -> last serialized content on disk
+        _live_stores.add(self)
+
+    @property
+    def dirty(self) -> bool:
+        return self._pending is not None
+
+    def load(self) -> Dict[str, Any]:
+        """Read project.json with its sections merged back into settings.
+
+        Raises json.JSONDecodeError for a corrupt main file, like json.load.
+        """
+        with self._lock:
+            with open(self.path) as f:
+                data = json.load(f)
+            settings = data.setdefault("settings", {})
+            for key in data.pop("sections", []):
+                try:
+                    with open(section_path(self.path, key)) as f:
+                        text = f.read()
+                    settings[key] = json.loads(text)
+                    self._written[key] = text
+                except (OSError, ValueError) as e:
+                    logger.warning(f"Could not read config section '{key}' of {self.path}: {e}")
+            return data
+
+    def save(self, data: Dict[str, Any], immediate: bool = False) -> None:
+        """Schedule data (already JSON-safe) to be written; the latest save wins."""
+        with self._lock:
+            self._pending = data
+            if immediate or self.debounce <= 0:
+                self.flush()
+            elif self._timer is None:
+                self._timer = threading.Timer(self.debounce, self._flush_in_background)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def flush(self) -> None:
+        """Write pending state now, if any."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            data, self._pending = self._pending, None
+            if data is None:
+                return
+            try:
+                self._write(data)
+            except Exception:
+                # Keep the state so the next save/flush retries it
+                if self._pending is None:
+                    self._pending = data
+                raise
+
+    def _flush_in_background(self) -> None:
+        with self._lock:
+            self._timer = None
+        try:
+            self.flush()
+        except Exception as e:
+            logger.error(f"Failed to write {self.path}: {e}")
+
+    def _write(self, data: Dict[str, Any]) -> None:
+        settings = dict(data.get("settings") or {})
+        written = []
+        for key in self.sections:
+            if key not in settings:
+                continue
+            text = json.dumps(settings.pop(key))
+            if self._written.get(key) != text:
+                atomic_write_json(section_path(self.path, key), json.loads(text))
+                self._written[key] = text
+            written.append(key)
+        for key in [k for k in self._written if k not in written]:
+            try:
+                section_path(self.path, key).unlink()
+            except FileNotFoundError:
+                pass
+            del self._written[key]
+
+        main = dict(data, settings=settings)
+        if written:
+            main["sections"] = written
+        atomic_write_json(self.path, main, indent=2)
+
+    def close(self) -> None:
+        """Flush and stop tracking this store for the exit-time flush."""
+        self.flush()
+        _live_stores.discard(self)
+
+
+_live_stores: "weakref.WeakSet[ConfigStore]" = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_live_stores() -> None:
+    for store in list(_live_stores):
+        try:
+            store.flush()
+        except Exception as e:
+            logger.error(f"Failed to flush {store.path} at exit: {e}")
@@ -0,0 +1,481 @@
+"""
+Optional local daemon that runs CLI commands in a warm process.
+
+Every `mus1` invocation pays interpreter startup, config resolution and
+database opening. `mus1 daemon start` launches a background process that
+keeps the ConfigManager, the database engine registry and the plugin modules
+loaded, and serves CLI commands over a Unix domain socket:
+
+- main() is the `mus1` entry point. It is a thin client (standard library
+  only): if a daemon is listening for this MUS1_ROOT it sends argv, cwd and
+  terminal size and relays the streamed output and exit code; otherwise, or
+  with MUS1_NO_DAEMON=1, it runs the command in-process as before.
+- Commands are executed one at a time (they share the process-wide stdout);
+  before each one the daemon picks up config changes made by other processes.
+- Commands that may need a terminal (setup, daemon management, the GUI) always
+  run in the client. A command that prompts inside the daemon before printing
+  anything is handed back to the client and re-run there.
+- The daemon exits after idle_timeout seconds without requests.
+
+Unix only; on platforms without AF_UNIX the client always runs in-process.
+The socket directory must be owned by the current user with mode 0700, and
+where SO_PEERCRED is available both ends check the other's uid; otherwise
+the client runs locally and the daemon refuses to start.
+
+Wire format: 4-byte big-endian length + JSON object, in both directions.
+"""
+
+from __future__ import annotations
+
+# socket is imported where needed: without a running daemon the client only
+# checks that the socket file exists (see connect)
+import hashlib
+import json
+import os
+import stat
+import struct
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+DEFAULT_IDLE_TIMEOUT = 15 * 60.0  # seconds
+CONNECT_TIMEOUT = 0.5  # seconds
+# First arguments that always run in the client process
+LOCAL_COMMANDS = {"setup", "daemon", "demo"}
+
+_HEADER = struct.Struct(">I")
+_PEERCRED = struct.Struct("3i")  # struct ucred: pid, uid, gid
+
+
+# ===========================================
+# SOCKET LOCATION AND FRAMING
+# ===========================================
+
+def socket_path() -> Path:
+    """Socket for the current user and MUS1_ROOT (one daemon per configuration root)."""
+    root_key = hashlib.sha1(os.environ.get("MUS1_ROOT", "").encode()).hexdigest()[:12]
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    # Not tempfile.gettempdir(): it probes directories by writing files on every call
+    base = Path(runtime_dir) if runtime_dir else Path(os.environ.get("TMPDIR") or "/tmp") / f"mus1-{os.getuid()}"
+    return base / f"mus1-daemon-{root_key}.sock"
+
+
+def _is_private_dir(path: Path) -> bool:
+    """True if path is a real directory owned by this user and closed to others."""
+    try:
+        st = os.lstat(path)
+    except OSError:
+        return False
+    return stat.S_ISDIR(st.st_mode) and st.st_uid == os.getuid() and not st.st_mode & 0o077
+
+
+def _peer_uid(sock: socket.socket) -> Optional[int]:
+    """Uid of the process at the other end of a Unix socket, or None where unsupported."""
+    import socket
+    if not hasattr(socket, "SO_PEERCRED"):
+        return None
+    creds = sock.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, _PEERCRED.size)
+    return _PEERCRED.unpack(creds)[1]
+
+
+def _peer_is_us(sock: socket.socket) -> bool:
+    uid = _peer_uid(sock)
+    return uid is None or uid == os.getuid()
+
+
+def _send(sock: socket.socket, message: Dict[str, Any]) -> None:
+    payload = json.dumps(message).encode()
+    sock.sendall(_HEADER.pack(len(payload)) + payload)
+
+
+def _recv_exact(sock: socket.socket, size: int) -> bytes:
+    chunks = []
+    while size:
+        chunk = sock.recv(size)
+        if not chunk:
+            raise ConnectionError("daemon connection closed")
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b"".join(chunks)
+
+
+def _recv(sock: socket.socket) -> Dict[str, Any]:
+    (size,) = _HEADER.unpack(_recv_exact(sock, _HEADER.size))
+    return json.loads(_recv_exact(sock, size))
+
+
+# ===========================================
+# CLIENT
+# ===========================================
+
+def connect(path: Optional[Path] = None) -> Optional[socket.socket]:
+    """Connect to the daemon, or return None if none is listening."""
+    path = path or socket_path()
+    if not path.exists() or not _is_private_dir(path.parent):
+        return None
+    import socket
+    if not hasattr(socket, "AF_UNIX"):
+        return None
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(CONNECT_TIMEOUT)
+    try:
+        sock.connect(str(path))
+        if not _peer_is_us(sock):
+            sock.close()
+            return None
+    except OSError:
+        sock.close()
+        return None
+    sock.settimeout(None)
+    return sock
+
+
+def request(message: Dict[str, Any], path: Optional[Path] = None) -> Optional[Dict[str, Any]]:
+    """Send a control request (ping, shutdown) and return the reply, or None without a daemon."""
+    sock = connect(path)
+    if sock is None:
+        return None
+    try:
+        _send(sock, message)
+        return _recv(sock)
+    except (OSError, ValueError):
+        return None
+    finally:
+        sock.close()
+
+
+def run_remote(argv: List[str]) -> Optional[int]:
+    """Run a CLI command in the daemon. Returns its exit code, or None to run locally."""
+    sock = connect()
+    if sock is None:
+        return None
+    try:
+        size = os.get_terminal_size(sys.stdout.fileno())
+        width = size.columns
+    except (OSError, ValueError):
+        width = None
+    streams = {"stdout": sys.stdout, "stderr": sys.stderr}
+    try:
+        _send(sock, {
+            "op": "run",
+            "argv": argv,
+            "cwd": os.getcwd(),
+            "width": width,
+            "tty": sys.stdout.isatty(),
+        })
+        while True:
+            message = _recv(sock)
+            if "data" in message:
+                stream = streams[message["stream"]]
+                try:
+                    stream.write(message["data"])
+                    stream.flush()
+                except BrokenPipeError:
+                    # Reader went away (e.g. `mus1 ... | head`); the command keeps running in the daemon
+                    return 1
+            elif message.get("local"):
+                return None
+            else:
+                return int(message.get("exit", 1))
+    except (OSError, ValueError) as e:
+        # Daemon went away mid-request; output so far was shown, so do not re-run
+        print(f"mus1 daemon connection failed: {e}", file=sys.stderr)
+        return 1
+    finally:
+        sock.close()
+
+
+def _wants_daemon(argv: List[str]) -> bool:
+    if os.environ.get("MUS1_NO_DAEMON"):
+        return False
+    first = next((arg for arg in argv if not arg.startswith("-")), None)
+    # No subcommand launches the GUI
+    return first is not None and first not in LOCAL_COMMANDS
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """`mus1` entry point: use a running daemon when possible, else run in-process."""
+    argv = list(sys.argv[1:] if argv is None else argv)
+    if _wants_daemon(argv):
+        code = run_remote(argv)
+        if code is not None:
+            sys.exit(code)
+    from .simple_cli import app
+    app(args=argv, prog_name="mus1")
+
+
+# ===========================================
+# SERVER
+# ===========================================
+
+class _NeedsTerminal(BaseException):
+    """Raised when a command reads stdin inside the daemon (BaseException so commands do not swallow it)."""
+
+
+class _NoInput:
+    # stdin stand-in for commands running in the daemon
+    def isatty(self) -> bool:
+        return False
+
+    def read(self, *args):
+        raise _NeedsTerminal()
+
+    readline = read
+
+    def fileno(self):
+        raise OSError("no stdin in mus1 daemon")
+
+
+class _StreamWriter:
+    """Text stream that forwards complete lines to the client as frames.
+
+    A trailing partial line (typically a prompt) is held back until a
+    newline or finish(), so a prompting command can still be handed back
+    to the client without having shown anything.
+    """
+
+    def __init__(self, sock: socket.socket, name: str, tty: bool):
+        self._sock = sock
+        self._name = name
+        self._tty = tty
+        self._pending = ""
+        self.written = False
+        self.encoding = "utf-8"
+
+    def write(self, data) -> int:
+        if isinstance(data, (bytes, bytearray)):
+            data = bytes(data).decode(self.encoding, errors="replace")
+        text = self._pending + data
+        head, sep, self._pending = text.rpartition("\n")
+        if sep:
+            self._emit(head + sep)
+        return len(data)
+
+    def _emit(self, data: str) -> None:
+        if data:
+            _send(self._sock, {"stream": self._name, "data": data})
+            self.written = True
+
+    def finish(self) -> None:
+        """Send any held-back partial line."""
+        self._emit(self._pending)
+        self._pending = ""
+
+    def flush(self) -> None:
+        pass
+
+    def isatty(self) -> bool:
+        return self._tty
+
+    def fileno(self):
+        raise OSError("daemon stream has no file descriptor")
+
+
+class Daemon:
+    """Serves CLI commands over a Unix socket until idle for idle_timeout seconds."""
+
+    def __init__(self, path: Optional[Path] = None, idle_timeout: float = DEFAULT_IDLE_TIMEOUT):
+        self.path = path or socket_path()
+        self.idle_timeout = idle_timeout
+        self.started_at = time.time()
+        self.requests = 0
+        self._last_active = time.monotonic()
+        self._running = False
+        self._command = None
+        self._cwd_params: List[Any] = []
+
+    # ---------- startup ----------
+    def warm_up(self) -> None:
+        """Load the CLI, config, database layer and plugin modules once."""
+        import typer
+        import rich.panel, rich.prompt, rich.table  # noqa: F401  (imported lazily by the commands)
+        from importlib import metadata as importlib_metadata
+        from . import project_manager_clean, plugin_manager_clean, setup_service  # noqa: F401
+        from .config_manager import get_config_manager
+        from .simple_cli import app
+
+        self._command = typer.main.get_command(app)
+        # Options declared with a Path.cwd() default captured the daemon's cwd at import
+        startup_cwd = Path.cwd()
+        self._cwd_params = [param for param in self._iter_params(self._command) if param.default == startup_cwd]
+        get_config_manager()
+        for ep in importlib_metadata.entry_points().select(group="mus1.plugins"):
+            try:
+                ep.load()
+            except Exception:
+                pass
+
+    def _iter_params(self, command):
+        yield from command.params
+        for sub in getattr(command, "commands", {}).values():
+            yield from self._iter_params(sub)
+
+    def _bind(self) -> socket.socket:
+        self.path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        if not _is_private_dir(self.path.parent):
+            raise RuntimeError(f"Refusing to listen in {self.path.parent}: it must be a directory "
+                               f"owned by uid {os.getuid()} with mode 0700")
+        if self.path.exists():
+            if connect(self.path) is not None:
+                raise RuntimeError(f"A mus1 daemon is already listening on {self.path}")
+            self.path.unlink()  # stale socket from a crashed daemon
+        import socket
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(str(self.path))
+        os.chmod(self.path, 0o600)
+        server.listen(16)
+        return server
+
+    # ---------- main loop ----------
+    def serve(self) -> None:
+        """Accept and handle requests until shut down or idle."""
+        import socket
+        self.warm_up()
+        server = self._bind()
+        server.settimeout(min(self.idle_timeout, 30.0))
+        self._running = True
+        try:
+            while self._running:
+                try:
+                    conn, _ = server.accept()
+                except socket.timeout:
+                    if time.monotonic() - self._last_active > self.idle_timeout:
+                        break
+                    continue
+                with conn:
+                    if not _peer_is_us(conn):
+                        continue
+                    try:
+                        self._handle(conn)
+                    except (OSError, ValueError):
+                        pass  # client went away
+                self._last_active = time.monotonic()
+        finally:
+            server.close()
+            try:
+                self.path.unlink()
+            except OSError:
+                pass
+
+    def _handle(self, conn: socket.socket) -> None:
+        message = _recv(conn)
+        op = message.get("op")
+        if op == "ping":
+            _send(conn, self.status())
+        elif op == "shutdown":
+            self._running = False
+            _send(conn, {"stopped": True, "pid": os.getpid()})
+        elif op == "run":
+            self.requests += 1
+            self._run(conn, message)
+        else:
+            _send(conn, {"exit": 2, "error": f"unknown op {op!r}"})
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "pid": os.getpid(),
+            "socket": str(self.path),
+            "started_at": self.started_at,
+            "requests": self.requests,
+            "idle_timeout": self.idle_timeout,
+            "idle_for": round(time.monotonic() - self._last_active, 1),
+        }
+
+    def _run(self, conn: socket.socket, message: Dict[str, Any]) -> None:
+        import rich
+        from .config_manager import get_config_manager
+        from .project_lease import release_project_leases
+
+        tty = bool(message.get("tty"))
+        stdout = _StreamWriter(conn, "stdout", tty)
+        stderr = _StreamWriter(conn, "stderr", tty)
+        cwd = Path(message.get("cwd") or Path.cwd())
+        saved = (sys.stdin, sys.stdout, sys.stderr, Path.cwd())
+        defaults = [(param, param.default) for param in self._cwd_params]
+        code: Optional[int] = 0
+        try:
+            os.chdir(cwd)
+            for param, _ in defaults:
+                param.default = cwd
+            # Config written by other processes (GUI, local CLI runs) since the last request
+            get_config_manager().poll_changes()
+            sys.stdin, sys.stdout, sys.stderr = _NoInput(), stdout, stderr
+            rich.reconfigure(file=stdout, width=message.get("width"), force_terminal=tty,
+                             color_system="auto" if tty else None)
+            self._command.main(args=list(message.get("argv", [])), prog_name="mus1", standalone_mode=True)
+        except SystemExit as e:
+            code = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+        except _NeedsTerminal:
+            if not stdout.written and not stderr.written:
+                code = None
+            else:
+                stderr.write("\nThis command needs interactive input; re-run it with MUS1_NO_DAEMON=1.\n")
+                code = 1
+        except Exception:
+            import traceback
+            stderr.write(traceback.format_exc())
+            code = 1
+        finally:
+            sys.stdin, sys.stdout, sys.stderr = saved[:3]
+            for param, default in defaults:
+                param.default = default
+            rich.reconfigure()
+            os.chdir(saved[3])
+            # Commands open projects for one call; do not keep shared ones locked for others
+            release_project_leases()
+        if code is not None:
+            stdout.finish()
+            stderr.finish()
+        # None: nothing was shown yet, so the client re-runs the command with its terminal
+        _send(conn, {"local": True} if code is None else {"exit": code})
+
+
+# ===========================================
+# DAEMON PROCESS MANAGEMENT
+# ===========================================
+
+def start_daemon(idle_timeout: float = DEFAULT_IDLE_TIMEOUT, wait: float = 10.0) -> Dict[str, Any]:
+    """Start a background daemon for the current MUS1_ROOT and wait until it answers."""
+    import socket
+    import subprocess
+
+    if not hasattr(socket, "AF_UNIX"):
+        return {"success": False, "message": "The mus1 daemon requires Unix domain sockets"}
+    current = request({"op": "ping"})
+    if current:
+        return {"success": True, "message": f"Daemon already running (pid {current['pid']})", **current}
+    subprocess.Popen(
+        [sys.executable, "-m", "mus1.core.daemon", "--idle-timeout", str(idle_timeout)],
+        stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        start_new_session=True, cwd=str(Path.home()),
+    )
+    deadline = time.monotonic() + wait
+    while time.monotonic() < deadline:
+        current = request({"op": "ping"})
+        if current:
+            return {"success": True, "message": f"Daemon started (pid {current['pid']})", **current}
+        time.sleep(0.05)
+    return {"success": False, "message": f"Daemon did not start within {wait:.0f}s"}
+
+
+def stop_daemon() -> Dict[str, Any]:
+    """Ask the daemon for the current MUS1_ROOT to exit."""
+    reply = request({"op": "shutdown"})
+    if reply is None:
+        return {"success": False, "message": "No daemon running"}
+    return {"success": True, "message": f"Daemon stopped (pid {reply['pid']})"}
+
+
+def daemon_status() -> Optional[Dict[str, Any]]:
+    """Status of the daemon for the current MUS1_ROOT, or None if none is running."""
+    return request({"op": "ping"})
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="mus1 background daemon")
+    parser.add_argument("--idle-timeout", type=float, default=DEFAULT_IDLE_TIMEOUT)
+    args = parser.parse_args()
+    Daemon(idle_timeout=args.idle_timeout).serve()
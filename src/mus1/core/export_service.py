@@ -0,0 +1,290 @@
+"""
+Columnar export of project data (Parquet / Feather).
+
+Streams project tables out of SQLite in fixed-size chunks and writes them as
+typed Arrow data: enums become categoricals, datetimes become timestamps and
+integer columns stay nullable. Memory use is bounded by the chunk size.
+
+Layout of an export directory:
+    <output>/<table>/part-00000.parquet   full snapshot
+    <output>/<table>/part-00001.parquet   rows changed since the previous export
+    <output>/_export_state.json           format, per-table change watermarks, part history
+
+Incremental parts hold inserted/updated rows (tracked by the row_changes
+triggers in schema.py); readers keep the row from the newest part per key.
+Deletions are not tracked, so run a full export after removing data.
+"""
+
+import json
+import logging
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from .metadata import Sex, SubjectDesignation, ProcessingStage
+from .schema import Database
+
+logger = logging.getLogger(__name__)
+
+EXPORT_FORMATS = ("parquet", "feather")
+STATE_FILE = "_export_state.json"
+
+# Column specs: "string", "int", "float", "timestamp", an Enum class (stored by
+# name, exported by value) or a tuple of fixed categories.
+EXPORT_TABLES: Dict[str, Dict[str, Any]] = {
+    "subjects": {
+        "key": ["id"],
+        "columns": [
+            ("id", "string"), ("colony_id", "string"), ("sex", Sex),
+            ("designation", SubjectDesignation), ("birth_date", "timestamp"),
+            ("death_date", "timestamp"), ("individual_genotype", "string"),
+            ("individual_treatment", "string"), ("notes", "string"), ("date_added", "timestamp"),
+        ],
+    },
+    "experiments": {
+        "key": ["id"],
+        "columns": [
+            ("id", "string"), ("subject_id", "string"), ("experiment_type", "string"),
+            ("date_recorded", "timestamp"), ("processing_stage", ProcessingStage),
+            ("experiment_subtype", "string"), ("notes", "string"), ("date_added", "timestamp"),
+        ],
+    },
+    "videos": {
+        "key": ["id"],
+        "columns": [
+            ("id", "int"), ("path", "string"), ("hash", "string"), ("recorded_time", "timestamp"),
+            ("size_bytes", "int"), ("last_modified", "float"), ("date_added", "timestamp"),
+        ],
+    },
+    "experiment_videos": {
+        "key": ["experiment_id", "video_id"],
+        "columns": [("experiment_id", "string"), ("video_id", "int")],
+    },
+    "plugin_results": {
+        "key": ["id"],
+        "columns": [
+            ("id", "int"), ("experiment_id", "string"), ("plugin_name", "string"),
+            ("capability", "string"), ("result_data", "string"),
+            ("status", ("success", "failed", "running")), ("error_message", "string"),
+            ("output_files", "string"), ("created_at", "timestamp"), ("completed_at", "timestamp"),
+        ],
+    },
+}
+
+# SQLAlchemy's SQLite DateTime storage format
+_SQLITE_DATETIME_FORMAT = "%Y-%m-%d %H:%M:%S.%f"
+
+
+class ProjectExporter:
+    """Export project tables to partitioned Parquet or Feather files."""
+
+    def __init__(self, db: Database, output_dir: Path, fmt: str = "parquet", chunk_size: int = 50_000):
+        if fmt not in EXPORT_FORMATS:
+            raise ValueError(f"Unsupported export format '{fmt}' (expected one of {', '.join(EXPORT_FORMATS)})")
+        self.db = db
+        self.output_dir = Path(output_dir)
+        self.fmt = fmt
+        self.chunk_size = chunk_size
+
+    # ---------- state ----------
+    def _state_path(self) -> Path:
+        return self.output_dir / STATE_FILE
+
+    def load_state(self) -> Optional[Dict[str, Any]]:
+        """Return the previous export state for this directory, if any."""
+        try:
+            with open(self._state_path()) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _save_state(self, state: Dict[str, Any]) -> None:
+        tmp = self._state_path().with_suffix(".tmp")
+        with open(tmp, "w") as f:
+            json.dump(state, f, indent=2)
+        tmp.replace(self._state_path())
+
+    def _current_seq(self) -> int:
+        with self.db.engine.connect() as conn:
+            return conn.exec_driver_sql("SELECT COALESCE(MAX(seq), 0) FROM row_changes").scalar() or 0
+
+    # ---------- export ----------
+    def export(self, tables: Optional[Sequence[str]] = None, incremental: bool = False,
+               progress: Optional[Callable[[str, int], None]] = None) -> Dict[str, Any]:
+        """Export tables; incremental exports only rows changed since the last run.
+
+        Falls back to a full export when there is no compatible previous state.
+        """
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            return {
+                "success": False,
+                "message": "Columnar export requires pyarrow (pip install 'mus1[export]')",
+            }
+
+        tables = list(tables or EXPORT_TABLES)
+        unknown = [t for t in tables if t not in EXPORT_TABLES]
+        if unknown:
+            return {"success": False, "message": f"Unknown tables: {', '.join(unknown)}"}
+
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        state = self.load_state()
+        if state and state.get("format") != self.fmt:
+            state = None
+        if incremental and not state:
+            logger.info("No compatible previous export found; running a full export")
+            incremental = False
+        state = state or {"format": self.fmt, "next_part": 0, "tables": {}, "exports": []}
+        until = self._current_seq()
+        part_index = state["next_part"]
+
+        rows: Dict[str, int] = {}
+        for table in tables:
+            # Watermarks are per table so exporting a subset never skips changes elsewhere
+            table_state = state["tables"].get(table)
+            since = table_state["last_seq"] if incremental and table_state else None
+            rows[table] = self._export_table(table, part_index, since, until, progress)
+            state["tables"][table] = {"last_seq": until, "key": EXPORT_TABLES[table]["key"]}
+
+        state["next_part"] = part_index + 1
+        state["exports"].append({
+            "part": part_index,
+            "incremental": incremental,
+            "exported_at": datetime.now().isoformat(),
+            "rows": rows,
+        })
+        self._save_state(state)
+        return {
+            "success": True,
+            "message": f"Exported {sum(rows.values())} rows ({'incremental' if incremental else 'full'})",
+            "output_dir": str(self.output_dir),
+            "format": self.fmt,
+            "incremental": incremental,
+            "rows": rows,
+        }
+
+    def _export_table(self, table: str, part_index: int, since: Optional[int], until: int,
+                      progress: Optional[Callable[[str, int], None]]) -> int:
+        import pandas as pd
+
+        spec = EXPORT_TABLES[table]
+        table_dir = self.output_dir / table
+        table_dir.mkdir(parents=True, exist_ok=True)
+        if since is None:
+            # Full export replaces earlier parts of this table
+            for old_part in table_dir.glob("part-*"):
+                old_part.unlink()
+
+        columns = ", ".join(name for name, _ in spec["columns"])
+        sql = f"SELECT {columns} FROM {table}"
+        params: Dict[str, Any] = {}
+        if since is not None:
+            sql += (" WHERE rowid IN (SELECT row_id FROM row_changes "
+                    "WHERE table_name = :table AND seq > :since AND seq <= :until)")
+            params = {"table": table, "since": since, "until": until}
+        sql += " ORDER BY rowid"
+
+        schema = _arrow_schema(spec["columns"])
+        path = table_dir / f"part-{part_index:05d}.{self.fmt}"
+        writer = _open_writer(path, schema, self.fmt)
+        total = 0
+        try:
+            with self.db.engine.connect() as conn:
+                for chunk in pd.read_sql_query(sql, conn.connection.dbapi_connection, params=params,
+                                               chunksize=self.chunk_size):
+                    writer.write_table(_chunk_to_arrow(chunk, spec["columns"], schema))
+                    total += len(chunk)
+                    if progress:
+                        progress(table, total)
+            if total == 0:
+                # Keep empty parts schema-complete so readers see typed columns
+                writer.write_table(schema.empty_table())
+        finally:
+            writer.close()
+
+        if total == 0 and since is not None:
+            path.unlink()
+        logger.info(f"Exported {total} rows from {table} to {path}")
+        return total
+
+
+# ===========================================
+# ARROW CONVERSION HELPERS
+# ===========================================
+
+def _categories(kind) -> Optional[List[str]]:
+    if isinstance(kind, tuple):
+        return list(kind)
+    if isinstance(kind, type):
+        return [member.value for member in kind]
+    return None
+
+
+def _arrow_schema(columns):
+    import pyarrow as pa
+
+    types = {
+        "string": pa.string(),
+        "int": pa.int64(),
+        "float": pa.float64(),
+        "timestamp": pa.timestamp("us"),
+    }
+    fields = []
+    for name, kind in columns:
+        if _categories(kind) is not None:
+            fields.append(pa.field(name, pa.dictionary(pa.int16(), pa.string())))
+        else:
+            fields.append(pa.field(name, types[kind]))
+    return pa.schema(fields)
+
+
+def _chunk_to_arrow(chunk, columns, schema):
+    import pandas as pd
+    import pyarrow as pa
+
+    for name, kind in columns:
+        categories = _categories(kind)
+        if categories is not None:
+            values = chunk[name]
+            if isinstance(kind, type):
+                # SQLAlchemy Enum columns store member names
+                values = values.map({member.name: member.value for member in kind})
+            chunk[name] = pd.Categorical(values, categories=categories)
+        elif kind == "timestamp":
+            raw = chunk[name]
+            parsed = pd.to_datetime(raw, format=_SQLITE_DATETIME_FORMAT, errors="coerce")
+            unparsed = parsed.isna() & raw.notna()
+            if unparsed.any():
+                parsed[unparsed] = pd.to_datetime(raw[unparsed], errors="coerce")
+            chunk[name] = parsed
+        elif kind == "int":
+            chunk[name] = pd.to_numeric(chunk[name], errors="coerce").astype("Int64")
+        elif kind == "float":
+            chunk[name] = pd.to_numeric(chunk[name], errors="coerce").astype("float64")
+        else:
+            chunk[name] = chunk[name].astype("object").where(chunk[name].notna(), None)
+    return pa.Table.from_pandas(chunk, schema=schema, preserve_index=False)
+
+
+class _FeatherWriter:
+    """Arrow IPC file writer (Feather v2) with the ParquetWriter interface used above."""
+
+    def __init__(self, path: Path, schema):
+        import pyarrow as pa
+        self._sink = pa.OSFile(str(path), "wb")
+        self._writer = pa.ipc.new_file(self._sink, schema)
+
+    def write_table(self, table) -> None:
+        self._writer.write_table(table)
+
+    def close(self) -> None:
+        self._writer.close()
+        self._sink.close()
+
+
+def _open_writer(path: Path, schema, fmt: str):
+    if fmt == "feather":
+        return _FeatherWriter(path, schema)
+    import pyarrow.parquet as pq
+    return pq.ParquetWriter(str(path), schema, compression="zstd")
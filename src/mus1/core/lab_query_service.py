@@ -0,0 +1,239 @@
+"""
+Federated read-only queries across a lab's project databases.
+
+Every project keeps its own mus1.db. Lab-level questions are answered by
+ATTACHing the project databases read-only to one in-memory connection in
+batches (SQLite allows 10 attached databases by default), running a single
+UNION ALL query per batch and merging the per-batch aggregates.
+"""
+
+import logging
+import sqlite3
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .metadata import ProcessingStage, Sex
+
+logger = logging.getLogger(__name__)
+
+ATTACH_BATCH_SIZE = 8
+
+# group_by name -> column of the per-experiment row set built by _experiment_rows_sql
+GROUP_BY_COLUMNS = {
+    "project": "project",
+    "experiment_type": "experiment_type",
+    "experiment_subtype": "experiment_subtype",
+    "processing_stage": "processing_stage",
+    "genotype": "genotype",
+    "sex": "sex",
+}
+
+# Enum columns are stored by member name
+_ENUM_COLUMNS = {"processing_stage": ProcessingStage, "sex": Sex}
+
+
+def _experiment_rows_sql(alias: str, label_param: str) -> str:
+    return f"""
+        SELECT :{label_param} AS project, e.id AS experiment_id, e.subject_id AS subject_id,
+               e.experiment_type AS experiment_type, e.experiment_subtype AS experiment_subtype,
+               e.processing_stage AS processing_stage, e.date_recorded AS date_recorded,
+               s.individual_genotype AS genotype, s.sex AS sex,
+               COALESCE(v.videos, 0) AS videos, COALESCE(v.video_bytes, 0) AS video_bytes
+        FROM {alias}.experiments e
+        LEFT JOIN {alias}.subjects s ON s.id = e.subject_id
+        LEFT JOIN (
+            SELECT ev.experiment_id, COUNT(*) AS videos, SUM(vi.size_bytes) AS video_bytes
+            FROM {alias}.experiment_videos ev JOIN {alias}.videos vi ON vi.id = ev.video_id
+            GROUP BY ev.experiment_id
+        ) v ON v.experiment_id = e.id
+    """
+
+
+def _filters(experiment_type: Optional[str], genotype: Optional[str],
+             processing_stage: Optional[str]) -> Tuple[str, Dict[str, Any]]:
+    clauses, params = [], {}
+    if experiment_type:
+        clauses.append("experiment_type = :experiment_type COLLATE NOCASE")
+        params["experiment_type"] = experiment_type
+    if genotype:
+        clauses.append("genotype = :genotype COLLATE NOCASE")
+        params["genotype"] = genotype
+    if processing_stage:
+        clauses.append("processing_stage = :processing_stage")
+        params["processing_stage"] = _enum_name(ProcessingStage, processing_stage)
+    return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+
+def _enum_name(enum_cls, value: str) -> str:
+    for member in enum_cls:
+        if value in (member.name, member.value):
+            return member.name
+    return value
+
+
+def _enum_value(column: str, stored: Optional[str]) -> Optional[str]:
+    enum_cls = _ENUM_COLUMNS.get(column)
+    if enum_cls is None or stored is None:
+        return stored
+    try:
+        return enum_cls[stored].value
+    except KeyError:
+        return stored
+
+
+class LabQueryService:
+    """Run aggregate and list queries over many project databases at once."""
+
+    def __init__(self, projects: Dict[str, Path], batch_size: int = ATTACH_BATCH_SIZE):
+        # {label: project directory}; projects without a database are skipped
+        self.projects = {
+            label: Path(path) for label, path in projects.items() if (Path(path) / "mus1.db").exists()
+        }
+        self.batch_size = max(1, min(batch_size, 10))
+        self.errors: Dict[str, str] = {}
+
+    # ---------- batching ----------
+    def _batches(self) -> Iterator[List[Tuple[str, Path]]]:
+        items = sorted(self.projects.items())
+        for start in range(0, len(items), self.batch_size):
+            yield items[start:start + self.batch_size]
+
+    def _run(self, build_sql, params: Dict[str, Any]) -> Iterator[sqlite3.Row]:
+        """Yield rows of build_sql(union_sql) for every batch of attached projects.
+
+        A batch that fails (e.g. a project with an older schema) is retried
+        project by project so one bad database does not hide the others.
+        """
+        self.errors = {}
+        conn = sqlite3.connect(":memory:", uri=True)
+        conn.row_factory = sqlite3.Row
+        try:
+            for batch in self._batches():
+                try:
+                    yield from self._run_batch(conn, batch, build_sql, params)
+                except sqlite3.Error as e:
+                    if len(batch) == 1:
+                        logger.warning(f"Lab query skipped project {batch[0][0]}: {e}")
+                        self.errors[batch[0][0]] = str(e)
+                        continue
+                    for project in batch:
+                        try:
+                            yield from self._run_batch(conn, [project], build_sql, params)
+                        except sqlite3.Error as e:
+                            logger.warning(f"Lab query skipped project {project[0]}: {e}")
+                            self.errors[project[0]] = str(e)
+        finally:
+            conn.close()
+
+    def _run_batch(self, conn, batch, build_sql, params) -> List[sqlite3.Row]:
+        aliases = []
+        try:
+            for i, (label, path) in enumerate(batch):
+                alias = f"p{i}"
+                conn.execute(f"ATTACH DATABASE ? AS {alias}", ((path / "mus1.db").resolve().as_uri() + "?mode=ro",))
+                aliases.append(alias)
+            union = " UNION ALL ".join(
+                _experiment_rows_sql(alias, f"label{i}") for i, alias in enumerate(aliases)
+            )
+            batch_params = dict(params, **{f"label{i}": label for i, (label, _) in enumerate(batch)})
+            return conn.execute(build_sql(union), batch_params).fetchall()
+        finally:
+            for alias in aliases:
+                conn.execute(f"DETACH DATABASE {alias}")
+
+    # ---------- queries ----------
+    def summarize(self, group_by: str = "experiment_type", experiment_type: Optional[str] = None,
+                  genotype: Optional[str] = None, processing_stage: Optional[str] = None) -> Dict[str, Any]:
+        """Aggregate experiments across all projects, grouped by one column."""
+        column = GROUP_BY_COLUMNS.get(group_by)
+        if column is None:
+            raise ValueError(f"Unknown group_by '{group_by}' (expected one of {', '.join(GROUP_BY_COLUMNS)})")
+        where, params = _filters(experiment_type, genotype, processing_stage)
+
+        def build_sql(union: str) -> str:
+            return f"""
+                SELECT {column} AS grp,
+                       COUNT(DISTINCT project) AS projects,
+                       COUNT(DISTINCT project || char(0) || subject_id) AS subjects,
+                       COUNT(*) AS experiments,
+                       SUM(videos) AS videos,
+                       SUM(video_bytes) AS video_bytes
+                FROM ({union}){where}
+                GROUP BY grp
+            """
+
+        # Projects are disjoint across batches, so per-batch counts simply add up
+        totals: Dict[Optional[str], Dict[str, int]] = {}
+        for row in self._run(build_sql, params):
+            group = _enum_value(column, row["grp"])
+            agg = totals.setdefault(group, {"projects": 0, "subjects": 0, "experiments": 0,
+                                            "videos": 0, "video_bytes": 0})
+            for key in agg:
+                agg[key] += row[key] or 0
+
+        rows = [{"group": group, **agg} for group, agg in totals.items()]
+        rows.sort(key=lambda r: (-r["experiments"], str(r["group"])))
+        return {
+            "group_by": group_by,
+            "rows": rows,
+            "projects_queried": len(self.projects) - len(self.errors),
+            "errors": dict(self.errors),
+        }
+
+    def find_experiments(self, experiment_type: Optional[str] = None, genotype: Optional[str] = None,
+                         processing_stage: Optional[str] = None, limit: Optional[int] = 1000) -> List[Dict[str, Any]]:
+        """List matching experiments from all projects, newest recordings first."""
+        where, params = _filters(experiment_type, genotype, processing_stage)
+        limit_sql = f" LIMIT {int(limit)}" if limit else ""
+
+        def build_sql(union: str) -> str:
+            return f"SELECT * FROM ({union}){where} ORDER BY date_recorded DESC{limit_sql}"
+
+        results = []
+        for row in self._run(build_sql, params):
+            item = dict(row)
+            for column in _ENUM_COLUMNS:
+                item[column] = _enum_value(column, item[column])
+            results.append(item)
+        results.sort(key=lambda r: r["date_recorded"] or "", reverse=True)
+        return results[:limit] if limit else results
+
+
+def lab_project_paths(lab_id: Optional[str] = None, include_discovered: bool = True) -> Dict[str, Path]:
+    """Return {label: project directory} for a lab's registered projects.
+
+    Without lab_id, projects of every lab are included. include_discovered adds
+    projects found locally by ProjectDiscoveryService.
+    """
+    from .setup_service import get_setup_service
+
+    setup_service = get_setup_service()
+    candidates: List[Tuple[str, Path]] = []
+    if lab_id:
+        for project in setup_service.get_lab_projects(lab_id).get("projects", []):
+            candidates.append((project["name"], Path(project["path"])))
+    else:
+        for lab in setup_service.get_labs().values():
+            for project in lab.get("projects", []):
+                candidates.append((project["name"], Path(project["path"])))
+    if include_discovered:
+        from .project_discovery_service import get_project_discovery_service
+        for path in get_project_discovery_service().discover_existing_projects():
+            candidates.append((path.name, path))
+    return _label_projects(candidates)
+
+
+def _label_projects(candidates: Iterable[Tuple[str, Path]]) -> Dict[str, Path]:
+    projects: Dict[str, Path] = {}
+    seen = set()
+    for name, path in candidates:
+        try:
+            resolved = path.expanduser().resolve()
+        except OSError:
+            continue
+        if resolved in seen:
+            continue
+        seen.add(resolved)
+        label = name if name not in projects else str(resolved)
+        projects[label] = resolved
+    return projects
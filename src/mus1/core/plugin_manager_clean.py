@@ -9,11 +9,14 @@ import logging
 from typing import Optional, Dict, Any, List, Set, Tuple
 from importlib import metadata as importlib_metadata
 from datetime import datetime
+from pathlib import Path
 import json
 
 from ..plugins.base_plugin import BasePlugin
+from .array_store import ArrayStore, is_array_ref
 from .metadata import PluginMetadata as DomainPluginMetadata, Experiment, Subject, VideoFile, ProjectConfig
 from .repository import RepositoryFactory
+from .result_cache import ResultCache, result_cache_key
 from .schema import (
     Database, PluginMetadataModel, PluginResultModel,
     plugin_metadata_to_model, model_to_plugin_metadata,
@@ -29,6 +32,10 @@ class PluginService:
     def __init__(self, db: Database):
         self.db = db
         self.repos = RepositoryFactory(db)
+        # Large arrays live next to the project database as .npy files
+        db_file = db.engine.url.database
+        self.array_store = ArrayStore(Path(db_file).parent) if db_file and db_file != ":memory:" else None
+        self.result_cache = ResultCache(db)
 
     def get_experiment_data(self, experiment_id: str) -> Optional[Dict[str, Any]]:
         """Get experiment with related data (subject, videos)."""
@@ -48,10 +55,69 @@ class PluginService:
     def save_analysis_result(self, experiment_id: str, plugin_name: str,
                            capability: str, result_data: Dict[str, Any],
                            status: str = 'success', error_message: str = '',
-                           output_files: Optional[List[str]] = None) -> None:
-        """Save plugin analysis result to database."""
+                           output_files: Optional[List[str]] = None,
+                           arrays: Optional[Dict[str, Any]] = None,
+                           cache_key: Optional[str] = None, plugin_version: str = '') -> None:
+        """Save plugin analysis result to database.
+
+        Numpy arrays in result_data above INLINE_ARRAY_MAX_BYTES, and every
+        array in `arrays`, are written to the array side-store and referenced
+        from the stored JSON; smaller arrays are stored inline as lists.
+        A successful result saved with a cache_key is memoized under it.
+        """
+        self.save_analysis_results([{
+            "experiment_id": experiment_id, "plugin_name": plugin_name, "capability": capability,
+            "result_data": result_data, "status": status, "error_message": error_message,
+            "output_files": output_files, "arrays": arrays,
+            "cache_key": cache_key, "plugin_version": plugin_version,
+        }])
+
+    def save_analysis_results(self, results: List[Dict[str, Any]]) -> None:
+        """Save several results in one transaction.
+
+        Each dict holds the keyword arguments of save_analysis_result, plus
+        optional cache_key and plugin_version: a successful result with a
+        cache_key is memoized under it (see result_cache_key). If the
+        transaction fails, none of the results (or their array files) are kept.
+        """
+        prepared = []
+        try:
+            for kwargs in results:
+                kwargs = dict(kwargs)
+                cache_key, plugin_version = kwargs.pop("cache_key", None), kwargs.pop("plugin_version", "")
+                db_result, result_dir = self._prepare_result(**kwargs)
+                prepared.append((db_result, result_dir, cache_key, plugin_version))
+            with self.db.get_session() as session:
+                for db_result, _, cache_key, plugin_version in prepared:
+                    merged = session.merge(db_result)
+                    session.flush()
+                    ResultCache.record(session, cache_key if merged.status == 'success' else None, merged.id,
+                                       merged.experiment_id, merged.plugin_name, plugin_version, merged.capability)
+                session.commit()
+        except Exception:
+            for _, result_dir, _, _ in prepared:
+                if result_dir is not None:
+                    self.array_store.discard(result_dir)
+            raise
+
+    def _prepare_result(self, experiment_id: str, plugin_name: str, capability: str,
+                        result_data: Dict[str, Any], status: str = 'success', error_message: str = '',
+                        output_files: Optional[List[str]] = None,
+                        arrays: Optional[Dict[str, Any]] = None) -> Tuple[PluginResultModel, Optional[Path]]:
+        # Writes array files; returns the row to store and their directory
         from .metadata import PluginResult
-        from .schema import plugin_result_to_model
+
+        result_dir = None
+        if self.array_store is not None:
+            pending: Dict[str, Any] = {}
+            result_data = self.array_store.offload(result_data, pending)
+            if arrays:
+                result_data = {**result_data, **self.array_store.offload(dict(arrays), pending, force=True)}
+            if pending:
+                result_dir = self.array_store.write_result(pending)
+                result_data = self.array_store.finalize_refs(result_data, result_dir)
+        elif arrays:
+            raise ValueError("Array results need a file-backed project database")
 
         result = PluginResult(
             experiment_id=experiment_id,
@@ -64,27 +130,118 @@ class PluginService:
             created_at=datetime.now(),
             completed_at=datetime.now() if status != 'running' else None
         )
-
-        db_result = plugin_result_to_model(result)
+        return plugin_result_to_model(result), result_dir
+
+    def save_array_result(self, experiment_id: str, plugin_name: str, capability: str,
+                          arrays: Dict[str, Any], metadata: Optional[Dict[str, Any]] = None,
+                          status: str = 'success') -> None:
+        """Save named arrays (e.g. per-frame tracks) as .npy files plus small JSON metadata."""
+        self.save_analysis_result(experiment_id, plugin_name, capability, metadata or {},
+                                  status=status, arrays=arrays)
+
+    def result_cache_key(self, plugin: BasePlugin, experiment: Experiment, capability: str,
+                         project_config: Optional[ProjectConfig]) -> Optional[str]:
+        """Memoization key for running a plugin capability on an experiment, or None if uncacheable."""
+        inputs = plugin.cache_inputs(experiment, self, capability, project_config)
+        if inputs is None:
+            return None
+        metadata = plugin.plugin_self_metadata()
+        video_hashes = [video.hash for video in self.repos.experiments.get_videos_for_experiment(experiment.id)]
+        return result_cache_key(metadata.name, metadata.version, capability, experiment,
+                                video_hashes, project_config, inputs,
+                                self._upstream_result_ids(experiment.id, metadata.name, capability))
+
+    def _upstream_result_ids(self, experiment_id: str, plugin_name: str, capability: str) -> Dict[str, int]:
+        # Latest successful result of every other plugin capability on the experiment
+        # (e.g. loaded tracking data); re-running one of them changes the key
+        from sqlalchemy import and_, func, not_
+        model = PluginResultModel
         with self.db.get_session() as session:
-            session.merge(db_result)
-            session.commit()
+            rows = session.query(model.plugin_name, model.capability, func.max(model.id)).filter(
+                model.experiment_id == experiment_id,
+                model.status == 'success',
+                not_(and_(model.plugin_name == plugin_name, model.capability == capability)),
+            ).group_by(model.plugin_name, model.capability).all()
+        return {f"{name}/{cap}": result_id for name, cap, result_id in rows}
+
+    def get_cached_result(self, cache_key: str, experiment_id: str, mmap: bool = True):
+        """Return the experiment's stored PluginResult memoized under cache_key, or None on a miss."""
+        result_id = self.result_cache.lookup(cache_key, experiment_id)
+        if result_id is None:
+            return None
+        with self.db.get_session() as session:
+            db_result = session.get(PluginResultModel, result_id)
+            if db_result is None:
+                return None
+            result = model_to_plugin_result(db_result)
+        if self.array_store is not None:
+            result.result_data = self.array_store.resolve(result.result_data, mmap=mmap)
+        return result
+
+    def invalidate_cached_results(self, experiment_ids: Optional[List[str]] = None,
+                                  plugin_name: Optional[str] = None, capability: Optional[str] = None) -> int:
+        """Forget memoized results so the next run recomputes them; stored results are kept."""
+        return self.result_cache.invalidate(experiment_ids, plugin_name=plugin_name, capability=capability)
+
+    def _latest_result_model(self, session, experiment_id: str, plugin_name: str, capability: str):
+        return session.query(PluginResultModel).filter(
+            PluginResultModel.experiment_id == experiment_id,
+            PluginResultModel.plugin_name == plugin_name,
+            PluginResultModel.capability == capability
+        ).order_by(PluginResultModel.id.desc()).first()
 
     def get_analysis_result(self, experiment_id: str, plugin_name: str,
-                          capability: str) -> Optional[Dict[str, Any]]:
-        """Get analysis result from database."""
-        from .schema import PluginResultModel, model_to_plugin_result
+                          capability: str, mmap: bool = True) -> Optional[Dict[str, Any]]:
+        """Get the latest analysis result from database.
 
+        Array references in result_data are replaced by read-only memory-mapped
+        arrays (or fully loaded ones with mmap=False).
+        """
         with self.db.get_session() as session:
-            db_result = session.query(PluginResultModel).filter(
-                PluginResultModel.experiment_id == experiment_id,
-                PluginResultModel.plugin_name == plugin_name,
-                PluginResultModel.capability == capability
-            ).first()
-
-            if db_result:
-                return model_to_plugin_result(db_result)
-        return None
+            db_result = self._latest_result_model(session, experiment_id, plugin_name, capability)
+            if not db_result:
+                return None
+            result = model_to_plugin_result(db_result)
+
+        if self.array_store is not None:
+            result.result_data = self.array_store.resolve(result.result_data, mmap=mmap)
+        return result
+
+    def load_array_result(self, experiment_id: str, plugin_name: str, capability: str,
+                          mmap: bool = True) -> Optional[Dict[str, Any]]:
+        """Return the arrays of the latest result by name, without decoding them through JSON."""
+        if self.array_store is None:
+            return None
+        with self.db.get_session() as session:
+            db_result = self._latest_result_model(session, experiment_id, plugin_name, capability)
+            if not db_result:
+                return None
+            data = json.loads(db_result.result_data) if db_result.result_data else {}
+        return {
+            name: self.array_store.load(value, mmap=mmap)
+            for name, value in data.items() if is_array_ref(value)
+        }
+
+    def delete_analysis_results(self, experiment_id: str, plugin_name: Optional[str] = None,
+                                capability: Optional[str] = None) -> int:
+        """Delete stored results (and their array files) for an experiment. Returns rows deleted."""
+        with self.db.get_session() as session:
+            query = session.query(PluginResultModel).filter(PluginResultModel.experiment_id == experiment_id)
+            if plugin_name:
+                query = query.filter(PluginResultModel.plugin_name == plugin_name)
+            if capability:
+                query = query.filter(PluginResultModel.capability == capability)
+            rows = query.all()
+            result_dirs = set()
+            for row in rows:
+                if self.array_store is not None and row.result_data:
+                    result_dirs |= self.array_store.result_dirs(json.loads(row.result_data))
+                session.delete(row)
+            session.commit()
+
+        for result_dir in result_dirs:
+            self.array_store.discard(result_dir)
+        return len(rows)
 
     def get_experiment_by_id(self, experiment_id: str) -> Optional['Experiment']:
         """Get experiment by ID."""
@@ -354,7 +511,8 @@ class PluginManagerClean:
     # Analysis execution with clean architecture
     # -------------------------------
     def run_plugin_analysis(self, experiment_id: str, plugin_name: str,
-                          capability: str, project_config: 'ProjectConfig') -> Dict[str, Any]:
+                          capability: str, project_config: 'ProjectConfig',
+                          use_cache: bool = True) -> Dict[str, Any]:
         """
         Execute plugin analysis using clean architecture data access.
 
@@ -363,9 +521,14 @@ class PluginManagerClean:
             plugin_name: Name of plugin to use
             capability: Analysis capability to execute
             project_config: Project configuration
+            use_cache: Return the stored result, without running the plugin, when
+                it was computed from the same inputs (see result_cache)
 
         Returns:
-            Analysis result dictionary
+            Analysis result dictionary. Whether computed or served from the cache it
+            has status, capability_executed, result_data, result_arrays,
+            output_file_paths, error and cached (True on a cache hit). On a hit,
+            result_arrays holds the stored arrays (memory-mapped) by name.
         """
         plugin = self.get_plugin_by_name(plugin_name)
         if not plugin:
@@ -384,6 +547,23 @@ class PluginManagerClean:
                 'capability_executed': capability
             }
 
+        cache_key = self._cache_key(plugin, experiment, capability, project_config)
+        if use_cache and cache_key:
+            cached = self.plugin_service.get_cached_result(cache_key, experiment_id)
+            if cached is not None:
+                logger.debug(f"{plugin_name}/{capability} on {experiment_id}: cache hit")
+                # Arrays come back resolved inside result_data; hand them out as result_arrays
+                arrays = {name: value for name, value in cached.result_data.items()
+                          if hasattr(value, 'dtype') and hasattr(value, 'shape')}
+                return self._analysis_response({
+                    'status': cached.status,
+                    'capability_executed': capability,
+                    'result_data': {k: v for k, v in cached.result_data.items() if k not in arrays},
+                    'result_arrays': arrays or None,
+                    'output_file_paths': cached.output_files,
+                    'error': cached.error_message,
+                }, cached=True)
+
         try:
             # Execute plugin analysis with plugin service
             result = plugin.analyze_experiment(
@@ -401,10 +581,13 @@ class PluginManagerClean:
                 result_data=result.get('result_data', {}),
                 status=result.get('status', 'success'),
                 error_message=result.get('error', ''),
-                output_files=result.get('output_file_paths', [])
+                output_files=result.get('output_file_paths', []),
+                arrays=result.get('result_arrays'),
+                cache_key=cache_key,
+                plugin_version=plugin.plugin_self_metadata().version,
             )
 
-            return result
+            return self._analysis_response(result, capability=capability)
 
         except Exception as e:
             logger.error(f"Plugin analysis failed: {e}", exc_info=True)
@@ -424,7 +607,30 @@ class PluginManagerClean:
                 error_message=str(e)
             )
 
-            return error_result
+            return self._analysis_response(error_result)
+
+    @staticmethod
+    def _analysis_response(result: Dict[str, Any], cached: bool = False,
+                           capability: Optional[str] = None) -> Dict[str, Any]:
+        # Same keys on a cache hit and a fresh run; extra keys from the plugin are kept
+        response = dict(result)
+        response.setdefault('status', 'success')
+        if capability is not None:
+            response.setdefault('capability_executed', capability)
+        response.setdefault('result_data', {})
+        response.setdefault('result_arrays', None)
+        response.setdefault('output_file_paths', [])
+        response.setdefault('error', '')
+        response['cached'] = cached
+        return response
+
+    def _cache_key(self, plugin: BasePlugin, experiment: Experiment, capability: str,
+                   project_config: Optional[ProjectConfig]) -> Optional[str]:
+        try:
+            return self.plugin_service.result_cache_key(plugin, experiment, capability, project_config)
+        except Exception as e:
+            logger.warning(f"Could not compute cache key for {experiment.id}; result will not be memoized: {e}")
+            return None
 
     def get_plugin_analysis_history(self, experiment_id: str) -> List[Dict[str, Any]]:
         """Get analysis history for an experiment."""
@@ -0,0 +1,311 @@
+"""
+Single-writer lease for projects on shared network storage.
+
+SQLite's file locking is slow and unreliable on SMB/NFS, and concurrent
+writers there fail with SQLITE_BUSY (or worse). A project under a shared root
+is therefore written by one client at a time: the writer holds a lease file
+next to mus1.db, and every other client opens the project read-only (see
+ProjectManagerClean.read_only) and sees the writer's commits as they land.
+
+The lease file (.mus1_write.lease) is a small JSON record: owner token, host,
+pid, user and expires_at. Every state change is one atomic filesystem
+operation:
+
+- acquire: os.open(O_CREAT | O_EXCL), so exactly one client creates it.
+- takeover of an expired lease: rename it to a unique tombstone (only one
+  contender's rename succeeds), check the tombstone still holds the expired
+  record that was read, delete it, then acquire with O_EXCL. If the holder
+  renewed in between, the tombstone is linked back into place.
+- renewal: a heartbeat thread rewrites the record every ttl/3 (temporary
+  file + os.replace) after checking the file is still ours. A lease found
+  to belong to someone else, or not renewed before it expires, is lost and
+  the subscribers are told.
+- release: rename to a tombstone and delete it if it is ours, otherwise
+  link it back.
+
+Writers also check the lease before each write (ProjectLease.verify), so a
+lost lease stops writes even between heartbeats. Expiry uses wall-clock
+time: clients' clocks must agree to well within DEFAULT_LEASE_TTL.
+
+acquire_project_lease() / release_project_lease() reference-count one lease
+per project directory per process, so several project managers for the same
+project share it. release_project_leases() drops all of them; it runs at
+interpreter exit and after every command the CLI daemon serves.
+"""
+
+import atexit
+import getpass
+import json
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+LEASE_FILENAME = ".mus1_write.lease"
+DEFAULT_LEASE_TTL = 120.0  # seconds
+
+
+class ProjectReadOnlyError(PermissionError):
+    """Raised when writing to a project opened without its write lease."""
+
+
+def _read_record(path: Path) -> Optional[Dict[str, Any]]:
+    try:
+        with open(path) as f:
+            record = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return record if isinstance(record, dict) else None
+
+
+class ProjectLease:
+    """Expiring write lease stored as a JSON file in the project directory."""
+
+    def __init__(self, project_dir: Path, ttl: float = DEFAULT_LEASE_TTL):
+        self.path = Path(project_dir) / LEASE_FILENAME
+        self.ttl = ttl
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:12]}"
+        self._held = False
+        self._expires_at = 0.0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._heartbeat: Optional[threading.Thread] = None
+        self._subscribers: List[Callable[[], None]] = []
+
+    # ---------- state ----------
+    @property
+    def held(self) -> bool:
+        """True while this client holds the lease (as far as it knows)."""
+        return self._held
+
+    def read(self) -> Optional[Dict[str, Any]]:
+        """Return the current lease record, or None if absent or unreadable."""
+        return _read_record(self.path)
+
+    def describe_holder(self) -> str:
+        """Who holds the lease, for messages."""
+        record = self.read()
+        if not record:
+            return "another client"
+        return f"{record.get('user', '?')} on {record.get('host', '?')} (pid {record.get('pid', '?')})"
+
+    def subscribe(self, callback: Callable[[], None]) -> Callable[[], None]:
+        """Call callback (from the heartbeat thread) if the lease is lost; returns an unsubscribe function."""
+        self._subscribers.append(callback)
+
+        def unsubscribe():
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+        return unsubscribe
+
+    def _record(self) -> Dict[str, Any]:
+        try:
+            user = getpass.getuser()
+        except Exception:
+            user = "unknown"
+        return {"owner": self.owner, "host": socket.gethostname(), "pid": os.getpid(),
+                "user": user, "expires_at": time.time() + self.ttl}
+
+    # ---------- acquire ----------
+    def try_acquire(self) -> bool:
+        """Take the lease without waiting. Returns True if held."""
+        with self._lock:
+            if self._held:
+                return True
+            for _ in range(3):
+                if self._create():
+                    self._start_heartbeat()
+                    return True
+                record = self.read()
+                if not self._expired(record):
+                    return False
+                self._take_over(record)
+            return False
+
+    def _create(self) -> bool:
+        try:
+            fd = os.open(self.path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644)
+        except FileExistsError:
+            return False
+        record = self._record()
+        with os.fdopen(fd, "w") as f:
+            json.dump(record, f)
+            f.flush()
+            os.fsync(f.fileno())
+        self._held = True
+        self._expires_at = record["expires_at"]
+        return True
+
+    def _expired(self, record: Optional[Dict[str, Any]]) -> bool:
+        if record is not None:
+            return record.get("expires_at", 0) <= time.time()
+        # Missing, or unreadable: a creator may not have written it yet, so
+        # only a file that has been unreadable for a whole TTL is abandoned
+        try:
+            return self.path.stat().st_mtime + self.ttl <= time.time()
+        except FileNotFoundError:
+            return True
+
+    def _take_over(self, expected: Optional[Dict[str, Any]]) -> None:
+        tombstone = self._tombstone()
+        try:
+            os.rename(self.path, tombstone)
+        except FileNotFoundError:
+            return  # released or taken over by someone else; retry the create
+        if _read_record(tombstone) == expected:
+            logger.info(f"Took over expired write lease {self.path} ({(expected or {}).get('owner', 'unreadable')})")
+            tombstone.unlink(missing_ok=True)
+        else:
+            # Renewed between our read and the rename: it is still valid
+            self._restore(tombstone)
+
+    def _tombstone(self) -> Path:
+        return self.path.with_name(f"{LEASE_FILENAME}.{uuid.uuid4().hex[:12]}.stale")
+
+    def _restore(self, tombstone: Path) -> None:
+        try:
+            os.link(tombstone, self.path)
+        except FileExistsError:
+            pass  # a newer lease is already in place
+        except OSError:
+            # Filesystems without hard links: rename back unless a new lease appeared
+            if not self.path.exists():
+                os.rename(tombstone, self.path)
+        tombstone.unlink(missing_ok=True)
+
+    # ---------- renewal ----------
+    def _start_heartbeat(self) -> None:
+        self._stop.clear()
+        self._heartbeat = threading.Thread(target=self._run_heartbeat, name="mus1-project-lease", daemon=True)
+        self._heartbeat.start()
+
+    def _run_heartbeat(self) -> None:
+        while not self._stop.wait(self.ttl / 3):
+            try:
+                if not self.renew():
+                    return
+            except OSError as e:
+                logger.warning(f"Could not renew write lease {self.path}: {e}")
+                if time.time() >= self._expires_at:
+                    with self._lock:
+                        if self._held:
+                            self._lose("it expired while the shared storage was unreachable")
+                    return
+
+    def renew(self) -> bool:
+        """Extend the lease if this client still holds it. Returns False if it was lost."""
+        with self._lock:
+            if not self._held:
+                return False
+            if not self._owns_file():
+                self._lose("another client took it over")
+                return False
+            record = self._record()
+            tmp = self.path.with_name(f"{LEASE_FILENAME}.{uuid.uuid4().hex[:12]}.tmp")
+            with open(tmp, "w") as f:
+                json.dump(record, f)
+            os.replace(tmp, self.path)
+            self._expires_at = record["expires_at"]
+            return True
+
+    def verify(self) -> bool:
+        """Check the lease file is still ours and unexpired (before a write)."""
+        if not self._held:
+            return False
+        if time.time() >= self._expires_at or not self._owns_file():
+            with self._lock:
+                if self._held:
+                    self._lose("it expired or another client took it over")
+            return False
+        return True
+
+    def _owns_file(self) -> bool:
+        record = self.read()
+        return record is not None and record.get("owner") == self.owner
+
+    def _lose(self, reason: str) -> None:
+        # Called with self._lock held
+        self._held = False
+        self._stop.set()
+        logger.warning(f"Lost write lease {self.path}: {reason}")
+        for callback in list(self._subscribers):
+            try:
+                callback()
+            except Exception as e:
+                logger.warning(f"Lease-lost callback failed: {e}")
+
+    # ---------- release ----------
+    def release(self) -> None:
+        """Give up the lease if this client holds it."""
+        with self._lock:
+            self._stop.set()
+            if not self._held:
+                return
+            self._held = False
+        if self._heartbeat is not None and self._heartbeat is not threading.current_thread():
+            self._heartbeat.join()
+        tombstone = self._tombstone()
+        try:
+            os.rename(self.path, tombstone)
+        except FileNotFoundError:
+            return
+        record = _read_record(tombstone)
+        if record is not None and record.get("owner") == self.owner:
+            tombstone.unlink(missing_ok=True)
+        else:
+            self._restore(tombstone)
+
+
+# ===========================================
+# PER-PROCESS REGISTRY
+# ===========================================
+
+_leases: Dict[str, Tuple[ProjectLease, int]] = {}
+_leases_lock = threading.Lock()
+
+
+def acquire_project_lease(project_dir: Path, ttl: float = DEFAULT_LEASE_TTL) -> Optional[ProjectLease]:
+    """Hold the write lease for project_dir in this process; None if another client holds it."""
+    key = str(Path(project_dir).resolve())
+    with _leases_lock:
+        entry = _leases.get(key)
+        if entry is not None and entry[0].held:
+            _leases[key] = (entry[0], entry[1] + 1)
+            return entry[0]
+        lease = ProjectLease(Path(key), ttl=ttl)
+        if not lease.try_acquire():
+            return None
+        _leases[key] = (lease, 1)
+        return lease
+
+
+def release_project_lease(lease: ProjectLease) -> None:
+    """Drop one reference to a lease from acquire_project_lease(); the last one releases it."""
+    key = str(lease.path.parent)
+    with _leases_lock:
+        entry = _leases.get(key)
+        if entry is not None and entry[0] is lease:
+            if entry[1] > 1:
+                _leases[key] = (lease, entry[1] - 1)
+                return
+            del _leases[key]
+    lease.release()
+
+
+@atexit.register
+def release_project_leases() -> None:
+    """Release every lease this process holds (at exit, and after each daemon command)."""
+    with _leases_lock:
+        leases = [lease for lease, _ in _leases.values()]
+        _leases.clear()
+    for lease in leases:
+        try:
+            lease.release()
+        except OSError as e:
+            logger.warning(f"Could not release write lease {lease.path}: {e}")
@@ -4,42 +4,132 @@ Clean Project Manager using the new architecture.
 This replaces the complex ProjectManager with a simple, focused implementation.
 """
 
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import functools
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple, Callable
 import json
 import logging
+import os
 from datetime import datetime
 
 from .metadata import ProjectConfig, Subject, Experiment, VideoFile, Colony, Worker, ScanTarget
-from .repository import RepositoryFactory
-from .schema import Database
+from .repository import RepositoryFactory, SubjectRecord, ExperimentRecord
+from .schema import get_database, dispose_database
+from .config_store import ConfigStore
+from .snapshot_service import SnapshotManager, DEFAULT_RETENTION
+from .project_lease import ProjectLease, ProjectReadOnlyError, acquire_project_lease, release_project_lease
+from .utils.file_hash import compute_sample_hash
+from .video_matching import VideoMatcher
 
 logger = logging.getLogger(__name__)
 
+def _writes(method):
+    """Mark a ProjectManagerClean method as a write: it needs the project's write lease."""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        self._require_writable()
+        return method(self, *args, **kwargs)
+    return wrapper
+
+
 class ProjectManagerClean:
-    """Clean project manager with focused responsibilities."""
+    """Clean project manager with focused responsibilities.
+
+    Projects on shared storage are written by one client at a time (see
+    project_lease): opening one takes its write lease, and if another client
+    holds it the project opens read-only. Methods marked @_writes then raise
+    ProjectReadOnlyError, and the database refuses writes (PRAGMA query_only).
+    """
 
     def __init__(self, project_path: Path):
         self.project_path = project_path
         self.config_path = project_path / "project.json"
         self.db_path = project_path / "mus1.db"
+        # How automatic snapshots are run: runner(reason, task) must call
+        # task(progress) and return its result. None runs them on the calling
+        # thread (CLI); the GUI sets one that keeps the event loop responsive.
+        self.snapshot_runner: Optional[Callable[[str, Callable], Any]] = None
+        self.write_lease: Optional[ProjectLease] = None
+        self.read_only = False
+        self.read_only_reason = ""
+        self._lease_unsubscribe: Optional[Callable[[], None]] = None
+
+        # Initialize database and repositories
+        self._bind_database()
+
+        # Load or create project config (written behind, see ConfigStore)
+        self._config_store = ConfigStore(self.config_path)
+        self.config = self._load_or_create_config()
+        self._acquire_write_lease()
+        self._apply_video_root()
+        self._migrate_json_batches()
 
-        # Initialize database
-        self.db = Database(str(self.db_path))
-        self.db.create_tables()
-
-        # Initialize repositories
+    def _bind_database(self) -> None:
+        """Bind to the shared database for db_path (schema checked once per process)."""
+        self.db = get_database(self.db_path)
         self.repos = RepositoryFactory(self.db)
 
-        # Load or create project config
-        self.config = self._load_or_create_config()
+    # ===========================================
+    # WRITE LEASE
+    # ===========================================
+
+    def _uses_write_lease(self) -> bool:
+        """Projects inside their shared root need the lease; settings['write_lease'] overrides."""
+        setting = self.config.settings.get('write_lease')
+        if setting is not None:
+            return bool(setting)
+        root = self.config.shared_root
+        return bool(root) and self.project_path.resolve().is_relative_to(Path(root).resolve())
+
+    def _acquire_write_lease(self) -> None:
+        """Take the write lease for a shared project, or open it read-only if someone else has it."""
+        self._set_read_only(False)
+        if not self._uses_write_lease():
+            return
+        lease = acquire_project_lease(self.project_path)
+        if lease is None:
+            holder = ProjectLease(self.project_path).describe_holder()
+            logger.warning(f"Project {self.config.name} is being written by {holder}; opening read-only")
+            self._set_read_only(True, f"{holder} holds the write lease")
+            return
+        self.write_lease = lease
+        self._lease_unsubscribe = lease.subscribe(self._on_lease_lost)
+
+    def _release_write_lease(self) -> None:
+        if self.write_lease is None:
+            return
+        self._lease_unsubscribe()
+        release_project_lease(self.write_lease)
+        self.write_lease = None
+        self._lease_unsubscribe = None
+
+    def _on_lease_lost(self) -> None:
+        # Heartbeat thread: stop writing; reopen the project to try again
+        self._set_read_only(True, "the write lease was lost")
+
+    def _set_read_only(self, read_only: bool, reason: str = "") -> None:
+        self.read_only = read_only
+        self.read_only_reason = reason
+        if read_only or self.db.read_only:
+            self.db.read_only = read_only
+
+    def _require_writable(self) -> None:
+        if self.write_lease is not None and not self.read_only and not self.write_lease.verify():
+            self._set_read_only(True, "the write lease was lost")
+        if self.read_only:
+            raise ProjectReadOnlyError(f"Project '{self.config.name}' is open read-only: {self.read_only_reason}")
+
+    def _apply_video_root(self) -> None:
+        """Resolve relative video paths against the shared root when enabled."""
+        relative = self.config.settings.get('relative_video_paths') and self.config.shared_root
+        self.db.video_root = Path(self.config.shared_root) if relative else None
 
     def _load_or_create_config(self) -> ProjectConfig:
         """Load existing config or create default."""
         if self.config_path.exists():
             try:
-                with open(self.config_path) as f:
-                    data = json.load(f)
+                data = self._config_store.load()
                 config = ProjectConfig(
                     name=data["name"],
                     shared_root=Path(data["shared_root"]) if data.get("shared_root") else None,
@@ -66,19 +156,19 @@ class ProjectManagerClean:
 
                 # Create default config
                 config = ProjectConfig(name=self.project_path.name)
-                self._save_config(config)
+                self._save_config(config, immediate=True)
                 logger.info("Created new config due to JSON corruption")
                 return config
             except Exception as e:
                 logger.error(f"Error loading config from {self.config_path}: {e}")
                 # Create default config as fallback
                 config = ProjectConfig(name=self.project_path.name)
-                self._save_config(config)
+                self._save_config(config, immediate=True)
                 return config
         else:
             # Create default config
             config = ProjectConfig(name=self.project_path.name)
-            self._save_config(config)
+            self._save_config(config, immediate=True)
             return config
 
     def _serialize_settings_for_json(self, settings: Dict[str, Any]) -> Dict[str, Any]:
@@ -111,8 +201,8 @@ class ProjectManagerClean:
 
         return deserialize_value(settings)
 
-    def _save_config(self, config: ProjectConfig):
-        """Save project config to disk."""
+    def _save_config(self, config: ProjectConfig, immediate: bool = False):
+        """Save project config; writes are debounced unless immediate (see flush_config)."""
         data = {
             "name": config.name,
             "shared_root": str(config.shared_root) if config.shared_root else None,
@@ -120,13 +210,17 @@ class ProjectManagerClean:
             "date_created": config.date_created.isoformat(),
             "settings": self._serialize_settings_for_json(config.settings)
         }
-        with open(self.config_path, 'w') as f:
-            json.dump(data, f, indent=2)
+        self._config_store.save(data, immediate=immediate)
+
+    def flush_config(self) -> None:
+        """Write pending project.json changes to disk now."""
+        self._config_store.flush()
 
     # ===========================================
     # SUBJECT OPERATIONS
     # ===========================================
 
+    @_writes
     def add_subject(self, subject: Subject) -> Subject:
         """Add a subject to the project."""
         # Validate that the subject's colony exists
@@ -145,6 +239,16 @@ class ProjectManagerClean:
 
     def list_subjects(self) -> List[Subject]:
         """List all subjects with sorting from project config."""
+        sort_by, sort_order = self._subject_sort()
+        return self.repos.subjects.find_all(sort_by=sort_by, sort_order=sort_order)
+
+    def list_subject_records(self) -> List[SubjectRecord]:
+        """List all subjects as read-only records (fast path for display and reports)."""
+        sort_by, sort_order = self._subject_sort()
+        return self.repos.subjects.list_records(sort_by=sort_by, sort_order=sort_order)
+
+    def _subject_sort(self) -> Tuple[str, str]:
+        """Map the project's global sort mode to a subject sort field and order."""
         # Get sort mode from project config, default to "Newest First"
         sort_mode = self.config.settings.get("global_sort_mode", "Newest First")
 
@@ -168,8 +272,9 @@ class ProjectManagerClean:
             sort_by = "date_added"
             sort_order = "desc"
 
-        return self.repos.subjects.find_all(sort_by=sort_by, sort_order=sort_order)
+        return sort_by, sort_order
 
+    @_writes
     def remove_subject(self, subject_id: str) -> bool:
         """Remove subject from project."""
         logger.info(f"Removing subject {subject_id} from project {self.config.name}")
@@ -189,6 +294,7 @@ class ProjectManagerClean:
     # EXPERIMENT OPERATIONS
     # ===========================================
 
+    @_writes
     def add_experiment(self, experiment: Experiment) -> Experiment:
         """Add an experiment to the project."""
         # Validate subject exists
@@ -207,6 +313,16 @@ class ProjectManagerClean:
 
     def list_experiments(self) -> List[Experiment]:
         """List all experiments with sorting from project config."""
+        sort_by, sort_order = self._experiment_sort()
+        return self.repos.experiments.find_all(sort_by=sort_by, sort_order=sort_order)
+
+    def list_experiment_records(self) -> List[ExperimentRecord]:
+        """List all experiments as read-only records (fast path for display and reports)."""
+        sort_by, sort_order = self._experiment_sort()
+        return self.repos.experiments.list_records(sort_by=sort_by, sort_order=sort_order)
+
+    def _experiment_sort(self) -> Tuple[str, str]:
+        """Map the project's global sort mode to an experiment sort field and order."""
         # Get sort mode from project config, default to "Recording Date"
         sort_mode = self.config.settings.get("global_sort_mode", "Recording Date")
 
@@ -231,12 +347,13 @@ class ProjectManagerClean:
             sort_by = "date_recorded"
             sort_order = "desc"
 
-        return self.repos.experiments.find_all(sort_by=sort_by, sort_order=sort_order)
+        return sort_by, sort_order
 
     def list_experiments_for_subject(self, subject_id: str) -> List[Experiment]:
         """List experiments for a specific subject."""
         return self.repos.experiments.find_by_subject(subject_id)
 
+    @_writes
     def remove_experiment(self, experiment_id: str) -> bool:
         """Remove experiment from project."""
         logger.info(f"Removing experiment {experiment_id} from project {self.config.name}")
@@ -249,6 +366,7 @@ class ProjectManagerClean:
     # VIDEO OPERATIONS
     # ===========================================
 
+    @_writes
     def add_video(self, video: VideoFile) -> VideoFile:
         """Add a video file to the project."""
         # Check for duplicates
@@ -270,6 +388,22 @@ class ProjectManagerClean:
         """Find videos with duplicate hashes."""
         return self.repos.videos.find_duplicates()
 
+    def storage_reclaim_report(self, top: int = 20) -> Dict[str, Any]:
+        """Duplicate-video storage report, attributed to the shared root and local scan roots."""
+        roots: List[Path] = []
+        if self.config.shared_root:
+            roots.append(Path(self.config.shared_root))
+        for target in self.config.settings.get('scan_targets', []) or []:
+            if target.get('kind', 'local') == 'local':
+                roots.extend(Path(r) for r in target.get('roots', []) or [])
+        return self.repos.videos.storage_reclaim_report(roots=roots, top=top)
+
+    def search(self, query: str, kinds: Optional[List[str]] = None,
+               limit: Optional[int] = 50) -> List[Dict[str, Any]]:
+        """Full-text search over subjects and experiments, best matches first (limit=None: all matches)."""
+        return self.repos.search.search(query, kinds=kinds, limit=limit)
+
+    @_writes
     def link_video_to_experiment(self, experiment_id: str, video_path: Path, notes: str = "") -> bool:
         """Link a video file to an experiment.
 
@@ -282,149 +416,190 @@ class ProjectManagerClean:
             True if linking was successful, False otherwise
         """
         try:
-            # Validate experiment exists
-            experiment = self.get_experiment(experiment_id)
-            if not experiment:
-                logger.error(f"Experiment {experiment_id} does not exist")
-                return False
-
             # Check if video file exists
             if not video_path.exists():
                 logger.error(f"Video file does not exist: {video_path}")
                 return False
 
-            # Compute hash for the video file
-            from .utils.file_hash import compute_sample_hash
+            # Hash and stat the file before opening the transaction
             try:
                 video_hash = compute_sample_hash(video_path)
+                stat = video_path.stat()
             except Exception as e:
                 logger.error(f"Failed to compute hash for video {video_path}: {e}")
                 return False
 
-            # Check if video already exists by hash first
-            existing_video = self.repos.videos.find_by_hash(video_hash)
-            if existing_video:
-                logger.info(f"Video {video_path} already exists in project (hash: {video_hash})")
-                # Check if already associated with this experiment
-                if self._is_video_associated_with_experiment(experiment_id, existing_video):
-                    logger.info(f"Video {video_path} already associated with experiment {experiment_id}")
-                else:
-                    # Associate existing video with experiment
-                    self._associate_video_with_experiment(experiment_id, existing_video)
-                    logger.info(f"Associated existing video {video_path} with experiment {experiment_id}")
-                return True
+            # One unit of work: every lookup and write below shares a session and commits once
+            with self.repos.transaction() as uow:
+                if not uow.experiments.find_by_id(experiment_id):
+                    logger.error(f"Experiment {experiment_id} does not exist")
+                    return False
 
-            # Check if video exists by path (might have been saved with empty hash previously)
-            existing_video_by_path = self.repos.videos.find_by_path(video_path)
-            if existing_video_by_path:
-                logger.info(f"Video {video_path} exists in project but with different hash (old: {existing_video_by_path.hash}, new: {video_hash})")
-                # Update the existing video record with correct hash and metadata
-                try:
-                    stat = video_path.stat()
-                    updated_video = VideoFile(
+                # Check if video already exists by hash first
+                video = uow.videos.find_by_hash(video_hash)
+                if video:
+                    logger.info(f"Video {video_path} already exists in project (hash: {video_hash})")
+                else:
+                    # Video may exist by path (saved with empty/stale hash previously); save() updates it
+                    existing_video_by_path = uow.videos.find_by_path(video_path)
+                    if existing_video_by_path:
+                        logger.info(f"Video {video_path} exists in project but with different hash (old: {existing_video_by_path.hash}, new: {video_hash})")
+                    video = uow.videos.save(VideoFile(
                         path=video_path,
                         hash=video_hash,
                         size_bytes=stat.st_size,
                         last_modified=stat.st_mtime
-                    )
-                    # Update the video in database
-                    self.repos.videos.save(updated_video)  # This will update due to merge behavior
-                    logger.info(f"Updated video metadata for {video_path}")
-
-                    # Check if already associated with this experiment
-                    if self._is_video_associated_with_experiment(experiment_id, updated_video):
-                        logger.info(f"Video {video_path} already associated with experiment {experiment_id}")
-                    else:
-                        # Associate video with experiment
-                        self._associate_video_with_experiment(experiment_id, updated_video)
-                        logger.info(f"Associated updated video {video_path} with experiment {experiment_id}")
-                    return True
-                except Exception as e:
-                    logger.error(f"Failed to update existing video {video_path}: {e}")
-                    return False
+                    ))
+                    logger.info(f"Video {video_path} saved, now linking to experiment {experiment_id}")
 
-            # Get file metadata
-            try:
-                stat = video_path.stat()
-                video_file = VideoFile(
-                    path=video_path,
-                    hash=video_hash,
-                    size_bytes=stat.st_size,
-                    last_modified=stat.st_mtime
-                )
-            except Exception as e:
-                logger.error(f"Failed to get file metadata for {video_path}: {e}")
-                return False
-
-            # Save the video record
-            try:
-                saved_video = self.repos.videos.save(video_file)
-                logger.info(f"Video {video_path} saved, now linking to experiment {experiment_id}")
+                if uow.experiments.is_video_associated(experiment_id, video.path):
+                    logger.info(f"Video {video_path} already associated with experiment {experiment_id}")
+                    return True
 
-                # Create experiment-video association
-                self._associate_video_with_experiment(experiment_id, saved_video)
+                if not uow.experiments.add_video_to_experiment_by_path(experiment_id, video.path):
+                    logger.error(f"Could not find video ID for path: {video.path}")
+                    return False
                 logger.info(f"Video {video_path} linked to experiment {experiment_id}: {notes}")
                 return True
-            except Exception as e:
-                logger.error(f"Failed to save video record for {video_path}: {e}")
-                return False
 
         except Exception as e:
             logger.error(f"Error linking video to experiment: {e}")
             return False
 
-    def _associate_video_with_experiment(self, experiment_id: str, video: VideoFile) -> None:
-        """Create an association between an experiment and a video."""
-        from sqlalchemy import text
-        with self.db.get_session() as session:
-            # Get the video ID by querying with the path
-            result = session.execute(
-                text("SELECT id FROM videos WHERE path = :path"),
-                {"path": str(video.path)}
-            ).fetchone()
-
-            if result:
-                video_id = result[0]
-                # Insert into association table
-                session.execute(
-                    text("""
-                        INSERT OR IGNORE INTO experiment_videos (experiment_id, video_id)
-                        VALUES (:experiment_id, :video_id)
-                    """),
-                    {"experiment_id": experiment_id, "video_id": video_id}
-                )
-                session.commit()
-            else:
-                logger.error(f"Could not find video ID for path: {video.path}")
-
-    def _is_video_associated_with_experiment(self, experiment_id: str, video: VideoFile) -> bool:
-        """Check if a video is already associated with an experiment."""
-        from sqlalchemy import text
-        with self.db.get_session() as session:
-            # Get the video ID first
-            result = session.execute(
-                text("SELECT id FROM videos WHERE path = :path"),
-                {"path": str(video.path)}
-            ).fetchone()
-
-            if not result:
-                return False
+    @_writes
+    def link_videos_to_experiments(self, links: List[Tuple[str, Path]], notes: str = "",
+                                   max_workers: Optional[int] = None,
+                                   progress: Optional[Callable[[int, int], None]] = None) -> Dict[str, Any]:
+        """Link many videos to experiments at once.
 
-            video_id = result[0]
-            association = session.execute(
-                text("""
-                    SELECT 1 FROM experiment_videos
-                    WHERE experiment_id = :experiment_id AND video_id = :video_id
-                    LIMIT 1
-                """),
-                {"experiment_id": experiment_id, "video_id": video_id}
-            ).fetchone()
-            return association is not None
+        Files are stat'ed and sample-hashed in parallel; a path already in the
+        project with unchanged size and mtime reuses its stored hash. Videos
+        and associations are then written set-wise in one transaction.
+
+        Args:
+            links: (experiment_id, video_path) pairs
+            notes: Optional notes about the linking (logged)
+            max_workers: Hashing threads (default: min(8, CPU count))
+            progress: Called as progress(done, total) while files are hashed
+
+        Returns:
+            {"success", "message", "linked", "already_linked", "failed", "rows"}; rows
+            follow the input order with experiment_id, path, status, hash and message.
+            Status is linked, already_linked, unknown_experiment, missing_file or hash_error.
+        """
+        rows = [{"experiment_id": exp_id, "path": Path(path), "status": None, "hash": None, "message": ""}
+                for exp_id, path in links]
+        paths = list(dict.fromkeys(str(row["path"]) for row in rows))
+        known = self.repos.videos.known_files(paths)
+
+        def stat_and_hash(path_str: str) -> Dict[str, Any]:
+            path = Path(path_str)
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                return {"status": "missing_file", "message": f"Video file does not exist: {path}"}
+            cached = known.get(path_str)
+            if cached and cached["size_bytes"] == stat.st_size and cached["last_modified"] == stat.st_mtime:
+                video_hash = cached["hash"]
+            else:
+                try:
+                    video_hash = compute_sample_hash(path)
+                except Exception as e:
+                    return {"status": "hash_error", "message": f"Failed to compute hash: {e}"}
+            return {"hash": video_hash, "size_bytes": stat.st_size, "last_modified": stat.st_mtime}
+
+        files: Dict[str, Dict[str, Any]] = {}
+        workers = max_workers or min(8, os.cpu_count() or 1)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(stat_and_hash, p): p for p in paths}
+            for done, future in enumerate(as_completed(futures), start=1):
+                files[futures[future]] = future.result()
+                if progress:
+                    progress(done, len(paths))
+
+        pending = []
+        for seq, row in enumerate(rows):
+            info = files[str(row["path"])]
+            if "status" in info:
+                row.update(status=info["status"], message=info["message"])
+                continue
+            row["hash"] = info["hash"]
+            pending.append({"seq": seq, "experiment_id": row["experiment_id"], "path": str(row["path"]),
+                            "hash": info["hash"], "size_bytes": info["size_bytes"],
+                            "last_modified": info["last_modified"]})
+
+        if pending:
+            self._auto_snapshot("video-linking")
+            with self.repos.transaction() as uow:
+                outcomes = uow.videos.link_to_experiments(pending)
+            for seq, outcome in outcomes.items():
+                row = rows[seq]
+                row["status"] = outcome["status"]
+                if outcome["status"] == "unknown_experiment":
+                    row["message"] = f"Experiment {row['experiment_id']} does not exist"
+
+        counts = {status: 0 for status in ("linked", "already_linked")}
+        failed = 0
+        for row in rows:
+            row["path"] = str(row["path"])
+            if row["status"] in counts:
+                counts[row["status"]] += 1
+            else:
+                failed += 1
+        message = (f"Linked {counts['linked']} videos ({counts['already_linked']} already linked, "
+                   f"{failed} failed)")
+        logger.info(f"{message}{': ' + notes if notes else ''}")
+        return {"success": failed == 0, "message": message, "linked": counts["linked"],
+                "already_linked": counts["already_linked"], "failed": failed, "rows": rows}
+
+    def match_unlinked_videos(self, templates: Optional[List[str]] = None, apply: bool = False,
+                              min_confidence: float = 0.9) -> Dict[str, Any]:
+        """Propose (and optionally link) experiments for videos not linked to any experiment.
+
+        Filename/path templates default to settings['video_match_templates'],
+        then video_matching.DEFAULT_TEMPLATES. With apply, unambiguous proposals
+        at or above min_confidence are linked in one transaction.
+
+        Returns {"success", "message", "unlinked", "proposals", "applied"}; each
+        proposal has video_id, path, experiment_id (None if ambiguous),
+        confidence, reason and candidates, best first.
+        """
+        if apply:
+            self._require_writable()
+        templates = templates or self.config.settings.get('video_match_templates') or None
+        matcher = VideoMatcher(self.repos.experiments.list_records(), templates=templates)
+        videos = self.repos.videos.unlinked()
+        proposals = matcher.match_all(videos)
+        proposals.sort(key=lambda p: -p["confidence"])
+
+        applied = 0
+        if apply:
+            accepted = [p for p in proposals if p["experiment_id"] and p["confidence"] >= min_confidence]
+            if accepted:
+                self._auto_snapshot("video-matching")
+                # Link the exact record the proposal names; several records may share a hash
+                rows = [{"seq": i, "experiment_id": p["experiment_id"], "video_id": p["video_id"],
+                         "path": p["path"], "hash": p["hash"],
+                         "size_bytes": p["size_bytes"], "last_modified": p["last_modified"]}
+                        for i, p in enumerate(accepted)]
+                with self.repos.transaction() as uow:
+                    outcomes = uow.videos.link_to_experiments(rows)
+                applied = sum(1 for o in outcomes.values() if o["status"] == "linked")
+                for i, proposal in enumerate(accepted):
+                    proposal["applied"] = outcomes[i]["status"] == "linked"
+
+        message = f"Matched {len(proposals)} of {len(videos)} unlinked videos"
+        if apply:
+            message += f", linked {applied}"
+        logger.info(message)
+        return {"success": True, "message": message, "unlinked": len(videos),
+                "proposals": proposals, "applied": applied}
 
     # ===========================================
     # WORKER OPERATIONS
     # ===========================================
 
+    @_writes
     def add_worker(self, worker: 'Worker') -> 'Worker':
         """Add a worker to the project."""
         logger.info(f"Adding worker {worker.name} to project {self.config.name}")
@@ -444,6 +619,7 @@ class ProjectManagerClean:
     # SCAN TARGET OPERATIONS
     # ===========================================
 
+    @_writes
     def add_scan_target(self, target: 'ScanTarget') -> 'ScanTarget':
         """Add a scan target to the project."""
         logger.info(f"Adding scan target {target.name} to project {self.config.name}")
@@ -463,6 +639,7 @@ class ProjectManagerClean:
     # PROJECT CONFIGURATION
     # ===========================================
 
+    @_writes
     def set_shared_root(self, shared_root: Path):
         """Set the shared storage root."""
         if not shared_root.exists():
@@ -471,7 +648,10 @@ class ProjectManagerClean:
         logger.info(f"Setting shared root to {shared_root} for project {self.config.name}")
         self.config.shared_root = shared_root
         self._save_config(self.config)
+        # Relative video paths follow the new root without touching the rows
+        self._apply_video_root()
 
+    @_writes
     def set_lab_id(self, lab_id: str):
         """Associate project with a lab."""
         logger.info(f"Associating project {self.config.name} with lab {lab_id}")
@@ -482,6 +662,7 @@ class ProjectManagerClean:
     # COLONY OPERATIONS
     # ===========================================
 
+    @_writes
     def add_colony(self, colony: Colony) -> Colony:
         """Add a colony to the project."""
         # Validate that colony belongs to the same lab as the project
@@ -510,6 +691,7 @@ class ProjectManagerClean:
         """List all subjects from a specific colony."""
         return self.repos.subjects.find_by_colony(colony_id)
 
+    @_writes
     def import_subjects_from_colony(self, colony_id: str, subject_ids: Optional[List[str]] = None) -> List[Subject]:
         """Import subjects from a colony into the project.
 
@@ -536,6 +718,8 @@ class ProjectManagerClean:
             subject_id_set = set(subject_ids)
             colony_subjects = [s for s in colony_subjects if s.id in subject_id_set]
 
+        self._auto_snapshot("colony-import")
+
         # Import subjects that don't already exist in the project
         imported_subjects = []
         for subject in colony_subjects:
@@ -550,6 +734,7 @@ class ProjectManagerClean:
         logger.info(f"Imported {len(imported_subjects)} subjects from colony {colony_id} into project {self.config.name}")
         return imported_subjects
 
+    @_writes
     def remove_colony(self, colony_id: str) -> bool:
         """Remove colony from project."""
         logger.info(f"Removing colony {colony_id} from project {self.config.name}")
@@ -570,50 +755,46 @@ class ProjectManagerClean:
     # ===========================================
 
     def get_stats(self) -> dict:
-        """Get project statistics."""
+        """Get project statistics (read from the trigger-maintained project_stats table)."""
+        stats = self.repos.stats.get()
+        if self.config.lab_id:
+            # Same scope as list_colonies(): only the project's lab
+            stats["colonies"] = self.repos.colonies.count_by_lab(self.config.lab_id)
         return {
             "name": self.config.name,
-            "colonies": len(self.list_colonies()),
-            "subjects": len(self.list_subjects()),
-            "experiments": len(self.list_experiments()),
-            "videos": len(self.find_duplicate_videos()),  # This is approximate
-            "workers": len(self.list_workers()),
-            "scan_targets": len(self.list_scan_targets()),
+            **stats,
             "shared_root": str(self.config.shared_root) if self.config.shared_root else None,
             "lab_id": self.config.lab_id
         }
 
+    def export_project(self, output_dir: Path, fmt: str = "parquet", incremental: bool = False,
+                       tables: Optional[List[str]] = None, progress=None) -> Dict[str, Any]:
+        """Export project tables to Parquet/Feather files, optionally only rows changed since the last export."""
+        from .export_service import ProjectExporter
+        exporter = ProjectExporter(self.db, output_dir, fmt=fmt)
+        return exporter.export(tables=tables, incremental=incremental, progress=progress)
+
     def list_videos(self) -> List[VideoFile]:
         """List all videos in the project."""
         return self.repos.videos.find_all()
 
     def get_videos_for_experiment(self, experiment_id: str) -> List[VideoFile]:
         """Get all videos associated with a specific experiment."""
-        from sqlalchemy import text
-        with self.db.get_session() as session:
-            # Query videos through the association table
-            results = session.execute(
-                text("""
-                    SELECT v.path, v.hash, v.recorded_time, v.size_bytes, v.last_modified, v.date_added
-                    FROM videos v
-                    JOIN experiment_videos ev ON v.id = ev.video_id
-                    WHERE ev.experiment_id = :experiment_id
-                """),
-                {"experiment_id": experiment_id}
-            ).fetchall()
-
-            videos = []
-            for row in results:
-                videos.append(VideoFile(
-                    path=Path(row[0]),
-                    hash=row[1],
-                    recorded_time=row[2],
-                    size_bytes=row[3],
-                    last_modified=row[4],
-                    date_added=row[5]
-                ))
-            return videos
+        return self.repos.experiments.get_videos_for_experiment(experiment_id)
+
+    def video_counts_by_experiment(self) -> Dict[str, int]:
+        """Get linked video counts for all experiments in one query."""
+        return self.repos.experiments.video_counts_by_experiment()
 
+    def experiment_counts_by_subject(self) -> Dict[str, int]:
+        """Get experiment counts for all subjects in one query."""
+        return self.repos.experiments.experiment_counts_by_subject()
+
+    def video_counts_by_subject(self) -> Dict[str, int]:
+        """Get linked video counts for all subjects in one query."""
+        return self.repos.experiments.video_counts_by_subject()
+
+    @_writes
     def create_batch(self, batch_id: str, experiment_ids: List[str], batch_name: str = None, description: str = None, selection_criteria: Dict[str, Any] = None) -> str:
         """Create a new batch of experiments.
 
@@ -630,56 +811,87 @@ class ProjectManagerClean:
         Raises:
             ValueError: If batch_id already exists or if any experiment_ids are invalid
         """
-        # Validate batch_id doesn't already exist
-        # For now, we'll store batches in project settings since there's no dedicated batch table
-        batches = self.config.settings.get('batches', {})
-        if batch_id in batches:
-            raise ValueError(f"Batch '{batch_id}' already exists")
-
-        # Validate all experiment IDs exist
-        for exp_id in experiment_ids:
-            if not self.get_experiment(exp_id):
-                raise ValueError(f"Experiment '{exp_id}' does not exist")
-
-        # Create batch record
-        batch_record = {
-            'id': batch_id,
-            'name': batch_name,
-            'description': description,
-            'experiment_ids': experiment_ids,
-            'selection_criteria': selection_criteria or {},
-            'created_at': datetime.now().isoformat(),
-            'status': 'created'
-        }
-
-        # Store in project settings
-        if 'batches' not in self.config.settings:
-            self.config.settings['batches'] = {}
-        self.config.settings['batches'][batch_id] = batch_record
-        self._save_config(self.config)
-
+        self.repos.batches.create(
+            batch_id, experiment_ids, name=batch_name, description=description,
+            selection_criteria=selection_criteria,
+        )
         logger.info(f"Created batch '{batch_id}' with {len(experiment_ids)} experiments")
         return batch_id
 
     def get_batch(self, batch_id: str) -> Optional[Dict[str, Any]]:
-        """Get batch information by ID."""
-        batches = self.config.settings.get('batches', {})
-        return batches.get(batch_id)
-
-    def list_batches(self) -> List[Dict[str, Any]]:
-        """List all batches in the project."""
-        batches = self.config.settings.get('batches', {})
-        return list(batches.values())
+        """Get batch information (including experiment_ids) by ID."""
+        return self.repos.batches.get(batch_id)
+
+    def list_batches(self, status: Optional[str] = None, name_contains: Optional[str] = None,
+                     experiment_id: Optional[str] = None, limit: Optional[int] = None,
+                     offset: int = 0) -> List[Dict[str, Any]]:
+        """List batches (headers with experiment_count), newest first."""
+        return self.repos.batches.list(status=status, name_contains=name_contains,
+                                       experiment_id=experiment_id, limit=limit, offset=offset)
+
+    def get_batch_experiments(self, batch_id: str, offset: int = 0, limit: Optional[int] = 100) -> List[str]:
+        """Page through the experiment IDs of a batch."""
+        return self.repos.batches.members(batch_id, offset=offset, limit=limit)
+
+    def diff_batches(self, batch_a: str, batch_b: str) -> Dict[str, Any]:
+        """Compare the membership of two batches."""
+        return self.repos.batches.diff(batch_a, batch_b)
+
+    @_writes
+    def remove_batch(self, batch_id: str) -> bool:
+        """Delete a batch (experiments are not affected)."""
+        return self.repos.batches.delete(batch_id)
+
+    def _migrate_json_batches(self) -> None:
+        """Move batches stored in project.json settings into the batches tables (runs once)."""
+        batches = self.config.settings.get('batches')
+        if not batches or self.read_only:
+            return
+        self._auto_snapshot("batch-migration")
+        migrated = 0
+        failed = {}
+        for batch_id, record in batches.items():
+            try:
+                if self.repos.batches.get(batch_id, include_members=False):
+                    continue
+                if not isinstance(record, dict):
+                    raise ValueError(f"expected an object, got {type(record).__name__}")
+                experiment_ids = record.get('experiment_ids') or []
+                if not isinstance(experiment_ids, list) or not all(isinstance(e, str) for e in experiment_ids):
+                    raise ValueError("experiment_ids must be a list of strings")
+                try:
+                    created_at = datetime.fromisoformat(record['created_at']) if record.get('created_at') else None
+                except (TypeError, ValueError):
+                    created_at = None
+                self.repos.batches.create(
+                    batch_id, experiment_ids, name=record.get('name'),
+                    description=record.get('description'), selection_criteria=record.get('selection_criteria'),
+                    status=record.get('status', 'created'), created_at=created_at, skip_missing=True,
+                )
+                migrated += 1
+            except Exception as e:
+                # Keep the record in project.json so nothing is lost; the project still opens
+                logger.warning(f"Could not migrate batch '{batch_id}': {e}")
+                failed[batch_id] = record
+        if failed:
+            self.config.settings['batches'] = failed
+        else:
+            del self.config.settings['batches']
+        self._save_config(self.config)
+        logger.info(f"Migrated {migrated} batches from project.json to the database"
+                    + (f"; {len(failed)} left in project.json" if failed else ""))
 
+    @_writes
     def save_project(self):
         """Save project configuration and state."""
         try:
-            self._save_config(self.config)
+            self._save_config(self.config, immediate=True)
             logger.info(f"Project {self.config.name} saved successfully")
         except Exception as e:
             logger.error(f"Failed to save project {self.config.name}: {e}")
             raise
 
+    @_writes
     def rename_project(self, new_name: str) -> bool:
         """Rename the project."""
         try:
@@ -697,12 +909,21 @@ class ProjectManagerClean:
                 raise ValueError(f"Directory {new_path} already exists")
 
             import shutil
+            dispose_database(self.db_path)
+            self._config_store.close()
+            self._release_write_lease()  # the lease file moves with the directory
+            old_path = self.project_path
             shutil.move(str(self.project_path), str(new_path))
 
             # Update our internal path
             self.project_path = new_path
             self.config_path = new_path / "project.json"
             self.db_path = new_path / "mus1.db"
+            self._bind_database()
+            self._acquire_write_lease()
+            self._apply_video_root()
+            self._config_store = ConfigStore(self.config_path)
+            self._rebase_moved_videos(old_path, new_path)
 
             # Save the updated config
             self.save_project()
@@ -714,6 +935,7 @@ class ProjectManagerClean:
             logger.error(f"Failed to rename project: {e}")
             raise
 
+    @_writes
     def move_project_to_directory(self, destination: Path) -> Path:
         """Move project to a new directory."""
         try:
@@ -726,12 +948,21 @@ class ProjectManagerClean:
                 raise ValueError(f"Project directory {new_project_path} already exists")
 
             import shutil
+            dispose_database(self.db_path)
+            self._config_store.close()
+            self._release_write_lease()  # the lease file moves with the directory
+            old_path = self.project_path
             shutil.move(str(self.project_path), str(new_project_path))
 
             # Update our internal path
             self.project_path = new_project_path
             self.config_path = new_project_path / "project.json"
             self.db_path = new_project_path / "mus1.db"
+            self._bind_database()
+            self._acquire_write_lease()
+            self._apply_video_root()
+            self._config_store = ConfigStore(self.config_path)
+            self._rebase_moved_videos(old_path, new_project_path)
 
             # Save the updated config
             self.save_project()
@@ -743,8 +974,111 @@ class ProjectManagerClean:
             logger.error(f"Failed to move project: {e}")
             raise
 
+    # ===========================================
+    # VIDEO PATH RELOCATION
+    # ===========================================
+
+    def rebase_video_paths(self, old_prefix: Path, new_prefix: Path, sample_size: int = 20,
+                           dry_run: bool = False, force: bool = False, max_workers: Optional[int] = None,
+                           progress: Optional[Callable[[int, int], None]] = None) -> Dict[str, Any]:
+        """Rewrite the directory prefix of every video stored under old_prefix.
+
+        A random sample of the moved files is checked in parallel (file exists at
+        the new location and its sample hash matches the stored one) before the
+        single UPDATE runs; any failed check aborts unless force is set.
+
+        Returns {"success", "message", "matched", "updated", "verified", "failures", "conflicts"}.
+        """
+        old_prefix, new_prefix = Path(old_prefix), Path(new_prefix)
+        videos = self.repos.videos
+        result = {"success": False, "message": "", "matched": videos.count_with_prefix(old_prefix),
+                  "updated": 0, "verified": 0, "failures": [], "conflicts": 0}
+        if not result["matched"]:
+            result.update(success=True, message=f"No videos stored under {old_prefix}")
+            return result
+
+        result["conflicts"] = videos.prefix_conflicts(old_prefix, new_prefix)
+        if result["conflicts"]:
+            result["message"] = f"{result['conflicts']} rebased path(s) are already registered; nothing changed"
+            return result
+
+        def verify(sample: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+            new_path = new_prefix / Path(sample["path"]).relative_to(old_prefix)
+            if not new_path.exists():
+                return {"path": sample["path"], "new_path": str(new_path), "reason": "missing"}
+            try:
+                if compute_sample_hash(new_path) != sample["hash"]:
+                    return {"path": sample["path"], "new_path": str(new_path), "reason": "hash mismatch"}
+            except OSError as e:
+                return {"path": sample["path"], "new_path": str(new_path), "reason": str(e)}
+            return None
+
+        samples = videos.sample_with_prefix(old_prefix, sample_size) if sample_size > 0 else []
+        workers = max_workers or min(8, os.cpu_count() or 1)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(verify, sample) for sample in samples]
+            for done, future in enumerate(as_completed(futures), start=1):
+                failure = future.result()
+                if failure:
+                    result["failures"].append(failure)
+                if progress:
+                    progress(done, len(samples))
+        result["verified"] = len(samples) - len(result["failures"])
+
+        if result["failures"] and not force:
+            result["message"] = (f"{len(result['failures'])} of {len(samples)} sampled files failed verification "
+                                 f"at {new_prefix}; nothing changed")
+            return result
+        if dry_run:
+            result.update(success=True, message=f"Would rebase {result['matched']} video paths to {new_prefix}")
+            return result
+
+        self._require_writable()
+        self._auto_snapshot("path-rebase")
+        with self.repos.transaction() as uow:
+            result["updated"] = uow.videos.rebase_prefix(old_prefix, new_prefix)
+        result.update(success=True, message=f"Rebased {result['updated']} video paths from {old_prefix} to {new_prefix}")
+        logger.info(result["message"])
+        return result
+
+    def _rebase_moved_videos(self, old_path: Path, new_path: Path) -> None:
+        """Follow videos stored inside a project directory that was moved."""
+        try:
+            result = self.rebase_video_paths(old_path, new_path)
+        except Exception as e:
+            logger.warning(f"Could not rebase video paths after moving the project: {e}")
+            return
+        if not result["success"]:
+            logger.warning(f"Video paths not rebased after moving the project: {result['message']}")
+
+    @_writes
+    def set_relative_video_paths(self, enabled: bool = True) -> Dict[str, Any]:
+        """Store video paths under the shared root relative to it.
+
+        Once enabled, moving the shared storage only needs set_shared_root();
+        no video rows change. Disabling turns them back into absolute paths.
+        """
+        root = self.config.shared_root
+        if root is None:
+            raise ValueError("Set a shared root before switching to relative video paths")
+        self._auto_snapshot("relative-paths" if enabled else "absolute-paths")
+        with self.repos.transaction() as uow:
+            if enabled:
+                updated = uow.videos.make_relative(root)
+            else:
+                updated = uow.videos.make_absolute(root)
+        self.config.settings['relative_video_paths'] = enabled
+        self._save_config(self.config, immediate=True)
+        self._apply_video_root()
+        kind = "relative to" if enabled else "absolute under"
+        message = f"Stored {updated} video paths {kind} {root}"
+        logger.info(message)
+        return {"success": True, "message": message, "updated": updated}
+
+    @_writes
     def register_unlinked_videos(self, videos_iter) -> int:
         """Register videos that are not yet linked to experiments."""
+        self._auto_snapshot("video-registration")
         try:
             count = 0
             for video in videos_iter:
@@ -763,13 +1097,67 @@ class ProjectManagerClean:
             logger.error(f"Failed to register unlinked videos: {e}")
             return 0
 
+    # ===========================================
+    # SNAPSHOTS
+    # ===========================================
+
+    @property
+    def snapshots(self) -> SnapshotManager:
+        """Snapshot manager for this project's database and project.json."""
+        retention = self.config.settings.get("snapshot_retention", DEFAULT_RETENTION)
+        return SnapshotManager(self.db_path, self.config_path, retention=retention)
+
+    @_writes
+    def create_snapshot(self, reason: str = "manual", progress=None) -> Dict[str, Any]:
+        """Take an online snapshot of the project (readers and writers keep running)."""
+        self.flush_config()
+        return self.snapshots.create(reason=reason, progress=progress)
+
+    def list_snapshots(self) -> List[Dict[str, Any]]:
+        """List project snapshots, newest first."""
+        return self.snapshots.list()
+
+    @_writes
+    def restore_snapshot(self, snapshot_id: str, progress=None) -> Dict[str, Any]:
+        """Restore the project to a snapshot; the current state is snapshotted first."""
+        self.flush_config()
+        result = self.snapshots.restore(snapshot_id, progress=progress)
+        self._config_store = ConfigStore(self.config_path)
+        self.config = self._load_or_create_config()
+        self._apply_video_root()
+        return result
+
+    def _auto_snapshot(self, reason: str) -> None:
+        """Snapshot before a bulk operation; skipped if nothing changed since the last one.
+
+        The operation waits for the snapshot either way; snapshot_runner only
+        decides which thread copies the database.
+        """
+        if not self.config.settings.get("auto_snapshots", True) or not self.db_path.exists():
+            return
+        try:
+            self.flush_config()
+            snapshots = self.snapshots
+
+            def task(progress=None):
+                return snapshots.create(reason=reason, progress=progress, skip_if_unchanged=True)
+
+            if self.snapshot_runner is None:
+                task()
+            else:
+                self.snapshot_runner(reason, task)
+        except Exception as e:
+            logger.warning(f"Automatic snapshot before {reason} failed: {e}")
+
     def cleanup(self):
         """Clean up resources."""
-        # Close database connections
-        pass
+        # Make pending project.json changes durable, then let other clients write
+        self._config_store.flush()
+        self._release_write_lease()
 
     # --- Treatment and Genotype Management ---
 
+    @_writes
     def add_treatment(self, name: str) -> None:
         """Add a treatment to the project's available treatments."""
         if not name or not name.strip():
@@ -784,6 +1172,7 @@ class ProjectManagerClean:
         else:
             logger.warning(f"Failed to add treatment '{name}' to project {self.config.name}")
 
+    @_writes
     def add_genotype(self, name: str) -> None:
         """Add a genotype to the project's available genotypes."""
         if not name or not name.strip():
@@ -818,6 +1207,7 @@ class ProjectManagerClean:
             # Return all genotypes (for local projects)
             return self.repos.genotypes.get_all()
 
+    @_writes
     def update_available_genotypes(self, genotypes: List[str]) -> None:
         """Update the list of available genotypes for this project."""
         lab_id = self.config.lab_id
@@ -833,6 +1223,7 @@ class ProjectManagerClean:
 
         logger.info(f"Updated available genotypes for project {self.config.name}: {genotypes}")
 
+    @_writes
     def update_available_treatments(self, treatments: List[str]) -> None:
         """Update the list of available treatments for this project."""
         lab_id = self.config.lab_id
@@ -848,6 +1239,7 @@ class ProjectManagerClean:
 
         logger.info(f"Updated available treatments for project {self.config.name}: {treatments}")
 
+    @_writes
     def remove_treatment(self, name: str) -> bool:
         """Remove a treatment from available treatments."""
         success = self.repos.treatments.remove(name)
@@ -855,6 +1247,7 @@ class ProjectManagerClean:
             logger.info(f"Removed treatment '{name}' from project {self.config.name}")
         return success
 
+    @_writes
     def remove_genotype(self, name: str) -> bool:
         """Remove a genotype from available genotypes."""
         success = self.repos.genotypes.remove(name)
@@ -864,6 +1257,7 @@ class ProjectManagerClean:
 
     # --- Body Parts and Objects Management (placeholders) ---
 
+    @_writes
     def update_active_body_parts(self, active_list: List[str]) -> None:
         """Update active body parts in the project."""
         lab_id = self.config.lab_id
@@ -879,6 +1273,7 @@ class ProjectManagerClean:
 
         logger.info(f"Updated active body parts: {active_list}")
 
+    @_writes
     def update_master_body_parts(self, master_list: List[str]) -> None:
         """Update master body parts in the project."""
         # For now, master body parts are stored in config (may be project-specific)
@@ -901,6 +1296,7 @@ class ProjectManagerClean:
         # Master body parts are project-specific
         return self.config.settings.get('master_body_parts', [])
 
+    @_writes
     def update_tracked_objects(self, items: List[str], list_type: str) -> None:
         """Update tracked objects in the project."""
         if list_type == "active":
@@ -951,6 +1347,7 @@ class ProjectManagerClean:
         """Get active tracked objects for this project."""
         return self.get_tracked_objects("active")
 
+    @_writes
     def add_tracked_object(self, name: str) -> None:
         """Add a tracked object to the project."""
         if not name or not name.strip():
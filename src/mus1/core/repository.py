@@ -4,20 +4,32 @@ Repository layer for clean data access patterns.
 This provides a clean abstraction over the SQLite database for domain operations.
 """
 
-from typing import List, Optional, Dict, Any
+import json
+import logging
+import os
+from contextlib import contextmanager
+from datetime import datetime
+from functools import lru_cache
+from typing import List, Optional, Dict, Any, Iterator
 from pathlib import Path
 from sqlalchemy.orm import Session
-from sqlalchemy import text
-from .metadata import Subject, Experiment, VideoFile, Worker, ScanTarget
+from sqlalchemy import String, select, text, type_coerce
+from .metadata import (
+    Subject, Experiment, VideoFile, Worker, ScanTarget,
+    Sex, SubjectDesignation, ProcessingStage
+)
 from .schema import (
     Database, SubjectModel, ExperimentModel, VideoModel,
     WorkerModel, ScanTargetModel, ProjectModel, ColonyModel,
-    TrackedObjectModel, BodyPartModel, TreatmentModel, GenotypeModel,
+    TrackedObjectModel, BodyPartModel, TreatmentModel, GenotypeModel, BatchModel,
     subject_to_model, model_to_subject,
     experiment_to_model, model_to_experiment,
     colony_to_model, model_to_colony
 )
 
+logger = logging.getLogger(__name__)
+
+
 class BaseRepository:
     """Base repository with common database operations."""
 
@@ -28,6 +40,105 @@ class BaseRepository:
         """Get database session."""
         return self.db.get_session()
 
+    def _store_path(self, path) -> str:
+        """Stored form of a video path: relative to db.video_root when it lies under it."""
+        root = self.db.video_root
+        if root is not None:
+            try:
+                return Path(path).relative_to(root).as_posix()
+            except ValueError:
+                pass
+        return str(path)
+
+    def _load_path(self, stored: str) -> Path:
+        """Absolute path for a stored video path."""
+        path = Path(stored)
+        root = self.db.video_root
+        if root is not None and not path.is_absolute():
+            return root / path
+        return path
+
+# ===========================================
+# READ-OPTIMIZED RECORDS
+# ===========================================
+# List and report screens read thousands of rows they never modify. These
+# records are built straight from Core select() rows (no identity map or ORM
+# instances) and use __slots__ instead of a per-instance __dict__.
+# Attribute names match the Subject/Experiment dataclasses.
+
+class SubjectRecord:
+    """Read-only subject row."""
+
+    __slots__ = ("id", "colony_id", "sex", "designation", "birth_date", "death_date",
+                 "individual_genotype", "individual_treatment", "notes", "date_added")
+
+    def __init__(self, id, colony_id, sex, designation, birth_date, death_date,
+                 individual_genotype, individual_treatment, notes, date_added):
+        self.id = id
+        self.colony_id = colony_id
+        self.sex = sex
+        self.designation = designation
+        self.birth_date = birth_date
+        self.death_date = death_date
+        self.individual_genotype = individual_genotype
+        self.individual_treatment = individual_treatment
+        self.notes = notes
+        self.date_added = date_added
+
+    genotype = Subject.genotype
+    treatment = Subject.treatment
+    age_days = Subject.age_days
+
+    def __repr__(self) -> str:
+        return f"SubjectRecord(id={self.id!r})"
+
+
+class ExperimentRecord:
+    """Read-only experiment row."""
+
+    __slots__ = ("id", "subject_id", "experiment_type", "date_recorded", "processing_stage",
+                 "experiment_subtype", "notes", "date_added")
+
+    def __init__(self, id, subject_id, experiment_type, date_recorded, processing_stage,
+                 experiment_subtype, notes, date_added):
+        self.id = id
+        self.subject_id = subject_id
+        self.experiment_type = experiment_type
+        self.date_recorded = date_recorded
+        self.processing_stage = processing_stage
+        self.experiment_subtype = experiment_subtype
+        self.notes = notes
+        self.date_added = date_added
+
+    is_ready_for_analysis = Experiment.is_ready_for_analysis
+
+    def __repr__(self) -> str:
+        return f"ExperimentRecord(id={self.id!r})"
+
+
+@lru_cache(maxsize=None)
+def _enum_by_name(enum_cls) -> Dict[str, Any]:
+    """Cached {stored name: member} lookup for an Enum column."""
+    return {member.name: member for member in enum_cls}
+
+
+def _parse_datetime(value: Optional[str]) -> Optional[datetime]:
+    # SQLAlchemy stores SQLite DateTime as ISO text ("YYYY-MM-DD HH:MM:SS.ffffff")
+    return datetime.fromisoformat(value) if value else None
+
+
+def _raw(column):
+    """Select a column without SQLAlchemy's per-row result processing."""
+    return type_coerce(column, String).label(column.key)
+
+
+def _order_by(columns: Dict[str, Any], sort_by: str, sort_order: str, default):
+    column = columns.get(sort_by)
+    if column is None:
+        return default
+    return column.asc() if sort_order == "asc" else column.desc()
+
+
 class ColonyRepository(BaseRepository):
     """Repository for colony operations."""
 
@@ -56,6 +167,12 @@ class ColonyRepository(BaseRepository):
             ).all()
             return [model_to_colony(db_colony) for db_colony in db_colonies]
 
+    def count_by_lab(self, lab_id: str) -> int:
+        """Count colonies belonging to a lab."""
+        from sqlalchemy import func
+        with self._get_session() as session:
+            return session.query(func.count(ColonyModel.id)).filter(ColonyModel.lab_id == lab_id).scalar() or 0
+
     def find_all(self) -> List['Colony']:
         """Find all colonies."""
         with self._get_session() as session:
@@ -138,6 +255,32 @@ class SubjectRepository(BaseRepository):
             db_subjects = query.all()
             return [model_to_subject(db_subject) for db_subject in db_subjects]
 
+    def list_records(self, sort_by: str = "date_added", sort_order: str = "desc",
+                     colony_id: Optional[str] = None) -> List[SubjectRecord]:
+        """Fast read path for listing: Core select() into slotted SubjectRecords."""
+        t = SubjectModel.__table__
+        sort_columns = {"id": t.c.id, "name": t.c.id, "date_added": t.c.date_added,
+                        "sex": t.c.sex, "designation": t.c.designation}
+        stmt = select(
+            t.c.id, t.c.colony_id, _raw(t.c.sex), _raw(t.c.designation),
+            _raw(t.c.birth_date), _raw(t.c.death_date), t.c.individual_genotype,
+            t.c.individual_treatment, t.c.notes, _raw(t.c.date_added),
+        ).order_by(_order_by(sort_columns, sort_by, sort_order, t.c.date_added.desc()))
+        if colony_id is not None:
+            stmt = stmt.where(t.c.colony_id == colony_id)
+
+        sexes = _enum_by_name(Sex)
+        designations = _enum_by_name(SubjectDesignation)
+        default_designation = SubjectDesignation.EXPERIMENTAL
+        parse = _parse_datetime
+        with self._get_session() as session:
+            return [
+                SubjectRecord(sid, colony, sexes[sex], designations.get(designation, default_designation),
+                              parse(birth), parse(death), genotype, treatment, notes, parse(added))
+                for sid, colony, sex, designation, birth, death, genotype, treatment, notes, added
+                in session.execute(stmt)
+            ]
+
     def delete(self, subject_id: str) -> bool:
         """Delete subject by ID."""
         with self._get_session() as session:
@@ -207,6 +350,27 @@ class ExperimentRepository(BaseRepository):
             db_experiments = query.all()
             return [model_to_experiment(db_exp) for db_exp in db_experiments]
 
+    def list_records(self, sort_by: str = "date_recorded", sort_order: str = "desc",
+                     subject_id: Optional[str] = None) -> List[ExperimentRecord]:
+        """Fast read path for listing: Core select() into slotted ExperimentRecords."""
+        t = ExperimentModel.__table__
+        sort_columns = {"date_recorded": t.c.date_recorded, "experiment_type": t.c.experiment_type,
+                        "processing_stage": t.c.processing_stage, "date_added": t.c.date_added}
+        stmt = select(
+            t.c.id, t.c.subject_id, t.c.experiment_type, _raw(t.c.date_recorded),
+            _raw(t.c.processing_stage), t.c.experiment_subtype, t.c.notes, _raw(t.c.date_added),
+        ).order_by(_order_by(sort_columns, sort_by, sort_order, t.c.date_recorded.desc()))
+        if subject_id is not None:
+            stmt = stmt.where(t.c.subject_id == subject_id)
+
+        stages = _enum_by_name(ProcessingStage)
+        parse = _parse_datetime
+        with self._get_session() as session:
+            return [
+                ExperimentRecord(eid, sid, exp_type, parse(recorded), stages[stage], subtype, notes, parse(added))
+                for eid, sid, exp_type, recorded, stage, subtype, notes, added in session.execute(stmt)
+            ]
+
     def delete(self, experiment_id: str) -> bool:
         """Delete experiment by ID."""
         with self._get_session() as session:
@@ -241,7 +405,7 @@ class ExperimentRepository(BaseRepository):
         with self._get_session() as session:
             row = session.execute(text("""
                 SELECT id FROM videos WHERE path = :path
-            """), {"path": str(video_path)}).first()
+            """), {"path": self._store_path(video_path)}).first()
             if not row:
                 return False
             video_id = row[0]
@@ -281,7 +445,7 @@ class ExperimentRepository(BaseRepository):
             videos = []
             for row in result:
                 videos.append(VideoFile(
-                    path=Path(row.path),
+                    path=self._load_path(row.path),
                     hash=row.hash,
                     recorded_time=row.recorded_time,
                     size_bytes=row.size_bytes,
@@ -299,9 +463,41 @@ class ExperimentRepository(BaseRepository):
                 JOIN videos v ON v.id = ev.video_id
                 WHERE ev.experiment_id = :exp_id AND v.path = :path
                 LIMIT 1
-            """), {"exp_id": experiment_id, "path": str(video_path)}).first()
+            """), {"exp_id": experiment_id, "path": self._store_path(video_path)}).first()
             return row is not None
 
+    # ---------- Aggregate APIs (one GROUP BY each) ----------
+    def video_counts_by_experiment(self) -> Dict[str, int]:
+        """Return {experiment_id: linked video count} for experiments with videos."""
+        with self._get_session() as session:
+            rows = session.execute(text("""
+                SELECT experiment_id, COUNT(video_id)
+                FROM experiment_videos
+                GROUP BY experiment_id
+            """))
+            return {exp_id: count for exp_id, count in rows}
+
+    def experiment_counts_by_subject(self) -> Dict[str, int]:
+        """Return {subject_id: experiment count} for subjects with experiments."""
+        from sqlalchemy import func
+        with self._get_session() as session:
+            rows = session.query(
+                ExperimentModel.subject_id,
+                func.count(ExperimentModel.id)
+            ).group_by(ExperimentModel.subject_id).all()
+            return {subject_id: count for subject_id, count in rows}
+
+    def video_counts_by_subject(self) -> Dict[str, int]:
+        """Return {subject_id: linked video count summed over the subject's experiments}."""
+        with self._get_session() as session:
+            rows = session.execute(text("""
+                SELECT e.subject_id, COUNT(ev.video_id)
+                FROM experiments e
+                JOIN experiment_videos ev ON ev.experiment_id = e.id
+                GROUP BY e.subject_id
+            """))
+            return {subject_id: count for subject_id, count in rows}
+
 
 class VideoRepository(BaseRepository):
     """Repository for video file operations."""
@@ -310,7 +506,8 @@ class VideoRepository(BaseRepository):
         """Save a video file record."""
         with self._get_session() as session:
             # Check if video already exists by path
-            existing = session.query(VideoModel).filter(VideoModel.path == str(video.path)).first()
+            stored_path = self._store_path(video.path)
+            existing = session.query(VideoModel).filter(VideoModel.path == stored_path).first()
 
             if existing:
                 # Update existing record
@@ -322,7 +519,7 @@ class VideoRepository(BaseRepository):
                 session.commit()
                 # Return updated video
                 return VideoFile(
-                    path=Path(existing.path),
+                    path=self._load_path(existing.path),
                     hash=existing.hash,
                     recorded_time=existing.recorded_time,
                     size_bytes=existing.size_bytes,
@@ -332,7 +529,7 @@ class VideoRepository(BaseRepository):
             else:
                 # Create new record
                 db_video = VideoModel(
-                    path=str(video.path),
+                    path=stored_path,
                     hash=video.hash,
                     recorded_time=video.recorded_time,
                     size_bytes=video.size_bytes,
@@ -343,7 +540,7 @@ class VideoRepository(BaseRepository):
                 session.commit()
                 # Convert back to domain object
                 return VideoFile(
-                    path=Path(db_video.path),
+                    path=self._load_path(db_video.path),
                     hash=db_video.hash,
                     recorded_time=db_video.recorded_time,
                     size_bytes=db_video.size_bytes,
@@ -359,7 +556,7 @@ class VideoRepository(BaseRepository):
             ).first()
             if db_video:
                 return VideoFile(
-                    path=Path(db_video.path),
+                    path=self._load_path(db_video.path),
                     hash=db_video.hash,
                     recorded_time=db_video.recorded_time,
                     size_bytes=db_video.size_bytes,
@@ -372,11 +569,11 @@ class VideoRepository(BaseRepository):
         """Find video by path."""
         with self._get_session() as session:
             db_video = session.query(VideoModel).filter(
-                VideoModel.path == str(path)
+                VideoModel.path == self._store_path(path)
             ).first()
             if db_video:
                 return VideoFile(
-                    path=Path(db_video.path),
+                    path=self._load_path(db_video.path),
                     hash=db_video.hash,
                     recorded_time=db_video.recorded_time,
                     size_bytes=db_video.size_bytes,
@@ -385,31 +582,301 @@ class VideoRepository(BaseRepository):
                 )
         return None
 
+    def count(self) -> int:
+        """Count video records."""
+        from sqlalchemy import func
+        with self._get_session() as session:
+            return session.query(func.count(VideoModel.id)).scalar() or 0
+
+    # ---------- Bulk linking (set-based, one statement per step) ----------
+    def known_files(self, paths: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Return {path: {hash, size_bytes, last_modified}} for registered paths (one join)."""
+        stored = {self._store_path(p): p for p in paths}
+        with self._get_session() as session:
+            session.execute(text("CREATE TEMP TABLE IF NOT EXISTS path_input (path TEXT PRIMARY KEY)"))
+            session.execute(text("DELETE FROM path_input"))
+            if stored:
+                session.execute(text("INSERT OR IGNORE INTO path_input(path) VALUES (:path)"),
+                                [{"path": p} for p in stored])
+            rows = session.execute(text("""
+                SELECT v.path, v.hash, v.size_bytes, v.last_modified
+                FROM path_input i JOIN videos v ON v.path = i.path
+            """)).fetchall()
+            session.execute(text("DELETE FROM path_input"))
+            session.commit()
+        return {stored[row.path]: {"hash": row.hash, "size_bytes": row.size_bytes, "last_modified": row.last_modified}
+                for row in rows}
+
+    def unlinked(self) -> List[Dict[str, Any]]:
+        """Registered videos not linked to any experiment (one anti-join)."""
+        with self._get_session() as session:
+            rows = session.execute(text("""
+                SELECT v.id, v.path, v.hash, v.recorded_time, v.size_bytes, v.last_modified
+                FROM videos v
+                WHERE NOT EXISTS (SELECT 1 FROM experiment_videos ev WHERE ev.video_id = v.id)
+                ORDER BY v.id
+            """)).fetchall()
+        return [
+            {"video_id": row.id, "path": str(self._load_path(row.path)), "hash": row.hash,
+             "recorded_time": _parse_datetime(row.recorded_time),
+             "size_bytes": row.size_bytes, "last_modified": row.last_modified}
+            for row in rows
+        ]
+
+    def link_to_experiments(self, rows: List[Dict[str, Any]]) -> Dict[int, Dict[str, Any]]:
+        """Register videos and link them to experiments in one pass.
+
+        rows: {seq, experiment_id, path, hash, size_bytes, last_modified},
+        optionally with video_id to link that exact registered record.
+        Otherwise follows link_video_to_experiment: a video already known by
+        hash is reused, a known path with a stale hash is updated, anything
+        else is inserted. Returns {seq: {status, video_id}} with status one of
+        linked, already_linked, unknown_experiment or unknown_video.
+        """
+        with self._get_session() as session:
+            session.execute(text("""
+                CREATE TEMP TABLE IF NOT EXISTS link_input (
+                    seq INTEGER PRIMARY KEY, experiment_id TEXT NOT NULL, path TEXT NOT NULL,
+                    hash TEXT NOT NULL, size_bytes INTEGER, last_modified REAL,
+                    video_id INTEGER, status TEXT)
+            """))
+            session.execute(text("CREATE INDEX IF NOT EXISTS temp.ix_link_input_hash ON link_input(hash)"))
+            session.execute(text("DELETE FROM link_input"))
+            if rows:
+                session.execute(text("""
+                    INSERT INTO link_input(seq, experiment_id, path, hash, size_bytes, last_modified, video_id)
+                    VALUES (:seq, :experiment_id, :path, :hash, :size_bytes, :last_modified, :video_id)
+                """), [dict(row, path=self._store_path(row["path"]), video_id=row.get("video_id")) for row in rows])
+            now = {"now": datetime.now()}
+            for sql in (
+                """UPDATE link_input SET status = 'unknown_experiment'
+                   WHERE experiment_id NOT IN (SELECT id FROM experiments)""",
+                """UPDATE link_input SET status = 'unknown_video'
+                   WHERE status IS NULL AND video_id IS NOT NULL AND video_id NOT IN (SELECT id FROM videos)""",
+                # Known path, unknown hash: refresh the stale record
+                """UPDATE videos SET
+                       hash = (SELECT i.hash FROM link_input i WHERE i.path = videos.path AND i.status IS NULL),
+                       size_bytes = (SELECT i.size_bytes FROM link_input i WHERE i.path = videos.path AND i.status IS NULL),
+                       last_modified = (SELECT i.last_modified FROM link_input i WHERE i.path = videos.path AND i.status IS NULL),
+                       date_added = :now
+                   WHERE path IN (
+                       SELECT i.path FROM link_input i
+                       WHERE i.status IS NULL AND i.video_id IS NULL AND NOT EXISTS (SELECT 1 FROM videos v WHERE v.hash = i.hash))""",
+                # Unknown hash and path: one new record per distinct hash
+                """INSERT INTO videos (path, hash, size_bytes, last_modified, date_added)
+                   SELECT i.path, i.hash, i.size_bytes, i.last_modified, :now FROM link_input i
+                   WHERE i.status IS NULL AND i.video_id IS NULL
+                     AND i.seq = (SELECT MIN(j.seq) FROM link_input j
+                                  WHERE j.hash = i.hash AND j.status IS NULL AND j.video_id IS NULL)
+                     AND NOT EXISTS (SELECT 1 FROM videos v WHERE v.hash = i.hash)
+                     AND NOT EXISTS (SELECT 1 FROM videos v WHERE v.path = i.path)""",
+                """UPDATE link_input SET video_id = (SELECT MIN(v.id) FROM videos v WHERE v.hash = link_input.hash)
+                   WHERE status IS NULL AND video_id IS NULL""",
+                """UPDATE link_input SET status = 'already_linked'
+                   WHERE status IS NULL AND (
+                       EXISTS (SELECT 1 FROM experiment_videos ev
+                               WHERE ev.experiment_id = link_input.experiment_id AND ev.video_id = link_input.video_id)
+                       OR seq > (SELECT MIN(j.seq) FROM link_input j
+                                 WHERE j.experiment_id = link_input.experiment_id AND j.video_id = link_input.video_id))""",
+                """INSERT INTO experiment_videos (experiment_id, video_id)
+                   SELECT experiment_id, video_id FROM link_input WHERE status IS NULL""",
+                "UPDATE link_input SET status = 'linked' WHERE status IS NULL",
+            ):
+                session.execute(text(sql), now if ":now" in sql else {})
+            results = {
+                row.seq: {"status": row.status, "video_id": row.video_id}
+                for row in session.execute(text("SELECT seq, status, video_id FROM link_input"))
+            }
+            session.execute(text("DELETE FROM link_input"))
+            session.commit()
+        return results
+
+    # ---------- Path relocation (one UPDATE per operation) ----------
+    @staticmethod
+    def _dir_prefix(prefix) -> str:
+        text = str(Path(prefix))
+        return text if text.endswith(os.sep) else text + os.sep
+
+    def count_with_prefix(self, prefix) -> int:
+        """Number of videos stored under the directory prefix."""
+        old = self._dir_prefix(prefix)
+        with self._get_session() as session:
+            return session.execute(text("SELECT COUNT(*) FROM videos WHERE substr(path, 1, :n) = :old"),
+                                   {"old": old, "n": len(old)}).scalar() or 0
+
+    def sample_with_prefix(self, prefix, limit: int) -> List[Dict[str, Any]]:
+        """Random sample of {path, hash, size_bytes} for videos under the prefix."""
+        old = self._dir_prefix(prefix)
+        with self._get_session() as session:
+            rows = session.execute(text("""
+                SELECT path, hash, size_bytes FROM videos
+                WHERE substr(path, 1, :n) = :old ORDER BY random() LIMIT :limit
+            """), {"old": old, "n": len(old), "limit": limit}).fetchall()
+        return [{"path": row.path, "hash": row.hash, "size_bytes": row.size_bytes} for row in rows]
+
+    def prefix_conflicts(self, old_prefix, new_prefix) -> int:
+        """Videos whose rebased path is already taken by another record."""
+        old, new = self._dir_prefix(old_prefix), self._dir_prefix(new_prefix)
+        with self._get_session() as session:
+            return session.execute(text("""
+                SELECT COUNT(*) FROM videos v
+                JOIN videos w ON w.path = :new || substr(v.path, :n + 1)
+                WHERE substr(v.path, 1, :n) = :old
+            """), {"old": old, "new": new, "n": len(old)}).scalar() or 0
+
+    def rebase_prefix(self, old_prefix, new_prefix) -> int:
+        """Replace the directory prefix of every matching path. Returns rows updated."""
+        old, new = self._dir_prefix(old_prefix), self._dir_prefix(new_prefix)
+        with self._get_session() as session:
+            result = session.execute(text("""
+                UPDATE videos SET path = :new || substr(path, :n + 1)
+                WHERE substr(path, 1, :n) = :old
+            """), {"old": old, "new": new, "n": len(old)})
+            session.commit()
+            return result.rowcount
+
+    def make_relative(self, root) -> int:
+        """Store paths under root relative to it ("/"-separated). Returns rows updated."""
+        old = self._dir_prefix(root)
+        with self._get_session() as session:
+            result = session.execute(text("""
+                UPDATE videos SET path = replace(substr(path, :n + 1), :sep, '/')
+                WHERE substr(path, 1, :n) = :old
+            """), {"old": old, "n": len(old), "sep": os.sep})
+            session.commit()
+            return result.rowcount
+
+    def make_absolute(self, root) -> int:
+        """Turn relative stored paths back into absolute paths under root. Returns rows updated."""
+        with self._get_session() as session:
+            result = session.execute(text("""
+                UPDATE videos SET path = :root || replace(path, '/', :sep)
+                WHERE substr(path, 1, 1) NOT IN ('/', '\\') AND substr(path, 2, 1) != ':'
+            """), {"root": self._dir_prefix(root), "sep": os.sep})
+            session.commit()
+            return result.rowcount
+
+    # ---------- Duplicate analysis (single windowed query) ----------
+    # Every row of a duplicate group in one pass, ranked so the oldest record
+    # is the copy to keep. Groups whose sizes differ share a sample hash but
+    # are probably different files (sample-hash collision).
+    _DUPLICATE_COPIES_SQL = """
+        SELECT path, hash, size_bytes, last_modified, copies, copy_rank, min_size, max_size
+        FROM (
+            SELECT
+                path, hash, size_bytes, last_modified,
+                COUNT(*) OVER w AS copies,
+                ROW_NUMBER() OVER (PARTITION BY hash ORDER BY date_added, id) AS copy_rank,
+                MIN(size_bytes) OVER w AS min_size,
+                MAX(size_bytes) OVER w AS max_size
+            FROM videos
+            WHERE hash IS NOT NULL AND hash != ''
+            WINDOW w AS (PARTITION BY hash)
+        )
+        WHERE copies > 1
+        ORDER BY hash, copy_rank
+    """
+
+    def iter_duplicate_copies(self, batch_size: int = 1000) -> Iterator[Dict[str, Any]]:
+        """Stream every video that shares its hash with another, ordered by hash then rank."""
+        with self._get_session() as session:
+            result = session.execute(
+                text(self._DUPLICATE_COPIES_SQL),
+                execution_options={"yield_per": batch_size},
+            )
+            for row in result:
+                yield {
+                    'path': str(self._load_path(row.path)),
+                    'hash': row.hash,
+                    'size': row.size_bytes,
+                    'modified': row.last_modified,
+                    'copies': row.copies,
+                    'copy_rank': row.copy_rank,
+                    'size_mismatch': row.min_size != row.max_size,
+                }
+
+    def iter_duplicate_groups(self, batch_size: int = 1000) -> Iterator[Dict[str, Any]]:
+        """Stream duplicate groups with wasted bytes (all copies except the oldest)."""
+        group: Optional[Dict[str, Any]] = None
+        for copy in self.iter_duplicate_copies(batch_size):
+            if group is None or copy['hash'] != group['hash']:
+                if group is not None:
+                    yield group
+                group = {
+                    'hash': copy['hash'],
+                    'count': copy['copies'],
+                    'keep': copy['path'],
+                    'wasted_bytes': 0,
+                    'size_mismatch': copy['size_mismatch'],
+                    'videos': [],
+                }
+            group['videos'].append({
+                'path': copy['path'],
+                'size': copy['size'],
+                'modified': copy['modified'],
+            })
+            if copy['copy_rank'] > 1:
+                group['wasted_bytes'] += copy['size'] or 0
+        if group is not None:
+            yield group
+
     def find_duplicates(self) -> List[Dict[str, Any]]:
         """Find videos with duplicate hashes."""
-        with self._get_session() as session:
-            # Group by hash and find groups with multiple entries
-            from sqlalchemy import func
-            duplicates = session.query(
-                VideoModel.hash,
-                func.count(VideoModel.id).label('count')
-            ).group_by(VideoModel.hash).having(func.count(VideoModel.id) > 1).all()
-
-            result = []
-            for hash_val, count in duplicates:
-                videos = session.query(VideoModel).filter(
-                    VideoModel.hash == hash_val
-                ).all()
-                result.append({
-                    'hash': hash_val,
-                    'count': count,
-                    'videos': [{
-                        'path': v.path,
-                        'size': v.size_bytes,
-                        'modified': v.last_modified
-                    } for v in videos]
-                })
-            return result
+        return list(self.iter_duplicate_groups())
+
+    def storage_reclaim_report(self, roots: Optional[List[Path]] = None, top: int = 20) -> Dict[str, Any]:
+        """Summarize reclaimable space from duplicate videos.
+
+        Redundant copies (all but the oldest record per hash) are attributed to
+        the longest matching root, or "(other)". Groups whose sizes differ are
+        reported as suspect and excluded from the reclaimable totals.
+        """
+        import heapq
+
+        root_prefixes = sorted({str(Path(r)) for r in (roots or [])}, key=len, reverse=True)
+
+        def _root_for(path: str) -> str:
+            for prefix in root_prefixes:
+                if path == prefix or path.startswith(prefix.rstrip(os.sep) + os.sep):
+                    return prefix
+            return "(other)"
+
+        report: Dict[str, Any] = {
+            'groups': 0,
+            'redundant_copies': 0,
+            'reclaimable_bytes': 0,
+            'suspect_groups': 0,
+            'suspect_bytes': 0,
+            'by_root': {},
+            'top_groups': [],
+            'suspect': [],
+        }
+        by_root: Dict[str, int] = report['by_root']
+        top_groups: List[Any] = []
+
+        for group in self.iter_duplicate_groups():
+            if group['size_mismatch']:
+                report['suspect_groups'] += 1
+                report['suspect_bytes'] += group['wasted_bytes']
+                if len(report['suspect']) < top:
+                    report['suspect'].append(group)
+                continue
+
+            report['groups'] += 1
+            report['redundant_copies'] += group['count'] - 1
+            report['reclaimable_bytes'] += group['wasted_bytes']
+            for video in group['videos'][1:]:
+                root = _root_for(video['path'])
+                by_root[root] = by_root.get(root, 0) + (video['size'] or 0)
+
+            entry = (group['wasted_bytes'], group['hash'], group)
+            if len(top_groups) < top:
+                heapq.heappush(top_groups, entry)
+            elif entry[:2] > top_groups[0][:2]:
+                heapq.heapreplace(top_groups, entry)
+
+        report['top_groups'] = [g for _, _, g in sorted(top_groups, key=lambda e: e[:2], reverse=True)]
+        return report
 
 class WorkerRepository(BaseRepository):
     """Repository for worker operations."""
@@ -811,6 +1278,303 @@ class GenotypeRepository(MetadataRepository):
         super().__init__(db, GenotypeModel)
 
 
+# ===========================================
+# BATCHES
+# ===========================================
+
+class BatchRepository(BaseRepository):
+    """Experiment batches stored in the batches/batch_experiments tables.
+
+    Membership is validated and written set-wise: requested IDs go into a
+    temp table once, then one join finds unknown experiments and one
+    INSERT ... SELECT stores the membership.
+    """
+
+    def create(self, batch_id: str, experiment_ids: List[str], name: Optional[str] = None,
+               description: Optional[str] = None, selection_criteria: Optional[Dict[str, Any]] = None,
+               status: str = "created", created_at: Optional[datetime] = None,
+               skip_missing: bool = False) -> Dict[str, Any]:
+        """Create a batch. Raises ValueError if it exists or (unless skip_missing) an experiment is unknown."""
+        ordered = list(dict.fromkeys(experiment_ids))
+        with self._get_session() as session:
+            if session.execute(text("SELECT 1 FROM batches WHERE id = :id"), {"id": batch_id}).first():
+                raise ValueError(f"Batch '{batch_id}' already exists")
+
+            session.execute(text(
+                "CREATE TEMP TABLE IF NOT EXISTS batch_input (position INTEGER PRIMARY KEY, experiment_id TEXT NOT NULL)"
+            ))
+            session.execute(text("DELETE FROM batch_input"))
+            try:
+                if ordered:
+                    session.execute(
+                        text("INSERT INTO batch_input(position, experiment_id) VALUES (:position, :experiment_id)"),
+                        [{"position": i, "experiment_id": exp_id} for i, exp_id in enumerate(ordered)],
+                    )
+                missing = [row[0] for row in session.execute(text("""
+                    SELECT i.experiment_id FROM batch_input i
+                    LEFT JOIN experiments e ON e.id = i.experiment_id
+                    WHERE e.id IS NULL ORDER BY i.position
+                """))]
+                if missing and not skip_missing:
+                    shown = ", ".join(missing[:5]) + (f" (+{len(missing) - 5} more)" if len(missing) > 5 else "")
+                    raise ValueError(f"Experiment(s) do not exist: {shown}")
+
+                session.execute(BatchModel.__table__.insert().values(
+                    id=batch_id, name=name, description=description or "",
+                    selection_criteria=json.dumps(selection_criteria or {}), status=status,
+                    created_at=created_at or datetime.now(),
+                ))
+                session.execute(text("""
+                    INSERT INTO batch_experiments(batch_id, experiment_id, position)
+                    SELECT :id, i.experiment_id, i.position FROM batch_input i
+                    JOIN experiments e ON e.id = i.experiment_id
+                """), {"id": batch_id})
+                session.execute(text("DELETE FROM batch_input"))
+                session.commit()
+            except Exception:
+                session.rollback()
+                raise
+        if missing:
+            logger.warning(f"Batch '{batch_id}': skipped {len(missing)} unknown experiment(s)")
+        return self.get(batch_id, include_members=False)
+
+    _HEADER_SQL = """
+        SELECT b.id, b.name, b.description, b.selection_criteria, b.status, b.created_at,
+               (SELECT COUNT(*) FROM batch_experiments be WHERE be.batch_id = b.id) AS experiment_count
+        FROM batches b
+    """
+
+    @staticmethod
+    def _header(row) -> Dict[str, Any]:
+        return {
+            "id": row.id,
+            "name": row.name,
+            "description": row.description,
+            "selection_criteria": json.loads(row.selection_criteria) if row.selection_criteria else {},
+            "status": row.status,
+            "created_at": _parse_datetime(row.created_at),
+            "experiment_count": row.experiment_count,
+        }
+
+    def get(self, batch_id: str, include_members: bool = True) -> Optional[Dict[str, Any]]:
+        """Return a batch header; include_members adds the ordered experiment_ids."""
+        with self._get_session() as session:
+            row = session.execute(text(self._HEADER_SQL + " WHERE b.id = :id"), {"id": batch_id}).first()
+            if row is None:
+                return None
+            batch = self._header(row)
+        if include_members:
+            batch["experiment_ids"] = self.members(batch_id, limit=None)
+        return batch
+
+    def list(self, status: Optional[str] = None, name_contains: Optional[str] = None,
+             experiment_id: Optional[str] = None, limit: Optional[int] = None, offset: int = 0) -> List[Dict[str, Any]]:
+        """List batch headers, newest first, optionally filtered by status, name or member experiment."""
+        clauses, params = [], {}
+        if status:
+            clauses.append("b.status = :status")
+            params["status"] = status
+        if name_contains:
+            clauses.append("(b.name LIKE :name OR b.id LIKE :name)")
+            params["name"] = f"%{name_contains}%"
+        if experiment_id:
+            clauses.append("EXISTS (SELECT 1 FROM batch_experiments be "
+                           "WHERE be.batch_id = b.id AND be.experiment_id = :experiment_id)")
+            params["experiment_id"] = experiment_id
+        sql = self._HEADER_SQL
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY b.created_at DESC, b.id"
+        if limit is not None:
+            sql += " LIMIT :limit OFFSET :offset"
+            params.update(limit=limit, offset=offset)
+        with self._get_session() as session:
+            return [self._header(row) for row in session.execute(text(sql), params)]
+
+    def members(self, batch_id: str, offset: int = 0, limit: Optional[int] = 100) -> List[str]:
+        """Page through a batch's experiment IDs in insertion order."""
+        sql = "SELECT experiment_id FROM batch_experiments WHERE batch_id = :id ORDER BY position"
+        params: Dict[str, Any] = {"id": batch_id}
+        if limit is not None:
+            sql += " LIMIT :limit OFFSET :offset"
+            params.update(limit=limit, offset=offset)
+        with self._get_session() as session:
+            return [row[0] for row in session.execute(text(sql), params)]
+
+    def diff(self, batch_a: str, batch_b: str) -> Dict[str, Any]:
+        """Compare membership: experiments only in a, only in b, and the shared count."""
+        params = {"a": batch_a, "b": batch_b}
+        with self._get_session() as session:
+            only_a = [row[0] for row in session.execute(text("""
+                SELECT experiment_id FROM batch_experiments WHERE batch_id = :a
+                EXCEPT SELECT experiment_id FROM batch_experiments WHERE batch_id = :b
+                ORDER BY 1
+            """), params)]
+            only_b = [row[0] for row in session.execute(text("""
+                SELECT experiment_id FROM batch_experiments WHERE batch_id = :b
+                EXCEPT SELECT experiment_id FROM batch_experiments WHERE batch_id = :a
+                ORDER BY 1
+            """), params)]
+            common = session.execute(text("""
+                SELECT COUNT(*) FROM batch_experiments a
+                JOIN batch_experiments b ON b.experiment_id = a.experiment_id AND b.batch_id = :b
+                WHERE a.batch_id = :a
+            """), params).scalar()
+        return {"only_a": only_a, "only_b": only_b, "common": common}
+
+    def set_status(self, batch_id: str, status: str) -> bool:
+        with self._get_session() as session:
+            result = session.execute(text("UPDATE batches SET status = :status WHERE id = :id"),
+                                     {"status": status, "id": batch_id})
+            session.commit()
+            return result.rowcount > 0
+
+    def delete(self, batch_id: str) -> bool:
+        """Delete a batch and its membership rows."""
+        with self._get_session() as session:
+            session.execute(text("DELETE FROM batch_experiments WHERE batch_id = :id"), {"id": batch_id})
+            result = session.execute(text("DELETE FROM batches WHERE id = :id"), {"id": batch_id})
+            session.commit()
+            return result.rowcount > 0
+
+
+# ===========================================
+# PROJECT STATISTICS
+# ===========================================
+
+# Totals always present in StatsRepository.get(), even for an empty project
+_STAT_TOTALS = ("colonies", "subjects", "experiments", "videos", "video_bytes", "workers", "scan_targets")
+
+
+class StatsRepository(BaseRepository):
+    """Project counters from the trigger-maintained project_stats table."""
+
+    def get(self) -> Dict[str, Any]:
+        """Return totals plus experiments_by_stage/_by_type and subjects_by_genotype breakdowns."""
+        stats: Dict[str, Any] = {name: 0 for name in _STAT_TOTALS}
+        stats.update({"experiments_by_stage": {}, "experiments_by_type": {}, "subjects_by_genotype": {}})
+        stages = _enum_by_name(ProcessingStage)
+        with self._get_session() as session:
+            rows = session.execute(text("SELECT metric, key, value FROM project_stats WHERE value != 0"))
+            for metric, key, value in rows:
+                if metric in _STAT_TOTALS:
+                    stats[metric] = value
+                elif metric == "experiments_by_stage":
+                    stage = stages.get(key)
+                    stats[metric][stage.value if stage else key] = value
+                elif metric in stats:
+                    stats[metric][key or None] = value
+        return stats
+
+    def rebuild(self) -> None:
+        """Recount every statistic from the base tables."""
+        from .schema import rebuild_project_stats
+        with self._get_session() as session:
+            rebuild_project_stats(session.connection())
+            session.commit()
+
+
+# ===========================================
+# FULL-TEXT SEARCH
+# ===========================================
+
+# Field names accepted in "field:value" query terms, per FTS table column.
+_SEARCH_FIELDS = {
+    "subject": {
+        "id": "id", "subject": "id", "genotype": "individual_genotype",
+        "treatment": "individual_treatment", "notes": "notes",
+    },
+    "experiment": {
+        "id": "id", "subject": "subject_id", "type": "experiment_type",
+        "subtype": "experiment_subtype", "notes": "notes",
+    },
+}
+_ALL_SEARCH_FIELDS = set().union(*(f.keys() for f in _SEARCH_FIELDS.values()))
+
+
+def _build_fts_query(query: str, kind: str) -> Optional[str]:
+    """Translate a user query into an FTS5 MATCH expression for one entity kind.
+
+    Terms are ANDed and prefix-matched; "field:value" scopes a term to one
+    column. Returns None when a field does not exist for this kind.
+    """
+    fields = _SEARCH_FIELDS[kind]
+    parts = []
+    for token in query.split():
+        field, sep, value = token.partition(":")
+        column = None
+        if sep and field.lower() in _ALL_SEARCH_FIELDS:
+            column = fields.get(field.lower())
+            if column is None:
+                return None
+            token = value
+        token = token.rstrip("*").replace('"', '""')
+        if not token:
+            continue
+        term = f'"{token}"*'
+        parts.append(f"{column} : {term}" if column else term)
+    return " AND ".join(parts) if parts else None
+
+
+class SearchRepository(BaseRepository):
+    """Full-text search over subjects and experiments (FTS5, BM25-ranked)."""
+
+    # bm25 column weights: ids rank above attribute matches, notes lowest
+    _SEARCH_SQL = {
+        "subject": """
+            SELECT 'subject' AS kind, s.id AS id, s.id AS subject_id,
+                   snippet(subjects_fts, -1, '[', ']', '...', 8) AS snippet,
+                   bm25(subjects_fts, 10.0, 3.0, 3.0, 1.0) AS score
+            FROM subjects_fts JOIN subjects s ON s.rowid = subjects_fts.rowid
+            WHERE subjects_fts MATCH :subject_q
+        """,
+        "experiment": """
+            SELECT 'experiment' AS kind, e.id AS id, e.subject_id AS subject_id,
+                   snippet(experiments_fts, -1, '[', ']', '...', 8) AS snippet,
+                   bm25(experiments_fts, 10.0, 5.0, 3.0, 3.0, 1.0) AS score
+            FROM experiments_fts JOIN experiments e ON e.rowid = experiments_fts.rowid
+            WHERE experiments_fts MATCH :experiment_q
+        """,
+    }
+
+    def search(self, query: str, kinds: Optional[List[str]] = None,
+               limit: Optional[int] = 50) -> List[Dict[str, Any]]:
+        """Search subjects/experiments; best matches first.
+
+        Supports prefix matching ("gen" matches "genotype") and field-scoped
+        terms such as "genotype:ko", "type:openfield" or "notes:lesion".
+        With limit=None every match is returned.
+        """
+        params: Dict[str, Any] = {"limit": -1 if limit is None else limit}  # SQLite: LIMIT -1 means no limit
+        selects = []
+        for kind in (kinds or list(self._SEARCH_SQL)):
+            fts_query = _build_fts_query(query or "", kind)
+            if fts_query is None:
+                continue
+            params[f"{kind}_q"] = fts_query
+            selects.append(self._SEARCH_SQL[kind])
+        if not selects:
+            return []
+
+        sql = " UNION ALL ".join(selects) + " ORDER BY score LIMIT :limit"
+        with self._get_session() as session:
+            rows = session.execute(text(sql), params)
+            return [{
+                'kind': row.kind,
+                'id': row.id,
+                'subject_id': row.subject_id,
+                'snippet': row.snippet,
+                'score': row.score,
+            } for row in rows]
+
+    def rebuild(self) -> None:
+        """Rebuild the search index from the content tables."""
+        from .schema import SEARCH_INDEX_TABLES
+        with self._get_session() as session:
+            for fts_table in SEARCH_INDEX_TABLES:
+                session.execute(text(f"INSERT INTO {fts_table}({fts_table}) VALUES ('rebuild')"))
+            session.commit()
+
 # ===========================================
 # REPOSITORY FACTORY
 # ===========================================
@@ -833,6 +1597,9 @@ class RepositoryFactory:
         self._body_parts: Optional[BodyPartRepository] = None
         self._treatments: Optional[TreatmentRepository] = None
         self._genotypes: Optional[GenotypeRepository] = None
+        self._search: Optional[SearchRepository] = None
+        self._stats: Optional[StatsRepository] = None
+        self._batches: Optional[BatchRepository] = None
 
     @property
     def users(self) -> UserRepository:
@@ -903,6 +1670,133 @@ class RepositoryFactory:
             self._genotypes = GenotypeRepository(self.db)
         return self._genotypes
 
+    @property
+    def batches(self) -> BatchRepository:
+        if self._batches is None:
+            self._batches = BatchRepository(self.db)
+        return self._batches
+
+    @property
+    def stats(self) -> StatsRepository:
+        if self._stats is None:
+            self._stats = StatsRepository(self.db)
+        return self._stats
+
+    @property
+    def search(self) -> SearchRepository:
+        if self._search is None:
+            self._search = SearchRepository(self.db)
+        return self._search
+
+    @contextmanager
+    def transaction(self) -> Iterator["UnitOfWork"]:
+        """Open a unit of work whose repositories share one session and commit once.
+
+        Usage:
+            with repos.transaction() as uow:
+                uow.videos.save(video)
+                uow.experiments.add_video_to_experiment_by_path(exp_id, video.path)
+
+        Any exception rolls back everything done inside the block. Use
+        ``uow.savepoint()`` to isolate per-row failures in bulk operations.
+        """
+        session = self.db.get_session()
+        try:
+            # pysqlite defers BEGIN until the first DML statement, which would
+            # make the first SAVEPOINT the outermost transaction; open it up front.
+            session.connection().exec_driver_sql("BEGIN")
+            uow = UnitOfWork(self.db, session)
+            yield uow
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+# ===========================================
+# UNIT OF WORK
+# ===========================================
+
+class _SharedSession:
+    """Session proxy handed to repositories inside a unit of work.
+
+    Repository methods use ``with self._get_session() as session`` and call
+    ``session.commit()``/``session.rollback()``; here entering/closing and
+    rollback are no-ops and commit only flushes, so the owning unit of work
+    decides when to commit or roll back.
+    """
+
+    def __init__(self, session: Session):
+        self._session = session
+
+    def __enter__(self) -> "_SharedSession":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        return False
+
+    def commit(self) -> None:
+        self._session.flush()
+
+    def rollback(self) -> None:
+        # Rolling back here would discard the enclosing unit of work; the
+        # exception being handled propagates and the owner rolls back.
+        pass
+
+    def close(self) -> None:
+        pass
+
+    def __getattr__(self, name: str):
+        return getattr(self._session, name)
+
+
+class _UnitOfWorkDatabase:
+    """Database stand-in whose get_session() returns the shared session."""
+
+    def __init__(self, db: Database, session: Session):
+        self._db = db
+        self._shared = _SharedSession(session)
+
+    def get_session(self) -> _SharedSession:
+        return self._shared
+
+    def __getattr__(self, name: str):
+        return getattr(self._db, name)
+
+
+class UnitOfWork(RepositoryFactory):
+    """Repository factory bound to a single open session (see RepositoryFactory.transaction)."""
+
+    def __init__(self, db: Database, session: Session):
+        super().__init__(_UnitOfWorkDatabase(db, session))
+        self.session = session
+
+    @contextmanager
+    def savepoint(self) -> Iterator["UnitOfWork"]:
+        """Run a block inside a SAVEPOINT; on error only that block is rolled back.
+
+        The exception is re-raised so callers can record per-row failures:
+            for row in rows:
+                try:
+                    with uow.savepoint():
+                        ...
+                except Exception as e:
+                    errors.append((row, str(e)))
+        """
+        nested = self.session.begin_nested()
+        try:
+            yield self
+        except Exception:
+            nested.rollback()
+            raise
+        else:
+            nested.commit()
+
+    def transaction(self):
+        """Nested transaction() calls become savepoints of the outer unit of work."""
+        return self.savepoint()
+
 # Convenience function expected by callers
 def get_repository_factory(db: Database) -> "RepositoryFactory":
     """Return a repository factory bound to the provided database.
@@ -0,0 +1,162 @@
+"""
+Content-addressed memoization of plugin analysis results.
+
+A result is keyed by the SHA-256 of canonical JSON describing everything it
+depends on:
+
+- plugin name and version, and the capability
+- the experiment record (id, subject, type, subtype, recording date,
+  processing stage); the id is included because results are stored per
+  experiment, so experiments with identical metadata never share an entry
+- the hashes of the experiment's linked videos (content, not paths)
+- the latest successful result of every other plugin capability on the
+  experiment (tracking data and other upstream outputs), by result id
+- analysis-relevant project settings (RELEVANT_SETTINGS)
+- whatever the plugin declares in BasePlugin.cache_inputs (parameters,
+  tracking file hashes, ...). Caching is opt-in: plugins that do not
+  override cache_inputs are never memoized.
+
+plugin_result_cache maps keys to plugin_results rows. An entry is only kept
+for the latest result of its (experiment, plugin, capability), so a hit means
+"the stored result was computed from exactly these inputs" and can be served
+without running the plugin. Deleting result rows removes their entries;
+invalidate() drops entries explicitly (results are kept).
+"""
+
+import hashlib
+import json
+import logging
+from datetime import date, datetime
+from enum import Enum
+from pathlib import PurePath
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy import text
+
+from .metadata import Experiment, ProjectConfig
+from .schema import Database
+
+logger = logging.getLogger(__name__)
+
+# Project settings that change what analyses compute
+RELEVANT_SETTINGS = ("master_body_parts", "master_tracked_objects")
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, PurePath):
+        return value.as_posix()
+    if isinstance(value, (set, frozenset)):
+        return sorted(value, key=repr)
+    if hasattr(value, "tolist"):  # numpy arrays and scalars
+        return value.tolist()
+    raise TypeError(f"Cannot hash value of type {type(value).__name__}")
+
+
+def canonical_json(value: Any) -> str:
+    """Deterministic JSON: sorted keys, no whitespace."""
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), default=_json_default)
+
+
+def result_cache_key(plugin_name: str, plugin_version: str, capability: str, experiment: Experiment,
+                     video_hashes: Iterable[str], project_config: Optional[ProjectConfig],
+                     plugin_inputs: Dict[str, Any],
+                     upstream_results: Optional[Dict[str, int]] = None) -> str:
+    """Hash of everything an analysis result depends on."""
+    settings = project_config.settings if project_config else {}
+    payload = {
+        "plugin": plugin_name,
+        "version": plugin_version,
+        "capability": capability,
+        "experiment": {
+            "id": experiment.id,
+            "subject_id": experiment.subject_id,
+            "experiment_type": experiment.experiment_type,
+            "experiment_subtype": experiment.experiment_subtype,
+            "date_recorded": experiment.date_recorded,
+            "processing_stage": experiment.processing_stage,
+        },
+        "videos": sorted(video_hashes),
+        "upstream": upstream_results or {},
+        "settings": {key: settings[key] for key in RELEVANT_SETTINGS if key in settings},
+        "inputs": plugin_inputs,
+    }
+    return hashlib.sha256(canonical_json(payload).encode()).hexdigest()
+
+
+class ResultCache:
+    """Lookup, recording and invalidation of plugin_result_cache entries."""
+
+    def __init__(self, db: Database):
+        self.db = db
+
+    def lookup(self, cache_key: str, experiment_id: str) -> Optional[int]:
+        """Return the plugin_results id stored for a key and experiment, if that result succeeded."""
+        with self.db.get_session() as session:
+            return session.execute(text(
+                "SELECT c.result_id FROM plugin_result_cache c "
+                "JOIN plugin_results r ON r.id = c.result_id AND r.status = 'success' "
+                "AND r.experiment_id = c.experiment_id AND r.plugin_name = c.plugin_name "
+                "AND r.capability = c.capability "
+                "WHERE c.cache_key = :cache_key AND c.experiment_id = :experiment_id"
+            ), {"cache_key": cache_key, "experiment_id": experiment_id}).scalar()
+
+    @staticmethod
+    def record(session, cache_key: Optional[str], result_id: int, experiment_id: str,
+               plugin_name: str, plugin_version: str, capability: str) -> None:
+        """Point the (experiment, plugin, capability) entry at a newly stored result.
+
+        Runs inside the caller's transaction. Any earlier entry for the same
+        target is dropped, since its result is no longer the latest; with no
+        cache_key (uncacheable or failed result) nothing new is recorded.
+        """
+        session.execute(text(
+            "DELETE FROM plugin_result_cache "
+            "WHERE experiment_id = :experiment_id AND plugin_name = :plugin_name AND capability = :capability"
+        ), {"experiment_id": experiment_id, "plugin_name": plugin_name, "capability": capability})
+        if cache_key:
+            session.execute(text(
+                "INSERT OR REPLACE INTO plugin_result_cache"
+                "(cache_key, result_id, experiment_id, plugin_name, plugin_version, capability, created_at) "
+                "VALUES (:cache_key, :result_id, :experiment_id, :plugin_name, :plugin_version, :capability, :created_at)"
+            ), {"cache_key": cache_key, "result_id": result_id, "experiment_id": experiment_id,
+                "plugin_name": plugin_name, "plugin_version": plugin_version or "", "capability": capability,
+                "created_at": datetime.now().isoformat()})
+
+    def invalidate(self, experiment_ids: Optional[List[str]] = None, plugin_name: Optional[str] = None,
+                   capability: Optional[str] = None) -> int:
+        """Drop cache entries (all, or matching the filters); stored results are kept. Returns entries removed."""
+        clauses, params = [], {}
+        if plugin_name:
+            clauses.append("plugin_name = :plugin_name")
+            params["plugin_name"] = plugin_name
+        if capability:
+            clauses.append("capability = :capability")
+            params["capability"] = capability
+        if experiment_ids is not None:
+            if not experiment_ids:
+                return 0
+            names = {f"e{i}": exp_id for i, exp_id in enumerate(experiment_ids)}
+            clauses.append(f"experiment_id IN ({', '.join(':' + name for name in names)})")
+            params.update(names)
+        sql = "DELETE FROM plugin_result_cache" + (" WHERE " + " AND ".join(clauses) if clauses else "")
+        with self.db.get_session() as session:
+            removed = session.execute(text(sql), params).rowcount
+            session.commit()
+        logger.info(f"Invalidated {removed} cached plugin results")
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        """Entries per plugin/capability."""
+        with self.db.get_session() as session:
+            rows = session.execute(text(
+                "SELECT plugin_name, capability, COUNT(*) FROM plugin_result_cache "
+                "GROUP BY plugin_name, capability ORDER BY plugin_name, capability"
+            )).all()
+        return {
+            "entries": sum(count for _, _, count in rows),
+            "by_capability": [{"plugin_name": p, "capability": c, "entries": n} for p, c, n in rows],
+        }
@@ -6,15 +6,20 @@ in metadata.py. These are the actual database tables.
 """
 
 import json
+import logging
+import threading
 from datetime import datetime
-from sqlalchemy import create_engine, Column, Integer, String, DateTime, Float, Boolean, Text, ForeignKey, Enum as SQLEnum
+from pathlib import Path
+from sqlalchemy import create_engine, event, Column, Integer, String, DateTime, Float, Boolean, Text, ForeignKey, Enum as SQLEnum
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship, sessionmaker
-from typing import List
+from typing import Dict, List, Optional, Union
 from .metadata import Sex, ProcessingStage, SubjectDesignation, InheritancePattern, WorkerProvider, ScanTargetKind
 
 Base = declarative_base()
 
+logger = logging.getLogger(__name__)
+
 # ===========================================
 # DATABASE MODELS (SQLAlchemy)
 # ===========================================
@@ -92,6 +97,25 @@ if experiment_videos is None:
         Column('video_id', Integer, ForeignKey('videos.id'))
     )
 
+class BatchModel(Base):
+    """Database model for experiment batches."""
+    __tablename__ = 'batches'
+
+    id = Column(String, primary_key=True)
+    name = Column(String, nullable=True)
+    description = Column(Text, default="")
+    selection_criteria = Column(Text, default="{}")  # JSON-encoded criteria used to pick the experiments
+    status = Column(String, nullable=False, default="created")
+    created_at = Column(DateTime, nullable=False)
+
+class BatchExperimentModel(Base):
+    """Database model for batch membership (ordered)."""
+    __tablename__ = 'batch_experiments'
+
+    batch_id = Column(String, ForeignKey('batches.id'), primary_key=True)
+    experiment_id = Column(String, ForeignKey('experiments.id'), primary_key=True, index=True)
+    position = Column(Integer, nullable=False)
+
 class MetadataItemModel(Base):
     """Base class for metadata items (objects, bodyparts, treatments, genotypes)."""
     __abstract__ = True
@@ -252,10 +276,34 @@ class Database:
     def __init__(self, db_path: str):
         self.engine = create_engine(f'sqlite:///{db_path}')
         self.SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
+        # Root that relative video paths are stored against (set by the project manager)
+        self.video_root: Optional[Path] = None
+        self._read_only = False
+        self._query_only_hooked = False
+
+    @property
+    def read_only(self) -> bool:
+        """Whether connections refuse writes (set when the project's write lease is held elsewhere)."""
+        return self._read_only
+
+    @read_only.setter
+    def read_only(self, value: bool) -> None:
+        # PRAGMA query_only on every checkout; the hook is only installed once needed
+        if value and not self._query_only_hooked:
+            event.listen(self.engine, "checkout", self._apply_query_only)
+            self._query_only_hooked = True
+        self._read_only = bool(value)
+
+    def _apply_query_only(self, dbapi_connection, connection_record, connection_proxy) -> None:
+        dbapi_connection.execute(f"PRAGMA query_only = {int(self._read_only)}")
 
     def create_tables(self):
         """Create all tables."""
         Base.metadata.create_all(bind=self.engine)
+        ensure_search_index(self.engine)
+        ensure_change_tracking(self.engine)
+        ensure_project_stats(self.engine)
+        ensure_result_cache(self.engine)
 
     def get_session(self):
         """Get a database session."""
@@ -263,8 +311,261 @@ class Database:
 
     def drop_tables(self):
         """Drop all tables (for testing)."""
+        with self.engine.begin() as conn:
+            for fts_table in SEARCH_INDEX_TABLES:
+                conn.exec_driver_sql(f"DROP TABLE IF EXISTS {fts_table}")
+            conn.exec_driver_sql("DROP TABLE IF EXISTS row_changes")
+            conn.exec_driver_sql("DROP TABLE IF EXISTS project_stats")
+            conn.exec_driver_sql("DROP TABLE IF EXISTS plugin_result_cache")
         Base.metadata.drop_all(bind=self.engine)
 
+    def dispose(self):
+        """Close pooled connections held by the engine."""
+        self.engine.dispose()
+
+# ===========================================
+# FULL-TEXT SEARCH INDEX (FTS5)
+# ===========================================
+# External-content FTS5 tables mirror searchable columns of subjects and
+# experiments by rowid; triggers keep them in sync on every write.
+
+SEARCH_INDEX_TABLES = {
+    "subjects_fts": ("subjects", ("id", "individual_genotype", "individual_treatment", "notes")),
+    "experiments_fts": ("experiments", ("id", "subject_id", "experiment_type", "experiment_subtype", "notes")),
+}
+
+
+def _search_index_ddl(fts_table: str, content_table: str, columns) -> List[str]:
+    cols = ", ".join(columns)
+    new_vals = ", ".join(f"new.{c}" for c in columns)
+    old_vals = ", ".join(f"old.{c}" for c in columns)
+    delete_row = (
+        f"INSERT INTO {fts_table}({fts_table}, rowid, {cols}) "
+        f"VALUES ('delete', old.rowid, {old_vals});"
+    )
+    insert_row = f"INSERT INTO {fts_table}(rowid, {cols}) VALUES (new.rowid, {new_vals});"
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts_table} USING fts5("
+        f"{cols}, content='{content_table}', content_rowid='rowid', "
+        f"tokenize=\"unicode61 tokenchars '-_'\", prefix='2 3')",
+        f"CREATE TRIGGER IF NOT EXISTS {fts_table}_ai AFTER INSERT ON {content_table} BEGIN {insert_row} END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts_table}_ad AFTER DELETE ON {content_table} BEGIN {delete_row} END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts_table}_au AFTER UPDATE OF {cols} ON {content_table} "
+        f"BEGIN {delete_row} {insert_row} END",
+    ]
+
+
+def ensure_search_index(engine) -> None:
+    """Create FTS5 search tables and sync triggers; backfill when first created."""
+    try:
+        with engine.begin() as conn:
+            existing = {
+                row[0] for row in conn.exec_driver_sql(
+                    "SELECT name FROM sqlite_master WHERE type = 'table'"
+                )
+            }
+            for fts_table, (content_table, columns) in SEARCH_INDEX_TABLES.items():
+                for statement in _search_index_ddl(fts_table, content_table, columns):
+                    conn.exec_driver_sql(statement)
+                if fts_table not in existing:
+                    conn.exec_driver_sql(f"INSERT INTO {fts_table}({fts_table}) VALUES ('rebuild')")
+    except Exception as e:
+        # SQLite builds without FTS5: search is unavailable, everything else works
+        logger.warning(f"Full-text search index unavailable: {e}")
+
+# ===========================================
+# ROW CHANGE TRACKING
+# ===========================================
+# row_changes keeps one row per tracked source row with the sequence number of
+# its latest insert/update, so exports can pick up only what changed.
+
+CHANGE_TRACKED_TABLES = ("subjects", "experiments", "videos", "experiment_videos", "plugin_results")
+
+
+def ensure_change_tracking(engine) -> None:
+    """Create the row_changes table and its insert/update triggers."""
+    with engine.begin() as conn:
+        conn.exec_driver_sql(
+            "CREATE TABLE IF NOT EXISTS row_changes ("
+            "table_name TEXT NOT NULL, row_id INTEGER NOT NULL, seq INTEGER NOT NULL, "
+            "PRIMARY KEY (table_name, row_id))"
+        )
+        conn.exec_driver_sql("CREATE INDEX IF NOT EXISTS ix_row_changes_seq ON row_changes(seq)")
+        for table in CHANGE_TRACKED_TABLES:
+            record = (
+                f"INSERT OR REPLACE INTO row_changes(table_name, row_id, seq) "
+                f"VALUES ('{table}', new.rowid, (SELECT COALESCE(MAX(seq), 0) + 1 FROM row_changes));"
+            )
+            for event, suffix in (("INSERT", "ai"), ("UPDATE", "au")):
+                conn.exec_driver_sql(
+                    f"CREATE TRIGGER IF NOT EXISTS {table}_changes_{suffix} AFTER {event} ON {table} "
+                    f"BEGIN {record} END"
+                )
+
+# ===========================================
+# PROJECT STATISTICS
+# ===========================================
+# project_stats holds running counters kept current by triggers, so status
+# screens read a handful of rows instead of counting whole tables. Each entry
+# is (metric, key): key is '' for totals, or the stage/type/genotype value.
+
+def _stat_upsert(metric: str, key_sql: str, delta_sql: str) -> str:
+    return (
+        f"INSERT INTO project_stats(metric, key, value) VALUES ('{metric}', {key_sql}, {delta_sql}) "
+        f"ON CONFLICT(metric, key) DO UPDATE SET value = value + excluded.value;"
+    )
+
+
+# table -> (counter metrics per row, {grouped metric: column}, summed metrics {metric: column})
+_STATS_TRIGGER_SPECS = {
+    "colonies": ("colonies", {}, {}),
+    "subjects": ("subjects", {"subjects_by_genotype": "individual_genotype"}, {}),
+    "experiments": ("experiments", {"experiments_by_stage": "processing_stage",
+                                    "experiments_by_type": "experiment_type"}, {}),
+    "videos": ("videos", {}, {"video_bytes": "size_bytes"}),
+    "workers": ("workers", {}, {}),
+    "scan_targets": ("scan_targets", {}, {}),
+}
+
+
+def _stats_trigger_ddl(table: str) -> List[str]:
+    count_metric, grouped, summed = _STATS_TRIGGER_SPECS[table]
+
+    def row_effect(row: str, sign: str) -> str:
+        statements = [_stat_upsert(count_metric, "''", f"{sign}1")]
+        statements += [_stat_upsert(metric, f"COALESCE({row}.{column}, '')", f"{sign}1")
+                       for metric, column in grouped.items()]
+        statements += [_stat_upsert(metric, "''", f"{sign}COALESCE({row}.{column}, 0)")
+                       for metric, column in summed.items()]
+        return " ".join(statements)
+
+    ddl = [
+        f"CREATE TRIGGER IF NOT EXISTS {table}_stats_ai AFTER INSERT ON {table} BEGIN {row_effect('new', '+')} END",
+        f"CREATE TRIGGER IF NOT EXISTS {table}_stats_ad AFTER DELETE ON {table} BEGIN {row_effect('old', '-')} END",
+    ]
+    watched = list(grouped.values()) + list(summed.values())
+    if watched:
+        update = " ".join(
+            [_stat_upsert(metric, f"COALESCE(old.{column}, '')", "-1") + " " +
+             _stat_upsert(metric, f"COALESCE(new.{column}, '')", "+1") for metric, column in grouped.items()] +
+            [_stat_upsert(metric, "''", f"COALESCE(new.{column}, 0) - COALESCE(old.{column}, 0)")
+             for metric, column in summed.items()]
+        )
+        ddl.append(
+            f"CREATE TRIGGER IF NOT EXISTS {table}_stats_au AFTER UPDATE OF {', '.join(watched)} ON {table} "
+            f"BEGIN {update} END"
+        )
+    return ddl
+
+
+def rebuild_project_stats(conn) -> None:
+    """Recompute project_stats from the base tables (COUNT/SUM queries)."""
+    conn.exec_driver_sql("DELETE FROM project_stats")
+    for table, (count_metric, grouped, summed) in _STATS_TRIGGER_SPECS.items():
+        conn.exec_driver_sql(
+            f"INSERT INTO project_stats(metric, key, value) SELECT '{count_metric}', '', COUNT(*) FROM {table}"
+        )
+        for metric, column in grouped.items():
+            conn.exec_driver_sql(
+                f"INSERT INTO project_stats(metric, key, value) "
+                f"SELECT '{metric}', COALESCE({column}, ''), COUNT(*) FROM {table} GROUP BY COALESCE({column}, '')"
+            )
+        for metric, column in summed.items():
+            conn.exec_driver_sql(
+                f"INSERT INTO project_stats(metric, key, value) "
+                f"SELECT '{metric}', '', COALESCE(SUM({column}), 0) FROM {table}"
+            )
+
+
+def ensure_project_stats(engine) -> None:
+    """Create the project_stats table and its triggers, backfilling on first creation."""
+    with engine.begin() as conn:
+        exists = conn.exec_driver_sql(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'project_stats'"
+        ).first() is not None
+        conn.exec_driver_sql(
+            "CREATE TABLE IF NOT EXISTS project_stats ("
+            "metric TEXT NOT NULL, key TEXT NOT NULL DEFAULT '', value INTEGER NOT NULL DEFAULT 0, "
+            "PRIMARY KEY (metric, key))"
+        )
+        for table in _STATS_TRIGGER_SPECS:
+            for statement in _stats_trigger_ddl(table):
+                conn.exec_driver_sql(statement)
+        if not exists:
+            rebuild_project_stats(conn)
+
+# ===========================================
+# PLUGIN RESULT CACHE
+# ===========================================
+# plugin_result_cache maps a content hash of an analysis' inputs to the
+# plugin_results row it produced (see result_cache.py). Entries go away with
+# their result rows.
+
+def ensure_result_cache(engine) -> None:
+    """Create the plugin_result_cache table, its cleanup trigger and the latest-result index."""
+    with engine.begin() as conn:
+        conn.exec_driver_sql(
+            "CREATE TABLE IF NOT EXISTS plugin_result_cache ("
+            "cache_key TEXT PRIMARY KEY, result_id INTEGER NOT NULL, experiment_id TEXT NOT NULL, "
+            "plugin_name TEXT NOT NULL, plugin_version TEXT NOT NULL DEFAULT '', capability TEXT NOT NULL, "
+            "created_at TEXT NOT NULL)"
+        )
+        conn.exec_driver_sql(
+            "CREATE INDEX IF NOT EXISTS ix_plugin_result_cache_target "
+            "ON plugin_result_cache(experiment_id, plugin_name, capability)"
+        )
+        conn.exec_driver_sql(
+            "CREATE INDEX IF NOT EXISTS ix_plugin_results_latest "
+            "ON plugin_results(experiment_id, plugin_name, capability, id)"
+        )
+        conn.exec_driver_sql(
+            "CREATE TRIGGER IF NOT EXISTS plugin_results_cache_ad AFTER DELETE ON plugin_results "
+            "BEGIN DELETE FROM plugin_result_cache WHERE result_id = old.id; END"
+        )
+
+# ===========================================
+# DATABASE REGISTRY
+# ===========================================
+# One Database (engine + session factory) per resolved file path per process.
+# Schema creation runs once when a path is first registered.
+
+_databases: Dict[str, Database] = {}
+_databases_lock = threading.Lock()
+
+
+def _registry_key(db_path: Union[str, Path]) -> str:
+    return str(Path(db_path).expanduser().resolve())
+
+
+def get_database(db_path: Union[str, Path]) -> Database:
+    """Return the shared Database for db_path, creating tables on first use."""
+    key = _registry_key(db_path)
+    with _databases_lock:
+        db = _databases.get(key)
+        if db is None:
+            db = Database(key)
+            db.create_tables()
+            _databases[key] = db
+        return db
+
+
+def dispose_database(db_path: Union[str, Path]) -> None:
+    """Dispose and forget the shared Database for db_path, if registered."""
+    with _databases_lock:
+        db = _databases.pop(_registry_key(db_path), None)
+    if db is not None:
+        db.dispose()
+
+
+def dispose_databases(root: Optional[Union[str, Path]] = None) -> None:
+    """Dispose registered databases, all of them or only those under root."""
+    prefix = _registry_key(root) if root is not None else None
+    with _databases_lock:
+        keys = [k for k in _databases if prefix is None or Path(k).is_relative_to(prefix)]
+        disposed = [_databases.pop(k) for k in keys]
+    for db in disposed:
+        db.dispose()
+
 # ===========================================
 # DATA MAPPING FUNCTIONS
 # ===========================================
@@ -6,11 +6,20 @@ Implements the ProjectServiceFactory pattern to centralize creation of
 project-scoped services with proper dependency injection.
 """
 
+import logging
+import time
+from collections import OrderedDict
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional, Tuple
 
 from .project_manager_clean import ProjectManagerClean
 from .plugin_manager_clean import PluginManagerClean
+from .schema import dispose_database
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_OPEN_PROJECTS = 4
+DEFAULT_IDLE_TIMEOUT = 30 * 60.0  # seconds
 
 
 class ProjectServiceFactory:
@@ -61,3 +70,133 @@ class ProjectServiceFactory:
         self._project_manager = None
         self._plugin_manager = None
         self._gui_services = None
+
+    def close(self):
+        """Flush and release the project's resources (config writes, engine)."""
+        if self._project_manager is not None:
+            self._project_manager.cleanup()
+            dispose_database(self._project_manager.db_path)
+        self.reset()
+
+
+# ===========================================
+# OPEN PROJECT CACHE
+# ===========================================
+
+_Stamp = Tuple[Optional[Tuple[int, int]], ...]
+
+
+def _project_stamp(project_path: Path) -> _Stamp:
+    """(mtime_ns, size) of the files another process would change."""
+    stamp = []
+    for name in ("mus1.db", "mus1.db-wal", "project.json"):
+        try:
+            st = (project_path / name).stat()
+            stamp.append((st.st_mtime_ns, st.st_size))
+        except OSError:
+            stamp.append(None)
+    return tuple(stamp)
+
+
+class _CachedProject:
+    __slots__ = ("factory", "stamp", "last_used")
+
+    def __init__(self, factory: ProjectServiceFactory):
+        self.factory = factory
+        self.stamp: _Stamp = ()
+        self.last_used = time.monotonic()
+
+
+class ProjectContextCache:
+    """Bounded LRU of recently opened projects for fast switching.
+
+    Each entry keeps a ProjectServiceFactory with its project manager,
+    plugin manager and GUI services. When the caller switches away from a
+    project its files are stamped (db/project.json mtime and size); if the
+    stamp differs when the project is requested again, another process
+    changed it and the context is rebuilt. Entries unused for idle_timeout
+    seconds, and the least recently used beyond max_size, are closed.
+    """
+
+    def __init__(self, max_size: int = DEFAULT_OPEN_PROJECTS, idle_timeout: float = DEFAULT_IDLE_TIMEOUT):
+        self.max_size = max(1, max_size)
+        self.idle_timeout = idle_timeout
+        self._entries: "OrderedDict[str, _CachedProject]" = OrderedDict()
+        self._current: Optional[str] = None
+
+    @staticmethod
+    def _key(project_path: Path) -> str:
+        return str(Path(project_path).resolve())
+
+    def get(self, project_path: Path) -> ProjectServiceFactory:
+        """Return the (possibly cached) service factory for a project and make it current."""
+        key = self._key(project_path)
+        self._release_current(key)
+        self.evict_idle(keep=key)
+
+        entry = self._entries.get(key)
+        if entry is not None and entry.stamp and entry.stamp != _project_stamp(Path(key)):
+            logger.info(f"Project {key} changed on disk; reopening")
+            self._close(key)
+            entry = None
+        if entry is None:
+            entry = _CachedProject(ProjectServiceFactory(Path(key)))
+            self._entries[key] = entry
+        else:
+            logger.debug(f"Reusing open project {key}")
+        self._entries.move_to_end(key)
+        entry.last_used = time.monotonic()
+        self._current = key
+
+        while len(self._entries) > self.max_size:
+            oldest = next(iter(self._entries))
+            self._close(oldest)
+        return entry.factory
+
+    def _release_current(self, next_key: str) -> None:
+        # Writes made while a project was current are ours; stamp it on switching away
+        if self._current and self._current != next_key and self._current in self._entries:
+            entry = self._entries[self._current]
+            factory = entry.factory
+            if factory._project_manager is not None:
+                factory._project_manager.flush_config()
+            entry.stamp = _project_stamp(Path(self._current))
+            entry.last_used = time.monotonic()
+        if self._current != next_key:
+            self._current = None
+
+    def invalidate(self, project_path: Optional[Path] = None) -> None:
+        """Close one cached project (or all of them) so the next get() reopens it."""
+        keys = [self._key(project_path)] if project_path is not None else list(self._entries)
+        for key in keys:
+            self._close(key)
+
+    def evict_idle(self, keep: Optional[str] = None) -> List[str]:
+        """Close projects unused for idle_timeout seconds (never the current one)."""
+        now = time.monotonic()
+        idle = [key for key, entry in self._entries.items()
+                if key not in (keep, self._current) and now - entry.last_used > self.idle_timeout]
+        for key in idle:
+            self._close(key)
+        return idle
+
+    def _close(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        if self._current == key:
+            self._current = None
+        try:
+            entry.factory.close()
+        except Exception as e:
+            logger.warning(f"Error closing project {key}: {e}")
+
+    def clear(self) -> None:
+        """Close every cached project."""
+        self.invalidate()
+
+    def __contains__(self, project_path: Path) -> bool:
+        return self._key(project_path) in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
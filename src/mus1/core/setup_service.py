@@ -12,7 +12,7 @@ from dataclasses import dataclass
 from datetime import datetime
 import platform
 
-from .config_manager import get_config_manager, set_config, get_config
+from .config_manager import get_config_manager, set_config, get_config, config_batch
 from .config_manager import set_lab_storage_root as cfg_set_lab_root
 from .config_manager import is_lab_storage_online
 from .metadata import LabDTO, ColonyDTO  # Use Pydantic DTOs as single source
@@ -140,16 +140,13 @@ class SetupService:
         """Get the config database with ensured schema.
 
         The config database (config.db) also stores domain tables for users,
-        labs, colonies, etc. Ensure those SQLAlchemy tables exist before any
-        repository operations to avoid 'no such table' errors.
+        labs, colonies, etc. The process-wide registry creates those tables
+        once per path and reuses the engine on later calls.
         """
-        from .schema import Database
+        from .schema import get_database
         from .config_manager import get_config_manager
 
-        config_manager = get_config_manager()
-        db = Database(str(config_manager.db_path))
-        db.create_tables()
-        return db
+        return get_database(get_config_manager().db_path)
 
     # ===========================================
     # MUS1 ROOT LOCATION MANAGEMENT
@@ -237,8 +234,9 @@ class SetupService:
             os.environ["MUS1_ROOT"] = str(root_dto.path)
 
         # Save configuration (this will now be stored in the correct location)
-        set_config("mus1.root_path", str(root_dto.path), scope="install")
-        set_config("mus1.root_setup_date", datetime.now().isoformat(), scope="install")
+        with config_batch():
+            set_config("mus1.root_path", str(root_dto.path), scope="install")
+            set_config("mus1.root_setup_date", datetime.now().isoformat(), scope="install")
 
         # Reinitialize the global ConfigManager to point at the new root immediately
         try:
@@ -635,8 +633,9 @@ class SetupService:
                 }
 
         # Save configuration
-        set_config("storage.shared_root", str(storage_dto.path), scope="user")
-        set_config("storage.shared_setup_date", datetime.now().isoformat(), scope="user")
+        with config_batch():
+            set_config("storage.shared_root", str(storage_dto.path), scope="user")
+            set_config("storage.shared_setup_date", datetime.now().isoformat(), scope="user")
 
         return {
             "success": True,
@@ -1358,8 +1357,9 @@ class SetupService:
                 probe = path / ".mus1_write_test"
                 probe.write_text("ok")
                 probe.unlink(missing_ok=True)
-            set_config("storage.shared_root", str(path), scope="user")
-            set_config("storage.shared_setup_date", datetime.now().isoformat(), scope="user")
+            with config_batch():
+                set_config("storage.shared_root", str(path), scope="user")
+                set_config("storage.shared_setup_date", datetime.now().isoformat(), scope="user")
             return {"success": True, "path": str(path)}
         except Exception as e:
             return {"success": False, "message": str(e)}
@@ -4,26 +4,18 @@ Simplified MUS1 CLI - Core operations only.
 This replaces the 2910-line grab-bag CLI with focused commands.
 """
 
-from __future__ import annotations
+# No `from __future__ import annotations`: typer resolves the annotations of every
+# command whenever the CLI runs, and string annotations would each be eval()'d.
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
 import typer
 from rich import print as rich_print
-from rich.prompt import Prompt, Confirm
-from rich.table import Table
-from rich.panel import Panel
 import json
-import platform
 # from datetime import datetime  # not needed at module scope
 
-from .metadata import ProjectConfig, SubjectDTO, ExperimentDTO, ColonyDTO, LabDTO
-from .config_manager import get_config_manager, get_config
-from .repository import SubjectRepository, ExperimentRepository
-from .schema import Database
-from .setup_service import (
-    get_setup_service, MUS1RootLocationDTO,
-    UserProfileDTO, SharedStorageDTO
-)
+# Heavy modules (configuration, SQLAlchemy models, repositories, setup services, rich
+# widgets) are imported inside the commands that use them, to keep startup fast (see
+# benchmarks/bench_cli_startup.py).
 
 app = typer.Typer(
     help="MUS1 - Simple video analysis system",
@@ -42,6 +34,10 @@ app.add_typer(lab_app, name="lab")
 project_app = typer.Typer(help="Project management commands")
 app.add_typer(project_app, name="project")
 
+# Daemon subcommand group
+daemon_app = typer.Typer(help="Background daemon that keeps MUS1 warm between CLI calls")
+app.add_typer(daemon_app, name="daemon")
+
 # ===========================================
 # CORE COMMANDS
 # ===========================================
@@ -86,6 +82,10 @@ def init_project(
     shared_root: Optional[Path] = typer.Option(None, help="Specific shared root path"),
 ):
     """Initialize a new MUS1 project with lab association and shared storage support."""
+    from .setup_service import get_setup_service
+    from .metadata import ProjectConfig
+    from .schema import Database
+    from .config_manager import get_config_manager, get_config
     _ = get_config_manager()
 
     # Determine project path
@@ -143,15 +143,14 @@ def init_project(
     )
 
     # Save project config as JSON for compatibility
-    config_path = project_path / "project.json"
-    with open(config_path, 'w') as f:
-        json.dump({
-            "name": config.name,
-            "shared_root": str(config.shared_root) if config.shared_root else None,
-            "lab_id": config.lab_id,
-            "date_created": config.date_created.isoformat(),
-            "database_path": str(db_path)
-        }, f, indent=2)
+    from .config_store import atomic_write_json
+    atomic_write_json(project_path / "project.json", {
+        "name": config.name,
+        "shared_root": str(config.shared_root) if config.shared_root else None,
+        "lab_id": config.lab_id,
+        "date_created": config.date_created.isoformat(),
+        "database_path": str(db_path)
+    }, indent=2)
 
     # Register project with lab if specified
     if lab_id:
@@ -178,6 +177,7 @@ def init_project(
 @project_app.command("list")
 def list_projects():
     """List all MUS1 projects from configured locations."""
+    from .config_manager import get_config_manager, get_config
     _ = get_config_manager()
 
     # Get projects from user configuration
@@ -225,6 +225,7 @@ def list_projects():
         rich_print("[blue]ℹ[/blue] Create your first project with 'mus1 project init \"My Project\"'")
         return
 
+    from rich.table import Table
     table = Table(title="MUS1 Projects")
     table.add_column("Name", style="cyan")
     table.add_column("Lab", style="white")
@@ -261,14 +262,14 @@ def project_status(
         with open(config_path) as f:
             config = json.load(f)
 
-    # Load database stats
-    stats = {"subjects": 0, "experiments": 0, "videos": 0}
+    # Load database stats (maintained counters, constant time)
+    stats = {"subjects": 0, "experiments": 0, "videos": 0, "video_bytes": 0,
+             "experiments_by_stage": {}, "experiments_by_type": {}}
     if db_path.exists():
         try:
-            db = Database(str(db_path))
-            stats["subjects"] = len(SubjectRepository(db).find_all())
-            stats["experiments"] = len(ExperimentRepository(db).find_all())
-            # Note: VideoFile repository not implemented yet, so we'll skip videos for now
+            from .schema import get_database
+            from .repository import StatsRepository
+            stats.update(StatsRepository(get_database(db_path)).get())
         except Exception as e:
             rich_print(f"[yellow]⚠[/yellow] Could not read database: {e}")
 
@@ -283,7 +284,418 @@ def project_status(
     rich_print(f"\n[bold]Database:[/bold] {db_path}")
     rich_print(f"[bold]Subjects:[/bold] {stats['subjects']}")
     rich_print(f"[bold]Experiments:[/bold] {stats['experiments']}")
-    rich_print(f"[bold]Videos:[/bold] {stats['videos']}")
+    for stage, count in sorted(stats["experiments_by_stage"].items()):
+        rich_print(f"  {stage}: {count}")
+    from .utils.formatting import format_bytes
+    rich_print(f"[bold]Videos:[/bold] {stats['videos']} ({format_bytes(stats['video_bytes'])})")
+
+@project_app.command("export")
+def project_export(
+    path: Path = typer.Option(Path.cwd(), help="Project directory"),
+    output: Optional[Path] = typer.Option(None, help="Output directory (default: <project>/exports/<format>)"),
+    fmt: str = typer.Option("parquet", "--format", help="parquet or feather"),
+    incremental: bool = typer.Option(False, help="Only export rows changed since the last export to this directory"),
+    tables: Optional[str] = typer.Option(None, help="Comma-separated tables (default: all)"),
+    chunk_size: int = typer.Option(50_000, help="Rows per chunk"),
+):
+    """Export project data to columnar files (Parquet/Feather)."""
+    db_path = path / "mus1.db"
+    if not db_path.exists():
+        rich_print(f"[red]✗[/red] No MUS1 project found at {path}")
+        raise typer.Exit(1)
+
+    from .schema import get_database
+    from .export_service import ProjectExporter, EXPORT_FORMATS
+
+    if fmt not in EXPORT_FORMATS:
+        rich_print(f"[red]✗[/red] Unknown format '{fmt}' (use {' or '.join(EXPORT_FORMATS)})")
+        raise typer.Exit(1)
+
+    output_dir = output or (path / "exports" / fmt)
+    table_list = [t.strip() for t in tables.split(",") if t.strip()] if tables else None
+
+    from rich.console import Console
+    exporter = ProjectExporter(get_database(db_path), output_dir, fmt=fmt, chunk_size=chunk_size)
+    with Console().status("Exporting...") as status:
+        result = exporter.export(
+            tables=table_list,
+            incremental=incremental,
+            progress=lambda table, rows: status.update(f"Exporting {table}: {rows} rows"),
+        )
+    if not result["success"]:
+        rich_print(f"[red]✗[/red] {result['message']}")
+        raise typer.Exit(1)
+
+    rich_print(f"[green]✓[/green] {result['message']} to {result['output_dir']}")
+    for table, count in result["rows"].items():
+        rich_print(f"  {table}: {count}")
+
+@project_app.command("snapshot")
+def project_snapshot(
+    path: Path = typer.Option(Path.cwd(), help="Project directory"),
+    reason: str = typer.Option("manual", help="Label stored with the snapshot"),
+):
+    """Take an online snapshot of the project database and project.json."""
+    if not (path / "mus1.db").exists():
+        rich_print(f"[red]✗[/red] No MUS1 project found at {path}")
+        raise typer.Exit(1)
+
+    from rich.console import Console
+    from .project_manager_clean import ProjectManagerClean
+    from .utils.formatting import format_bytes
+
+    pm = ProjectManagerClean(path)
+    with Console().status("Snapshotting...") as status:
+        info = pm.create_snapshot(
+            reason=reason,
+            progress=lambda done, total: status.update(f"Snapshotting: {done}/{total} pages"),
+        )
+    rich_print(f"[green]✓[/green] Created snapshot {info['id']} ({format_bytes(info['size_bytes'])})")
+
+@project_app.command("snapshots")
+def project_snapshots(
+    path: Path = typer.Option(Path.cwd(), help="Project directory"),
+):
+    """List project snapshots, newest first."""
+    if not (path / "mus1.db").exists():
+        rich_print(f"[red]✗[/red] No MUS1 project found at {path}")
+        raise typer.Exit(1)
+
+    from .project_manager_clean import ProjectManagerClean
+    from .utils.formatting import format_bytes
+
+    snapshots = ProjectManagerClean(path).list_snapshots()
+    if not snapshots:
+        rich_print("[yellow]⚠[/yellow] No snapshots found")
+        return
+    rich_print(f"[bold]Snapshots ({len(snapshots)}):[/bold]")
+    for info in snapshots:
+        rich_print(f"  {info['id']}  {info.get('reason', '')}  {format_bytes(info['size_bytes'])}")
+
+@project_app.command("restore")
+def project_restore(
+    snapshot_id: str = typer.Argument(..., help="Snapshot ID (see 'mus1 project snapshots')"),
+    path: Path = typer.Option(Path.cwd(), help="Project directory"),
+    yes: bool = typer.Option(False, "--yes", "-y", help="Do not ask for confirmation"),
+):
+    """Restore the project database and project.json from a snapshot."""
+    from rich.prompt import Confirm
+    if not (path / "mus1.db").exists():
+        rich_print(f"[red]✗[/red] No MUS1 project found at {path}")
+        raise typer.Exit(1)
+    if not yes and not Confirm.ask(f"Restore {path} to snapshot {snapshot_id}?"):
+        raise typer.Exit(0)
+
+    from .project_manager_clean import ProjectManagerClean
+
+    try:
+        result = ProjectManagerClean(path).restore_snapshot(snapshot_id)
+    except FileNotFoundError as e:
+        rich_print(f"[red]✗[/red] {e}")
+        raise typer.Exit(1)
+    rich_print(f"[green]✓[/green] Restored snapshot {result['restored']}")
+    if result["pre_restore_snapshot"]:
+        rich_print(f"  Previous state saved as {result['pre_restore_snapshot']}")
+
+@project_app.command("link-videos")
+def project_link_videos(
+    csv_file: Path = typer.Argument(..., help="CSV with experiment_id and path columns"),
+    path: Path = typer.Option(Path.cwd(), help="Project directory"),
+    workers: Optional[int] = typer.Option(None, help="Parallel hashing threads"),
+    output: Optional[Path] = typer.Option(None, help="Write the per-row report as JSON"),
+):
+    """Link many videos to experiments in one transaction."""
+    if not (path / "mus1.db").exists():
+        rich_print(f"[red]✗[/red] No MUS1 project found at {path}")
+        raise typer.Exit(1)
+
+    import csv
+    from rich.console import Console
+    from .project_manager_clean import ProjectManagerClean
+
+    with open(csv_file, newline='') as f:
+        reader = csv.DictReader(f)
+        if not {"experiment_id", "path"} <= set(reader.fieldnames or []):
+            rich_print("[red]✗[/red] CSV must have experiment_id and path columns")
+            raise typer.Exit(1)
+        links = [(row["experiment_id"].strip(), Path(row["path"].strip()).expanduser()) for row in reader]
+
+    pm = ProjectManagerClean(path)
+    with Console().status("Hashing videos...") as status:
+        report = pm.link_videos_to_experiments(
+            links,
+            notes=f"Linked from {csv_file.name}",
+            max_workers=workers,
+            progress=lambda done, total: status.update(f"Hashing videos: {done}/{total}"),
+        )
+    pm.cleanup()
+
+    if output:
+        with open(output, 'w') as f:
+            json.dump(report, f, indent=2)
+        rich_print(f"[green]✓[/green] Report saved to {output}")
+
+    marker = "[green]✓[/green]" if report["success"] else "[yellow]⚠[/yellow]"
+    rich_print(f"{marker} {report['message']}")
+    failures = [row for row in report["rows"] if row["status"] not in ("linked", "already_linked")]
+    for row in failures[:10]:
+        rich_print(f"  [red]✗[/red] {row['experiment_id']} ← {row['path']}: {row['message']}")
+    if len(failures) > 10:
+        rich_print(f"  ... and {len(failures) - 10} more")
+
+
+@project_app.command("match-videos")
+def project_match_videos(
+    path: Path = typer.Option(Path.cwd(), help="Project directory"),
+    template: Optional[List[str]] = typer.Option(None, "--template", help="Filename/path template, e.g. '{type}-{subject}-{date}' (repeatable)"),
+    apply: bool = typer.Option(False, "--apply", help="Link unambiguous matches at or above --min-confidence"),
+    min_confidence: float = typer.Option(0.9, help="Minimum confidence for --apply"),
+    top: int = typer.Option(20, help="Number of proposals to list"),
+    output: Optional[Path] = typer.Option(None, help="Write all proposals as JSON"),
+):
+    """Propose experiments for unlinked videos from their file names and paths."""
+    from rich.table import Table
+    if not (path / "mus1.db").exists():
+        rich_print(f"[red]✗[/red] No MUS1 project found at {path}")
+        raise typer.Exit(1)
+
+    from .project_manager_clean import ProjectManagerClean
+
+    pm = ProjectManagerClean(path)
+    try:
+        result = pm.match_unlinked_videos(templates=template or None, apply=apply, min_confidence=min_confidence)
+    except ValueError as e:
+        rich_print(f"[red]✗[/red] {e}")
+        raise typer.Exit(1)
+    finally:
+        pm.cleanup()
+
+    if output:
+        with open(output, 'w') as f:
+            json.dump(result, f, indent=2, default=str)
+        rich_print(f"[green]✓[/green] Proposals saved to {output}")
+
+    rich_print(f"[green]✓[/green] {result['message']}")
+    if result["proposals"]:
+        table = Table(title=f"Proposals (top {min(top, len(result['proposals']))})")
+        table.add_column("Video")
+        table.add_column("Experiment")
+        table.add_column("Confidence", justify="right")
+        table.add_column("Reason")
+        for proposal in result["proposals"][:top]:
+            experiment = proposal["experiment_id"] or f"ambiguous: {', '.join(proposal['candidates'][:3])}"
+            table.add_row(Path(proposal["path"]).name, experiment, f"{proposal['confidence']:.2f}", proposal["reason"])
+        rich_print(table)
+    if not apply and result["proposals"]:
+        rich_print("[blue]ℹ[/blue] Re-run with --apply to link matches")
+
+
+@project_app.command("rebase-paths")
+def project_rebase_paths(
+    old_prefix: Path = typer.Argument(..., help="Directory prefix currently stored (e.g. old mount point)"),
+    new_prefix: Path = typer.Argument(..., help="Directory prefix to store instead"),
+    path: Path = typer.Option(Path.cwd(), help="Project directory"),
+    sample: int = typer.Option(20, help="Moved files to verify against stored hashes"),
+    dry_run: bool = typer.Option(False, "--dry-run", help="Verify only; do not change paths"),
+    force: bool = typer.Option(False, "--force", help="Rebase even if sampled files fail verification"),
+):
+    """Rewrite video paths after storage was remounted or moved."""
+    if not (path / "mus1.db").exists():
+        rich_print(f"[red]✗[/red] No MUS1 project found at {path}")
+        raise typer.Exit(1)
+
+    from rich.console import Console
+    from .project_manager_clean import ProjectManagerClean
+
+    pm = ProjectManagerClean(path)
+    with Console().status("Verifying moved files...") as status:
+        result = pm.rebase_video_paths(
+            old_prefix, new_prefix, sample_size=sample, dry_run=dry_run, force=force,
+            progress=lambda done, total: status.update(f"Verifying moved files: {done}/{total}"),
+        )
+    pm.cleanup()
+
+    for failure in result["failures"][:10]:
+        rich_print(f"  [red]✗[/red] {failure['new_path']}: {failure['reason']}")
+    if result["success"]:
+        rich_print(f"[green]✓[/green] {result['message']} ({result['verified']} sampled files verified)")
+    else:
+        rich_print(f"[red]✗[/red] {result['message']}")
+        raise typer.Exit(1)
+
+
+@project_app.command("relative-paths")
+def project_relative_paths(
+    path: Path = typer.Option(Path.cwd(), help="Project directory"),
+    disable: bool = typer.Option(False, "--disable", help="Store absolute paths again"),
+):
+    """Store video paths relative to the shared root so moving the share only needs a new root."""
+    if not (path / "mus1.db").exists():
+        rich_print(f"[red]✗[/red] No MUS1 project found at {path}")
+        raise typer.Exit(1)
+
+    from .project_manager_clean import ProjectManagerClean
+
+    pm = ProjectManagerClean(path)
+    try:
+        result = pm.set_relative_video_paths(not disable)
+    except ValueError as e:
+        rich_print(f"[red]✗[/red] {e}")
+        raise typer.Exit(1)
+    finally:
+        pm.cleanup()
+    rich_print(f"[green]✓[/green] {result['message']}")
+
+
+@project_app.command("reclaim")
+def project_reclaim(
+    path: Path = typer.Option(Path.cwd(), help="Project directory"),
+    top: int = typer.Option(10, help="Number of largest duplicate groups to list"),
+    output: Optional[Path] = typer.Option(None, help="Write the full report as JSON"),
+):
+    """Storage reclaim report: space held by duplicate videos."""
+    from rich.table import Table
+    if not (path / "mus1.db").exists():
+        rich_print(f"[red]✗[/red] No MUS1 project found at {path}")
+        return
+
+    from .project_manager_clean import ProjectManagerClean
+    from .utils.formatting import format_bytes
+
+    report = ProjectManagerClean(path).storage_reclaim_report(top=top)
+
+    if output:
+        with open(output, 'w') as f:
+            json.dump(report, f, indent=2, default=str)
+        rich_print(f"[green]✓[/green] Report saved to {output}")
+
+    if not report["groups"] and not report["suspect_groups"]:
+        rich_print("[green]✓[/green] No duplicate videos found")
+        return
+
+    rich_print(f"[bold]Duplicate groups:[/bold] {report['groups']} ({report['redundant_copies']} redundant copies)")
+    rich_print(f"[bold]Reclaimable:[/bold] {format_bytes(report['reclaimable_bytes'])}")
+
+    if report["by_root"]:
+        table = Table(title="Reclaimable by root")
+        table.add_column("Root")
+        table.add_column("Bytes", justify="right")
+        for root, size in sorted(report["by_root"].items(), key=lambda kv: kv[1], reverse=True):
+            table.add_row(root, format_bytes(size))
+        rich_print(table)
+
+    if report["top_groups"]:
+        table = Table(title=f"Largest duplicate groups (top {len(report['top_groups'])})")
+        table.add_column("Hash")
+        table.add_column("Copies", justify="right")
+        table.add_column("Wasted", justify="right")
+        table.add_column("Keep")
+        for group in report["top_groups"]:
+            table.add_row(group["hash"][:12], str(group["count"]), format_bytes(group["wasted_bytes"]), group["keep"])
+        rich_print(table)
+
+    if report["suspect_groups"]:
+        rich_print(
+            f"[yellow]⚠[/yellow] {report['suspect_groups']} group(s) share a sample hash but differ in size "
+            f"({format_bytes(report['suspect_bytes'])}); likely hash collisions, not counted as reclaimable"
+        )
+
+
+@project_app.command("analyze")
+def project_analyze(
+    plugin_name: str = typer.Argument(..., help="Plugin name"),
+    capability: str = typer.Argument(..., help="Analysis capability to run"),
+    path: Path = typer.Option(Path.cwd(), help="Project directory"),
+    batch: Optional[str] = typer.Option(None, help="Analyse the experiments of this batch"),
+    experiment: Optional[List[str]] = typer.Option(None, "--experiment", "-e", help="Experiment ID (repeatable)"),
+    experiment_type: Optional[str] = typer.Option(None, "--type", help="Analyse all experiments of this type"),
+    workers: Optional[int] = typer.Option(None, help="Worker processes (default: CPU count)"),
+    timeout: Optional[float] = typer.Option(None, help="Per-experiment timeout in seconds"),
+    recompute: bool = typer.Option(False, "--recompute", help="Run the plugin even where a stored result has the same inputs"),
+    output: Optional[Path] = typer.Option(None, help="Write per-experiment outcomes as JSON"),
+):
+    """Run a plugin capability over many experiments in parallel worker processes.
+
+    For plugins that opt in to memoization, experiments whose stored result
+    was computed from the same inputs are served from the result cache unless
+    --recompute is given.
+    """
+    if not (path / "mus1.db").exists():
+        rich_print(f"[red]✗[/red] No MUS1 project found at {path}")
+        raise typer.Exit(1)
+    if sum(bool(x) for x in (batch, experiment, experiment_type)) != 1:
+        rich_print("[red]✗[/red] Give exactly one of --batch, --experiment or --type")
+        raise typer.Exit(1)
+
+    from rich.console import Console
+    from .batch_analysis import BatchAnalysisExecutor
+    from .plugin_manager_clean import PluginManagerClean
+    from .project_manager_clean import ProjectManagerClean
+
+    pm = ProjectManagerClean(path)
+    try:
+        plugins = PluginManagerClean(pm.db)
+        plugins.discover_entry_points()
+        executor = BatchAnalysisExecutor(plugins, plugin_name, capability, pm.config,
+                                         workers=workers, task_timeout=timeout, use_cache=not recompute)
+        with Console().status("Analysing...") as status:
+            progress = lambda done, total: status.update(f"Analysing: {done}/{total} experiments")
+            if batch:
+                result = executor.run_batch(batch, progress=progress)
+            else:
+                if experiment_type:
+                    experiment = [r.id for r in pm.repos.experiments.list_records(sort_order="asc")
+                                  if r.experiment_type == experiment_type]
+                result = executor.run(experiment, progress=progress)
+    finally:
+        pm.cleanup()
+
+    if output and "results" in result:
+        with open(output, 'w') as f:
+            json.dump(result, f, indent=2, default=str)
+        rich_print(f"[green]✓[/green] Outcomes saved to {output}")
+
+    if not result["success"]:
+        rich_print(f"[red]✗[/red] {result['message']}")
+        raise typer.Exit(1)
+    marker = "[green]✓[/green]" if result["succeeded"] == result["total"] else "[yellow]⚠[/yellow]"
+    rich_print(f"{marker} {result['message']}")
+    if result["cached"]:
+        rich_print(f"[blue]ℹ[/blue] Cache hits: {result['cached']}/{result['total']} "
+                   f"(plugin not run; use --recompute to force)")
+    failures = [r for r in result["results"] if r["status"] != "success"]
+    for row in failures[:10]:
+        rich_print(f"  [red]✗[/red] {row['experiment_id']}: {row['status']} {row['error']}")
+    if len(failures) > 10:
+        rich_print(f"  ... and {len(failures) - 10} more")
+
+
+@project_app.command("invalidate-results")
+def project_invalidate_results(
+    path: Path = typer.Option(Path.cwd(), help="Project directory"),
+    plugin_name: Optional[str] = typer.Option(None, "--plugin", help="Only results of this plugin"),
+    capability: Optional[str] = typer.Option(None, help="Only results of this capability"),
+    batch: Optional[str] = typer.Option(None, help="Only experiments of this batch"),
+    experiment: Optional[List[str]] = typer.Option(None, "--experiment", "-e", help="Experiment ID (repeatable)"),
+):
+    """Forget memoized analysis results so the next run recomputes them (stored results are kept)."""
+    if not (path / "mus1.db").exists():
+        rich_print(f"[red]✗[/red] No MUS1 project found at {path}")
+        raise typer.Exit(1)
+
+    from .plugin_manager_clean import PluginService
+    from .schema import get_database
+
+    service = PluginService(get_database(path / "mus1.db"))
+    experiment_ids = list(experiment) if experiment else None
+    if batch:
+        found = service.repos.batches.get(batch)
+        if found is None:
+            rich_print(f"[red]✗[/red] Batch '{batch}' not found")
+            raise typer.Exit(1)
+        experiment_ids = (experiment_ids or []) + found["experiment_ids"]
+    removed = service.invalidate_cached_results(experiment_ids, plugin_name=plugin_name, capability=capability)
+    rich_print(f"[green]✓[/green] Invalidated {removed} cached result(s)")
 
 # ===========================================
 # DATA MANAGEMENT
@@ -298,6 +710,8 @@ def add_subject(
     project_path: Path = typer.Option(Path.cwd(), help="Project directory"),
 ):
     """Add a subject to the project."""
+    from .metadata import SubjectDTO
+    from .schema import Database
     # Validate input
     if sex not in ["M", "F", "Unknown"]:
         rich_print("[red]✗[/red] Sex must be M, F, or Unknown")
@@ -358,6 +772,8 @@ def add_experiment(
     project_path: Path = typer.Option(Path.cwd(), help="Project directory"),
 ):
     """Add an experiment to the project."""
+    from .metadata import ExperimentDTO
+    from .schema import Database
     from datetime import datetime
 
     # Parse date
@@ -406,6 +822,7 @@ def list_subjects(
     project_path: Path = typer.Option(Path.cwd(), help="Project directory"),
 ):
     """List all subjects in the project."""
+    from .schema import Database
     # Initialize database
     db_path = project_path / "mus1.db"
     if not db_path.exists():
@@ -416,7 +833,7 @@ def list_subjects(
     from .repository import get_repository_factory
     repos = get_repository_factory(db)
 
-    subjects = repos.subjects.find_all()
+    subjects = repos.subjects.list_records()
     if not subjects:
         rich_print("[yellow]⚠[/yellow] No subjects found")
         return
@@ -433,6 +850,7 @@ def list_experiments(
     project_path: Path = typer.Option(Path.cwd(), help="Project directory"),
 ):
     """List all experiments in the project."""
+    from .schema import Database
     # Initialize database
     db_path = project_path / "mus1.db"
     if not db_path.exists():
@@ -443,7 +861,7 @@ def list_experiments(
     from .repository import get_repository_factory
     repos = get_repository_factory(db)
 
-    experiments = repos.experiments.find_all()
+    experiments = repos.experiments.list_records()
     if not experiments:
         rich_print("[yellow]⚠[/yellow] No experiments found")
         return
@@ -453,6 +871,43 @@ def list_experiments(
         status = "✓ Ready" if exp.is_ready_for_analysis else "⏳ Planned"
         rich_print(f"  {exp.id} - {exp.experiment_type} ({exp.subject_id}) [{status}]")
 
+@app.command("search")
+def search(
+    query: str = typer.Argument(..., help="Search terms; prefix-matched, e.g. 'ko', 'genotype:ko', 'type:open notes:rerun'"),
+    project_path: Path = typer.Option(Path.cwd(), help="Project directory"),
+    kind: Optional[str] = typer.Option(None, help="Restrict to 'subject' or 'experiment'"),
+    limit: int = typer.Option(20, help="Maximum number of results"),
+):
+    """Full-text search over subjects and experiments."""
+    from rich.table import Table
+    db_path = project_path / "mus1.db"
+    if not db_path.exists():
+        rich_print("[red]✗[/red] No database found. Run 'mus1 init' first.")
+        return
+    if kind and kind not in ("subject", "experiment"):
+        rich_print(f"[red]✗[/red] Unknown kind '{kind}' (use 'subject' or 'experiment')")
+        raise typer.Exit(1)
+
+    # get_database ensures the search index exists (and backfills it) for older projects
+    from rich.markup import escape
+    from .schema import get_database
+    from .repository import get_repository_factory
+    repos = get_repository_factory(get_database(db_path))
+
+    hits = repos.search.search(query, kinds=[kind] if kind else None, limit=limit)
+    if not hits:
+        rich_print(f"[yellow]⚠[/yellow] No matches for '{query}'")
+        return
+
+    table = Table(title=f"Results for '{query}' ({len(hits)})")
+    table.add_column("Kind")
+    table.add_column("ID")
+    table.add_column("Subject")
+    table.add_column("Match")
+    for hit in hits:
+        table.add_row(hit["kind"], escape(hit["id"]), escape(hit["subject_id"] or ""), escape(hit["snippet"] or ""))
+    rich_print(table)
+
 # ===========================================
 # UTILITY COMMANDS
 # ===========================================
@@ -502,6 +957,8 @@ def setup_mus1_root(
     copy_config: bool = typer.Option(True, help="Copy existing configuration to new location"),
 ):
     """Set up MUS1 root location for configuration and data storage."""
+    from rich.prompt import Confirm
+    from .setup_service import get_setup_service, MUS1RootLocationDTO
     setup_service = get_setup_service()
 
     # Check if already configured
@@ -559,6 +1016,9 @@ def setup_user(
     force: bool = typer.Option(False, "--force", help="Overwrite existing configuration"),
 ):
     """Set up user profile and default configuration."""
+    import platform
+    from rich.prompt import Confirm, Prompt
+    from .setup_service import get_setup_service, UserProfileDTO
     setup_service = get_setup_service()
 
     # Check if user config already exists
@@ -627,6 +1087,7 @@ def setup_shared_storage(
     verify_permissions: bool = typer.Option(True, help="Verify write permissions"),
 ):
     """Configure shared storage directory for MUS1 projects."""
+    from .setup_service import get_setup_service, SharedStorageDTO
     setup_service = get_setup_service()
 
     # Create DTO and run setup
@@ -665,6 +1126,8 @@ def setup_shared_storage(
 @setup_app.command("status")
 def setup_status():
     """Show current MUS1 configuration status."""
+    from rich.table import Table
+    from .setup_service import get_setup_service
     setup_service = get_setup_service()
     status = setup_service.get_setup_status()
 
@@ -720,6 +1183,12 @@ def setup_status():
 @setup_app.command("wizard")
 def setup_wizard():
     """Interactive first-time setup wizard for MUS1."""
+    from rich.panel import Panel
+    from rich.prompt import Confirm, Prompt
+    from rich.table import Table
+    import platform
+    from .setup_service import get_setup_service, MUS1RootLocationDTO
+    from .config_manager import get_config
     rich_print(Panel.fit(
         "[bold blue]Welcome to MUS1 Setup Wizard![/bold blue]\n\n"
         "This wizard will help you configure MUS1 for your research workflow.\n"
@@ -980,6 +1449,7 @@ def setup_wizard():
 @setup_app.command("migrate")
 def setup_migrate():
     """Migrate legacy configurations to simplified architecture."""
+    from .setup_service import get_setup_service
     setup_service = get_setup_service()
 
     rich_print("[blue]ℹ[/blue] Checking for legacy configurations to migrate...")
@@ -1022,6 +1492,10 @@ def create_lab(
     pi_name: Optional[str] = typer.Option(None, help="Principal Investigator name"),
 ):
     """Create a new lab using the setup service."""
+    from rich.prompt import Prompt
+    from .setup_service import get_setup_service
+    from .metadata import LabDTO
+    from .config_manager import get_config
     setup_service = get_setup_service()
 
     # Get current user ID for lab creator
@@ -1071,6 +1545,8 @@ def create_lab(
 @lab_app.command("list")
 def list_labs():
     """List all configured labs."""
+    from rich.table import Table
+    from .setup_service import get_setup_service
     setup_service = get_setup_service()
     labs = setup_service.get_labs()
 
@@ -1098,6 +1574,56 @@ def list_labs():
     rich_print(table)
 
 
+@lab_app.command("query")
+def lab_query(
+    lab_id: Optional[str] = typer.Option(None, "--lab-id", help="Lab to query (default: all labs)"),
+    group_by: str = typer.Option("experiment_type", help="project, experiment_type, experiment_subtype, processing_stage, genotype or sex"),
+    experiment_type: Optional[str] = typer.Option(None, "--type", help="Only experiments of this type"),
+    genotype: Optional[str] = typer.Option(None, help="Only subjects with this genotype"),
+    stage: Optional[str] = typer.Option(None, help="Only experiments in this processing stage"),
+    list_experiments: bool = typer.Option(False, "--list", help="List matching experiments instead of aggregating"),
+    limit: int = typer.Option(100, help="Maximum experiments to list with --list"),
+    discovered: bool = typer.Option(True, help="Include locally discovered projects"),
+):
+    """Query experiments across all projects of a lab in one call."""
+    from rich.table import Table
+    from .lab_query_service import LabQueryService, lab_project_paths, GROUP_BY_COLUMNS
+    from .utils.formatting import format_bytes
+
+    if group_by not in GROUP_BY_COLUMNS:
+        rich_print(f"[red]✗[/red] Unknown --group-by '{group_by}' (use {', '.join(GROUP_BY_COLUMNS)})")
+        raise typer.Exit(1)
+
+    service = LabQueryService(lab_project_paths(lab_id, include_discovered=discovered))
+    if not service.projects:
+        rich_print("[yellow]⚠[/yellow] No projects found")
+        return
+
+    if list_experiments:
+        rows = service.find_experiments(experiment_type=experiment_type, genotype=genotype,
+                                        processing_stage=stage, limit=limit)
+        table = Table(title=f"Experiments across {len(service.projects)} projects")
+        for column in ("Project", "Experiment", "Subject", "Type", "Recorded", "Stage", "Genotype", "Videos"):
+            table.add_column(column)
+        for row in rows:
+            table.add_row(row["project"], row["experiment_id"], row["subject_id"], row["experiment_type"],
+                          (row["date_recorded"] or "")[:10], row["processing_stage"] or "",
+                          row["genotype"] or "", str(row["videos"]))
+    else:
+        result = service.summarize(group_by=group_by, experiment_type=experiment_type,
+                                   genotype=genotype, processing_stage=stage)
+        table = Table(title=f"Experiments by {group_by} across {result['projects_queried']} projects")
+        for column in (group_by, "Projects", "Subjects", "Experiments", "Videos", "Video size"):
+            table.add_column(column, justify="left" if column == group_by else "right")
+        for row in result["rows"]:
+            table.add_row(str(row["group"] if row["group"] is not None else "—"), str(row["projects"]),
+                          str(row["subjects"]), str(row["experiments"]), str(row["videos"]),
+                          format_bytes(row["video_bytes"]))
+    rich_print(table)
+    for label, error in service.errors.items():
+        rich_print(f"[yellow]⚠[/yellow] Skipped {label}: {error}")
+
+
 @lab_app.command("add-colony")
 def add_colony_to_lab(
     lab_id: str = typer.Argument(..., help="Lab ID to add colony to"),
@@ -1107,6 +1633,9 @@ def add_colony_to_lab(
     background: Optional[str] = typer.Option(None, help="Background strain"),
 ):
     """Add a colony to an existing lab."""
+    from rich.prompt import Prompt
+    from .setup_service import get_setup_service
+    from .metadata import ColonyDTO
     setup_service = get_setup_service()
 
     # Interactive prompts for missing info
@@ -1144,6 +1673,64 @@ def add_colony_to_lab(
         raise typer.Exit(1)
 
 
+# ===========================================
+# DAEMON COMMANDS
+# ===========================================
+
+@daemon_app.command("start")
+def daemon_start(
+    idle_timeout: float = typer.Option(900.0, "--idle-timeout", help="Exit after this many idle seconds"),
+    foreground: bool = typer.Option(False, "--foreground", help="Serve in this process instead of in the background"),
+):
+    """Start the daemon; later mus1 commands run in it until it goes idle."""
+    from .daemon import Daemon, start_daemon
+
+    if foreground:
+        rich_print(f"[blue]ℹ[/blue] Serving mus1 commands (idle timeout {idle_timeout:.0f}s); Ctrl+C to stop")
+        try:
+            Daemon(idle_timeout=idle_timeout).serve()
+        except RuntimeError as e:
+            rich_print(f"[red]✗[/red] {e}")
+            raise typer.Exit(1)
+        except KeyboardInterrupt:
+            pass
+        return
+
+    result = start_daemon(idle_timeout=idle_timeout)
+    if not result["success"]:
+        rich_print(f"[red]✗[/red] {result['message']}")
+        raise typer.Exit(1)
+    rich_print(f"[green]✓[/green] {result['message']}")
+    rich_print(f"[blue]ℹ[/blue] Socket: {result['socket']}")
+
+
+@daemon_app.command("stop")
+def daemon_stop():
+    """Stop the daemon for the current configuration root."""
+    from .daemon import stop_daemon
+
+    result = stop_daemon()
+    if not result["success"]:
+        rich_print(f"[yellow]⚠[/yellow] {result['message']}")
+        return
+    rich_print(f"[green]✓[/green] {result['message']}")
+
+
+@daemon_app.command("status")
+def daemon_status_cmd():
+    """Show whether a daemon is running and how busy it has been."""
+    from .daemon import daemon_status, socket_path
+
+    status = daemon_status()
+    if status is None:
+        rich_print(f"[yellow]⚠[/yellow] No daemon running (socket {socket_path()})")
+        return
+    rich_print(f"[green]✓[/green] Daemon running (pid {status['pid']})")
+    rich_print(f"  Socket: {status['socket']}")
+    rich_print(f"  Requests served: {status['requests']}")
+    rich_print(f"  Idle for {status['idle_for']:.0f}s of {status['idle_timeout']:.0f}s timeout")
+
+
 # ===========================================
 # DEMO COMMANDS
 # ===========================================
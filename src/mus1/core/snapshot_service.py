@@ -0,0 +1,211 @@
+"""
+Online snapshots of project databases.
+
+Snapshots are taken with SQLite's online backup API, copying a few hundred
+pages per step so other connections keep reading and writing in between
+(a write from another connection restarts the copy; after a few restarts the
+remaining copy is done in one step, which holds a read lock only briefly).
+
+Layout inside a project directory:
+    .mus1_snapshots/<YYYYmmddTHHMMSSffffff>-<reason>/mus1.db
+                                                    /project.json
+                                                    /project.<section>.json  (if any)
+                                                    /snapshot.json   reason, time, source stats
+
+Snapshots are written to a hidden staging directory and renamed into place, so
+a listed snapshot is always complete. Retention keeps the newest N.
+"""
+
+import json
+import logging
+import re
+import shutil
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from .config_store import config_files
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_DIRNAME = ".mus1_snapshots"
+DEFAULT_RETENTION = 10
+PAGES_PER_STEP = 256  # ~1 MiB per step at the default 4 KiB page size
+MAX_BACKUP_RESTARTS = 3
+
+_TIMESTAMP_FORMAT = "%Y%m%dT%H%M%S%f"
+
+
+class SnapshotManager:
+    """Create, list, prune and restore snapshots of one project database."""
+
+    def __init__(self, db_path: Path, config_path: Optional[Path] = None,
+                 snapshot_dir: Optional[Path] = None, retention: int = DEFAULT_RETENTION,
+                 pages_per_step: int = PAGES_PER_STEP):
+        self.db_path = Path(db_path)
+        self.config_path = Path(config_path) if config_path else None
+        self.snapshot_dir = Path(snapshot_dir) if snapshot_dir else self.db_path.parent / SNAPSHOT_DIRNAME
+        self.retention = retention
+        self.pages_per_step = pages_per_step
+
+    # ---------- create ----------
+    def create(self, reason: str = "manual", progress: Optional[Callable[[int, int], None]] = None,
+               skip_if_unchanged: bool = False, apply_retention: bool = True) -> Optional[Dict[str, Any]]:
+        """Take a snapshot and apply retention. Returns its info dict.
+
+        With skip_if_unchanged, returns None when the database file has not
+        changed since the newest snapshot (used for automatic snapshots).
+        """
+        if not self.db_path.exists():
+            raise FileNotFoundError(f"Database not found: {self.db_path}")
+
+        source_stat = self._source_stat()
+        if skip_if_unchanged:
+            latest = next(iter(self.list()), None)
+            if latest and latest.get("source") == source_stat:
+                logger.debug(f"Skipping {reason} snapshot; database unchanged since {latest['id']}")
+                return None
+
+        created_at = datetime.now()
+        snapshot_id = f"{created_at.strftime(_TIMESTAMP_FORMAT)}-{_safe_reason(reason)}"
+        staging = self.snapshot_dir / f".tmp-{snapshot_id}"
+        staging.mkdir(parents=True)
+        try:
+            self._backup(self.db_path, staging / self.db_path.name, progress)
+            if self.config_path:
+                for path in config_files(self.config_path):
+                    shutil.copy2(path, staging / path.name)
+            info = {
+                "id": snapshot_id,
+                "reason": reason,
+                "created_at": created_at.isoformat(),
+                "source": source_stat,
+            }
+            with open(staging / "snapshot.json", "w") as f:
+                json.dump(info, f, indent=2)
+            final = self.snapshot_dir / snapshot_id
+            staging.rename(final)
+        except Exception:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+
+        logger.info(f"Created snapshot {snapshot_id} of {self.db_path}")
+        if apply_retention:
+            self.prune()
+        return self._info(final)
+
+    @staticmethod
+    def _restore_file(source: Path, target: Path) -> None:
+        tmp = target.with_suffix(".restore.tmp")
+        shutil.copy2(source, tmp)
+        tmp.replace(target)
+
+    def _backup(self, source: Path, target: Path, progress: Optional[Callable[[int, int], None]]) -> None:
+        online_backup(source, target, pages_per_step=self.pages_per_step, progress=progress)
+
+    def _source_stat(self) -> Dict[str, int]:
+        stat = self.db_path.stat()
+        return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+    # ---------- list / prune ----------
+    def list(self) -> List[Dict[str, Any]]:
+        """Return snapshots, newest first."""
+        if not self.snapshot_dir.exists():
+            return []
+        snapshots = [
+            self._info(path) for path in self.snapshot_dir.iterdir()
+            if path.is_dir() and not path.name.startswith(".") and (path / self.db_path.name).exists()
+        ]
+        return sorted(snapshots, key=lambda s: s["id"], reverse=True)
+
+    def _info(self, path: Path) -> Dict[str, Any]:
+        try:
+            with open(path / "snapshot.json") as f:
+                info = json.load(f)
+        except (OSError, ValueError):
+            info = {"id": path.name, "reason": path.name.partition("-")[2]}
+        info["path"] = str(path)
+        info["size_bytes"] = (path / self.db_path.name).stat().st_size
+        return info
+
+    def prune(self, retention: Optional[int] = None) -> List[str]:
+        """Delete all but the newest `retention` snapshots. Returns removed ids."""
+        keep = self.retention if retention is None else retention
+        removed = []
+        for info in self.list()[max(keep, 0):]:
+            shutil.rmtree(info["path"], ignore_errors=True)
+            removed.append(info["id"])
+        if removed:
+            logger.info(f"Pruned {len(removed)} old snapshots from {self.snapshot_dir}")
+        return removed
+
+    # ---------- restore ----------
+    def restore(self, snapshot_id: str, progress: Optional[Callable[[int, int], None]] = None) -> Dict[str, Any]:
+        """Restore the database (and project.json) from a snapshot.
+
+        The current state is snapshotted first ("pre-restore"). The database
+        is restored in place through the backup API, so open connections stay
+        valid and see the restored content on their next read.
+        """
+        path = self.snapshot_dir / snapshot_id
+        snapshot_db = path / self.db_path.name
+        if not snapshot_db.exists():
+            raise FileNotFoundError(f"Snapshot not found: {snapshot_id}")
+
+        # Retention runs on the next snapshot so it cannot remove the one being restored
+        safety = self.create(reason="pre-restore", apply_retention=False)
+        self._backup(snapshot_db, self.db_path, progress)
+
+        snapshot_config = path / self.config_path.name if self.config_path else None
+        if snapshot_config and snapshot_config.exists():
+            # Section files first, so project.json never names a section that is missing
+            current = {p.name for p in config_files(self.config_path)} - {self.config_path.name}
+            restored = set()
+            for source in config_files(snapshot_config)[1:]:
+                self._restore_file(source, self.config_path.with_name(source.name))
+                restored.add(source.name)
+            self._restore_file(snapshot_config, self.config_path)
+            for name in current - restored:
+                self.config_path.with_name(name).unlink(missing_ok=True)
+
+        logger.info(f"Restored {self.db_path} from snapshot {snapshot_id}")
+        return {"restored": snapshot_id, "pre_restore_snapshot": safety["id"] if safety else None}
+
+
+class _BackupRestarted(Exception):
+    pass
+
+
+def online_backup(source: Path, target: Path, pages_per_step: int = PAGES_PER_STEP,
+                  progress: Optional[Callable[[int, int], None]] = None) -> None:
+    """Copy the SQLite database at source into target with the online backup API."""
+    last_remaining = [None]
+    restarts = [0]
+
+    def _progress(status, remaining, total):
+        # A write from another connection restarts the copy; under a steady
+        # stream of writes stepping would never finish, so give up stepping
+        if last_remaining[0] is not None and remaining > last_remaining[0]:
+            restarts[0] += 1
+            if restarts[0] > MAX_BACKUP_RESTARTS:
+                raise _BackupRestarted()
+        last_remaining[0] = remaining
+        if progress:
+            progress(total - remaining, total)
+
+    src = sqlite3.connect(str(source))
+    dst = sqlite3.connect(str(target))
+    try:
+        try:
+            src.backup(dst, pages=pages_per_step, progress=_progress)
+        except _BackupRestarted:
+            logger.info(f"Backup of {source} kept restarting under concurrent writes; copying in one step")
+            src.backup(dst, pages=-1)
+    finally:
+        dst.close()
+        src.close()
+
+
+def _safe_reason(reason: str) -> str:
+    return re.sub(r"[^A-Za-z0-9_-]+", "_", reason).strip("_") or "snapshot"
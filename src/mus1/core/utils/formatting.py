@@ -0,0 +1,11 @@
+"""Small display-formatting helpers shared by the CLI and GUI."""
+
+
+def format_bytes(num_bytes: int) -> str:
+    """Format a byte count with a binary unit suffix (e.g. '1.5 GiB')."""
+    size = float(num_bytes or 0)
+    for unit in ("B", "KiB", "MiB", "GiB", "TiB"):
+        if abs(size) < 1024 or unit == "TiB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} TiB"
@@ -0,0 +1,237 @@
+"""
+Automatic matching of scanned videos to experiments.
+
+Experiments are indexed once in memory by (subject, date, type) and
+(subject, date). Each video's path is parsed with configurable templates
+(and, failing those, a token scan for known subjects, types and dates), so
+matching costs a few dict lookups per video instead of a comparison against
+every experiment.
+
+Templates describe the end of a video path, without extension:
+
+    "{type}-{subject}-{date}"          OF-974-2023-07-12.mp4
+    "{subject}/{date}/{type}{*}"       974/2023-07-12/OF_trial1.mp4
+
+Placeholders: {subject}, {type}, {date} (YYYY-MM-DD, YYYY_MM_DD or YYYYMMDD)
+and {*} (anything within one path component). Matching is case-insensitive.
+"""
+
+import re
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Pattern, Sequence, Tuple
+
+DEFAULT_TEMPLATES = (
+    "{type}-{subject}-{date}{*}",
+    "{type}_{subject}_{date}{*}",
+    "{subject}_{type}_{date}{*}",
+    "{subject}-{type}-{date}{*}",
+    "{date}_{subject}_{type}{*}",
+    "{subject}/{date}/{type}{*}",
+    "{date}/{subject}_{type}{*}",
+)
+
+# Confidence of a unique candidate, by how it was found
+CONFIDENCE_TEMPLATE = 1.0
+CONFIDENCE_TOKENS = 0.9
+CONFIDENCE_RECORDED_TIME = 0.85   # date taken from the container recorded_time
+CONFIDENCE_NO_TYPE = 0.75         # subject and date only
+CONFIDENCE_ADJACENT_DAY = 0.6     # recorded a day off (e.g. sessions past midnight)
+RECORDED_TIME_CONFLICT_PENALTY = 0.2
+
+_PLACEHOLDERS = {
+    "subject": r"(?P<subject>[A-Za-z0-9]+)",
+    "type": r"(?P<type>[A-Za-z][A-Za-z0-9_]*)",
+    "date": r"(?P<date>\d{4}[-_.]?\d{2}[-_.]?\d{2})",
+    "*": r"[^/]*",
+}
+_DATE_TOKEN = re.compile(r"(?<!\d)(\d{4})[-_.]?(\d{2})[-_.]?(\d{2})(?!\d)")
+_TOKEN_SPLIT = re.compile(r"[^A-Za-z0-9]+")
+_DIGIT_RUN = re.compile(r"\d+")
+
+
+def normalize_subject(value: str) -> str:
+    """Canonical subject key: lower case, leading zeros dropped from numeric tags (056 -> 56)."""
+    value = str(value).strip().lower()
+    if value.isdigit():
+        return value.lstrip("0") or "0"
+    return value
+
+
+@lru_cache(maxsize=4096)
+def normalize_type(value: str) -> str:
+    """Canonical experiment type key: upper case alphanumerics (NOR_FAM -> NORFAM)."""
+    return re.sub(r"[^A-Za-z0-9]", "", str(value)).upper()
+
+
+def parse_date(value: str) -> Optional[date]:
+    match = _DATE_TOKEN.search(value)
+    if not match:
+        return None
+    try:
+        return date(int(match.group(1)), int(match.group(2)), int(match.group(3)))
+    except ValueError:
+        return None
+
+
+def compile_template(template: str) -> Pattern:
+    """Compile a path template into a regex for the matching number of trailing path components."""
+    parts = re.split(r"(\{[^}]*\})", template)
+    regex = []
+    for part in parts:
+        if part.startswith("{") and part.endswith("}"):
+            name = part[1:-1]
+            if name not in _PLACEHOLDERS:
+                raise ValueError(f"Unknown template placeholder {part} in '{template}'")
+            regex.append(_PLACEHOLDERS[name])
+        else:
+            regex.append(re.escape(part))
+    return re.compile("".join(regex) + r"$", re.IGNORECASE)
+
+
+def _stem(path) -> str:
+    # Path without extension, "/"-separated (cheaper than PurePath for 100k+ paths)
+    text = str(path).replace("\\", "/")
+    head, sep, name = text.rpartition("/")
+    dot = name.rfind(".")
+    if dot > 0:
+        name = name[:dot]
+    return head + sep + name
+
+
+class VideoMatcher:
+    """Propose experiments for videos using in-memory indexes of the experiments."""
+
+    def __init__(self, experiments: Iterable[Any], templates: Optional[Sequence[str]] = None):
+        # experiments: objects with id, subject_id, experiment_type and date_recorded
+        self.templates = list(templates or DEFAULT_TEMPLATES)
+        # (pattern, number of trailing path components it spans)
+        self._patterns = [(compile_template(t), t.count("/") + 1) for t in self.templates]
+        self._by_key: Dict[Tuple[str, date, str], List[str]] = defaultdict(list)
+        self._by_subject_date: Dict[Tuple[str, date], List[str]] = defaultdict(list)
+        self._subjects: set = set()
+        self._types: set = set()
+        for exp in experiments:
+            recorded = exp.date_recorded
+            if recorded is None:
+                continue
+            day = recorded.date() if isinstance(recorded, datetime) else recorded
+            subject = normalize_subject(exp.subject_id)
+            exp_type = normalize_type(exp.experiment_type)
+            self._by_key[(subject, day, exp_type)].append(exp.id)
+            self._by_subject_date[(subject, day)].append(exp.id)
+            self._subjects.add(subject)
+            self._types.add(exp_type)
+
+    @property
+    def experiment_count(self) -> int:
+        return sum(len(ids) for ids in self._by_subject_date.values())
+
+    # ---------- parsing ----------
+    def parse(self, path: Path) -> Optional[Dict[str, Any]]:
+        """Extract {subject, type, date, source} from a video path, or None."""
+        stem = _stem(path)
+        components = stem.split("/")
+        for pattern, depth in self._patterns:
+            if depth > len(components):
+                continue
+            match = pattern.match("/".join(components[-depth:]))
+            if not match:
+                continue
+            fields = match.groupdict()
+            subject = normalize_subject(fields["subject"]) if fields.get("subject") else None
+            if subject is None or subject not in self._subjects:
+                continue
+            return {
+                "subject": subject,
+                "type": self._known_type(fields["type"]) if fields.get("type") else None,
+                "date": parse_date(fields["date"]) if fields.get("date") else None,
+                "source": "template",
+            }
+        return self._parse_tokens(stem)
+
+    def _parse_tokens(self, stem: str) -> Optional[Dict[str, Any]]:
+        # Fallback: the file name first, then parent directories, for known subjects/types and a date
+        components = stem.split("/")[::-1][:3]
+        subject = exp_type = day = None
+        for component in components:
+            day = day or parse_date(component)
+            # Drop dates first so their digits are not read as subject tags
+            for token in _TOKEN_SPLIT.split(_DATE_TOKEN.sub(" ", component)):
+                if not token:
+                    continue
+                if subject is None:
+                    subject = self._known_subject(token)
+                    if subject is not None:
+                        continue
+                if exp_type is None and normalize_type(token) in self._types:
+                    exp_type = normalize_type(token)
+        if subject is None:
+            return None
+        return {"subject": subject, "type": exp_type, "date": day, "source": "tokens"}
+
+    def _known_type(self, raw: str) -> Optional[str]:
+        # Longest known prefix by "_" parts: "NOR_FAM" -> NORFAM, "OF_trial1" -> OF
+        parts = raw.split("_")
+        for n in range(len(parts), 0, -1):
+            exp_type = normalize_type("".join(parts[:n]))
+            if exp_type in self._types:
+                return exp_type
+        return None
+
+    def _known_subject(self, token: str) -> Optional[str]:
+        # Whole token, else the digits of tagged tokens such as "mouse56" or "169f"
+        for candidate in [token] + _DIGIT_RUN.findall(token):
+            subject = normalize_subject(candidate)
+            if subject in self._subjects:
+                return subject
+        return None
+
+    # ---------- matching ----------
+    def match(self, path: Path, recorded_time: Optional[datetime] = None) -> Optional[Dict[str, Any]]:
+        """Return {experiment_id, confidence, reason, candidates} for one video, or None."""
+        parsed = self.parse(path)
+        if parsed is None:
+            return None
+        base = CONFIDENCE_TEMPLATE if parsed["source"] == "template" else CONFIDENCE_TOKENS
+        recorded_day = recorded_time.date() if recorded_time else None
+        day, penalty = parsed["date"], 0.0
+        if day is None:
+            if recorded_day is None:
+                return None
+            day, base = recorded_day, min(base, CONFIDENCE_RECORDED_TIME)
+        elif recorded_day is not None and abs((recorded_day - day).days) > 1:
+            penalty = RECORDED_TIME_CONFLICT_PENALTY
+
+        subject, exp_type = parsed["subject"], parsed["type"]
+        lookups = []
+        if exp_type:
+            lookups.append((self._by_key.get((subject, day, exp_type)), base, "subject+date+type"))
+        else:
+            lookups.append((self._by_subject_date.get((subject, day)), min(base, CONFIDENCE_NO_TYPE), "subject+date"))
+        for offset in (-1, 1):
+            near = day + timedelta(days=offset)
+            candidates = (self._by_key.get((subject, near, exp_type)) if exp_type
+                          else self._by_subject_date.get((subject, near)))
+            lookups.append((candidates, CONFIDENCE_ADJACENT_DAY, "adjacent day"))
+
+        for candidates, confidence, reason in lookups:
+            if candidates:
+                return {
+                    "experiment_id": candidates[0] if len(candidates) == 1 else None,
+                    "confidence": round(max(confidence / len(candidates) - penalty, 0.0), 3),
+                    "reason": f"{parsed['source']}: {reason}",
+                    "candidates": list(candidates),
+                }
+        return None
+
+    def match_all(self, videos: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Match video rows ({path, recorded_time, ...}); returns one proposal per matched video."""
+        proposals = []
+        for video in videos:
+            result = self.match(video["path"], video.get("recorded_time"))
+            if result:
+                proposals.append({**video, **result})
+        return proposals
@@ -16,7 +16,7 @@ import os
 import json
 from pathlib import Path
 from ..core.logging_bus import LoggingEventBus
-from typing import List
+from typing import Dict, List
 from typing import TYPE_CHECKING
 if TYPE_CHECKING:
     from ..plugins.base_plugin import BasePlugin
@@ -282,6 +282,18 @@ class ExperimentView(BaseView):
         # Add title
         view_exp_layout.addWidget(QLabel("Experiments"))
         
+        # Full-text search box (debounced) above the experiment list
+        self.experiment_search_edit = QLineEdit()
+        self.experiment_search_edit.setProperty("class", "mus1-text-input")
+        self.experiment_search_edit.setPlaceholderText("Search experiments (e.g. E-01, subject:S-01, type:openfield, notes:rerun)")
+        self.experiment_search_edit.setClearButtonEnabled(True)
+        view_exp_layout.addWidget(self.experiment_search_edit)
+        self._experiment_search_timer = QTimer(self)
+        self._experiment_search_timer.setSingleShot(True)
+        self._experiment_search_timer.setInterval(250)
+        self._experiment_search_timer.timeout.connect(self.refresh_experiment_list_display)
+        self.experiment_search_edit.textChanged.connect(lambda _text: self._experiment_search_timer.start())
+
         # Create experiment list
         self.experimentListWidget = QListWidget()
         view_exp_layout.addWidget(self.experimentListWidget)
@@ -293,6 +305,11 @@ class ExperimentView(BaseView):
         self.link_video_button.setProperty("class", "mus1-secondary-button")
         self.link_video_button.clicked.connect(self.handle_link_video)
         actions_row.addWidget(self.link_video_button)
+        self.auto_match_button = QPushButton("Auto-match Videos…")
+        self.auto_match_button.setObjectName("autoMatchVideosButton")
+        self.auto_match_button.setProperty("class", "mus1-secondary-button")
+        self.auto_match_button.clicked.connect(self.handle_auto_match_videos)
+        actions_row.addWidget(self.auto_match_button)
 
         # --- Recording Info Group ---
         info_group, info_layout = self.create_form_section("Recording Info", view_exp_layout)
@@ -429,15 +446,10 @@ class ExperimentView(BaseView):
              try:
                  experiments = self.experiment_service.get_experiments_for_display() if self.experiment_service else []
                  columns = ["Select", "ID", "Type", "Subject", "Date", "Stage", "Recordings"]
+                 video_counts = self._video_counts_by_experiment()
                  grid_data = []
                  for exp in experiments:
-                     recordings = 0
-                     try:
-                         if hasattr(self.window(), 'project_manager') and self.window().project_manager:
-                             recordings = len(self.window().project_manager.get_videos_for_experiment(exp.id))
-                     except Exception as e:
-                         self.log_bus.log(f"Error counting recordings for experiment {exp.id}: {e}", "warning", "ExperimentView")
-                         recordings = 0
+                     recordings = video_counts.get(exp.id, 0)
                      grid_data.append({
                          "Select": False,
                          "ID": exp.id,
@@ -715,11 +727,19 @@ class ExperimentView(BaseView):
         experiments = self.experiment_service.get_experiments_for_display()
         self.experimentListWidget.clear()
 
+        query = self.experiment_search_edit.text().strip() if hasattr(self, 'experiment_search_edit') else ""
+        if query:
+            matching_ids = set(self.experiment_service.search_experiment_ids(query))
+            experiments = [exp for exp in experiments if exp.id in matching_ids]
+            if not experiments:
+                self.experimentListWidget.addItem(f"No experiments match '{query}'.")
+                return
+
         if experiments:
+            video_counts = self._video_counts_by_experiment()
             for exp in experiments:
                 # Check for associated videos using proper associations
-                associated_videos = self._find_associated_videos(exp.id)
-                has_video = len(associated_videos) > 0
+                has_video = video_counts.get(exp.id, 0) > 0
 
                 video_marker = " 📹" if has_video else ""
 
@@ -774,10 +794,10 @@ class ExperimentView(BaseView):
             if experiments:
                 # Convert to format expected by MetadataGridDisplay
                 grid_data = []
+                video_counts = self._video_counts_by_experiment()
                 for exp in experiments:
                     # Check for associated videos
-                    associated_videos = self._find_associated_videos(exp.id)
-                    has_video = len(associated_videos) > 0
+                    has_video = video_counts.get(exp.id, 0) > 0
                     video_status = "Yes" if has_video else "No"
 
                     grid_data.append({
@@ -1300,6 +1320,48 @@ class ExperimentView(BaseView):
         # Refresh info
         self._update_recording_info(exp_id)
 
+    def handle_auto_match_videos(self):
+        """Propose experiments for unlinked videos and link the confident ones after confirmation."""
+        project_manager = self.window().project_manager
+        if not project_manager:
+            self.log_bus.log("Project Manager not initialized.", "error", "ExperimentView")
+            return
+
+        try:
+            result = project_manager.match_unlinked_videos()
+        except Exception as e:
+            self.log_bus.log(f"Auto-matching failed: {e}", "error", "ExperimentView")
+            return
+
+        min_confidence = 0.9
+        confident = [p for p in result["proposals"] if p["experiment_id"] and p["confidence"] >= min_confidence]
+        self.log_bus.log(result["message"], "info", "ExperimentView")
+        if not confident:
+            QMessageBox.information(self, "Auto-match Videos",
+                                    f"{result['message']}.\nNo unambiguous matches with confidence ≥ {min_confidence:.0%}.")
+            return
+
+        preview = "\n".join(f"{Path(p['path']).name} → {p['experiment_id']} ({p['confidence']:.0%})"
+                            for p in confident[:10])
+        if len(confident) > 10:
+            preview += f"\n… and {len(confident) - 10} more"
+        answer = QMessageBox.question(
+            self, "Auto-match Videos",
+            f"{result['message']}.\n\nLink {len(confident)} confident match(es)?\n\n{preview}",
+        )
+        if answer != QMessageBox.StandardButton.Yes:
+            return
+
+        try:
+            applied = project_manager.match_unlinked_videos(apply=True, min_confidence=min_confidence)
+            self.log_bus.log(applied["message"], "success", "ExperimentView")
+        except Exception as e:
+            self.log_bus.log(f"Linking matched videos failed: {e}", "error", "ExperimentView")
+
+        current_item = self.experimentListWidget.currentItem()
+        if current_item is not None:
+            self._update_recording_info(current_item.data(Qt.ItemDataRole.UserRole) or current_item.text().split(" ")[0])
+
     # ------------------------------------------------------------------
     # Recording info UI helpers
     # ------------------------------------------------------------------
@@ -1335,6 +1397,14 @@ class ExperimentView(BaseView):
             self.log_bus.log(f"Error finding associated videos for experiment {exp_id}: {e}", "info", "ExperimentView")
             return []
 
+    def _video_counts_by_experiment(self) -> Dict[str, int]:
+        """Return linked video counts for all experiments using one aggregate query."""
+        try:
+            return self.window().project_manager.video_counts_by_experiment()
+        except Exception as e:
+            self.log_bus.log(f"Error counting videos for experiments: {e}", "warning", "ExperimentView")
+            return {}
+
     def _update_recording_info(self, exp_id: str):
         """Populate the recording info panel for the given experiment ID."""
         self._clear_recording_info()
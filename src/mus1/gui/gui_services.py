@@ -129,7 +129,7 @@ class GUISubjectService(BaseGUIService):
     @gui_service_error_handler("loading subjects", [])
     def get_subjects_for_display(self) -> List[SubjectDisplayDTO]:
         """Get all subjects formatted for GUI display."""
-        subjects = self.project_manager.list_subjects()
+        subjects = self.project_manager.list_subject_records()
 
         # Build a lookup of colony names for efficient lookup
         colonies = self.project_manager.list_colonies()
@@ -137,6 +137,11 @@ class GUISubjectService(BaseGUIService):
 
         return [SubjectDisplayDTO(subject, colony_lookup.get(subject.colony_id)) for subject in subjects]
 
+    @gui_service_error_handler("searching subjects", [])
+    def search_subject_ids(self, query: str) -> List[str]:
+        """Return all subject IDs matching a full-text query, best matches first."""
+        return [hit['id'] for hit in self.project_manager.search(query, kinds=["subject"], limit=None)]
+
     def add_subject(self, subject_id: str, sex: str, genotype: str = None,
                    birth_date: datetime = None, colony_id: str = None,
                    notes: str = "", designation: str = "experimental") -> Optional[Subject]:
@@ -502,13 +507,18 @@ class GUIExperimentService(BaseGUIService):
     @gui_service_error_handler("loading experiments", [])
     def get_experiments_for_display(self) -> List[ExperimentDisplayDTO]:
         """Get all experiments formatted for GUI display."""
-        experiments = self.project_manager.list_experiments()
+        experiments = self.project_manager.list_experiment_records()
         return [ExperimentDisplayDTO(exp) for exp in experiments]
 
+    @gui_service_error_handler("searching experiments", [])
+    def search_experiment_ids(self, query: str) -> List[str]:
+        """Return all experiment IDs matching a full-text query, best matches first."""
+        return [hit['id'] for hit in self.project_manager.search(query, kinds=["experiment"], limit=None)]
+
     @gui_service_error_handler("loading subjects", [])
     def get_subjects_for_display(self) -> List[SubjectDisplayDTO]:
         """Get all subjects formatted for GUI display (needed for experiment subject selection)."""
-        subjects = self.project_manager.list_subjects()
+        subjects = self.project_manager.list_subject_records()
         return [SubjectDisplayDTO(sub) for sub in subjects]
 
     def get_colonies_for_display(self, lab_id: Optional[str] = None) -> List[Dict[str, str]]:
@@ -616,16 +626,14 @@ class GUIProjectService(BaseGUIService):
     def get_project_info(self) -> Dict[str, Any]:
         """Get project information for display."""
         def _get_info():
-            subjects = self.project_manager.list_subjects()
-            experiments = self.project_manager.list_experiments()
-            videos = self.project_manager.list_videos()
+            stats = self.project_manager.get_stats()
 
             return {
                 "name": self.project_manager.config.name,
                 "path": str(self.project_manager.project_path),
-                "subject_count": len(subjects),
-                "experiment_count": len(experiments),
-                "video_count": len(videos),
+                "subject_count": stats["subjects"],
+                "experiment_count": stats["experiments"],
+                "video_count": stats["videos"],
                 "shared_root": str(self.project_manager.config.shared_root) if self.project_manager.config.shared_root else None
             }
 
@@ -818,6 +826,17 @@ class LabService(BaseGUIService):
 
         return self.safe_execute(f"getting lab projects for {lab_id}", _get_lab_projects, [])
 
+    def summarize_lab_projects(self, lab_id: str, group_by: str = "experiment_type",
+                               experiment_type: Optional[str] = None) -> Dict[str, Any]:
+        """Aggregate experiments across all projects registered with a lab."""
+        def _summarize():
+            from ..core.lab_query_service import LabQueryService, lab_project_paths
+            service = LabQueryService(lab_project_paths(lab_id))
+            return service.summarize(group_by=group_by, experiment_type=experiment_type or None)
+
+        return self.safe_execute(f"querying lab projects for {lab_id}", _summarize,
+                                 {"rows": [], "projects_queried": 0, "errors": {}})
+
     def add_lab_project(self, lab_id: str, project_name: str, project_path: str) -> bool:
         """Add a project to a lab."""
         if not self.setup_service:
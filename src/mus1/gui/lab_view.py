@@ -30,13 +30,61 @@ class LabView(BaseView):
         self.log_bus = LoggingEventBus.get_instance()
 
         self.lab_service = None
-        self.setup_navigation(["Colonies", "Lab Library", "Shared Projects", "Lab Members", "Lab Settings"])
+        self.setup_navigation(["Colonies", "Lab Library", "Shared Projects", "Lab Queries", "Lab Members", "Lab Settings"])
         self.setup_colonies_page()
         self.setup_lab_library_page()
         self.setup_shared_projects_page()
+        self.setup_lab_queries_page()
         self.setup_lab_members_page()
         self.setup_lab_settings_page()
         # Do not change pages here; lifecycle handles activation
+        self._watch_config_changes()
+
+    # --- Config subscriptions ---
+    def _watch_config_changes(self):
+        """Refresh what this view shows from config when lab storage roots or the user id change."""
+        from .qt import QTimer
+        from ..core.config_manager import get_config_manager
+        config_manager = get_config_manager()
+        # Deferred to the event loop, as the change may come from a worker thread
+        self._config_unsubscribes = [
+            config_manager.subscribe(
+                "lab.storage_roots",
+                lambda changes: QTimer.singleShot(0, lambda: self._on_storage_roots_changed(changes))),
+            config_manager.subscribe("user.id", lambda _changes: QTimer.singleShot(0, self._on_user_changed)),
+        ]
+
+    def unsubscribe_config(self):
+        for unsubscribe in self._config_unsubscribes:
+            unsubscribe()
+        self._config_unsubscribes = []
+
+    def _selected_lab_id(self):
+        item = self.labs_list.currentItem() if hasattr(self, 'labs_list') else None
+        return item.data(Qt.ItemDataRole.UserRole) if item else None
+
+    def _on_storage_roots_changed(self, changes: Dict[str, Any]):
+        """Update the Lab Library root and status badge if the selected lab's root changed."""
+        lab_id = self._selected_lab_id()
+        if not lab_id:
+            return
+        own_key = f"lab.storage_roots.{lab_id}"
+        # Keys of other labs are irrelevant; parent keys ("lab", "lab.storage_roots") may cover ours
+        if not any(key == own_key or not key.startswith("lab.storage_roots.") for key in changes):
+            return
+        try:
+            from ..core.config_manager import get_lab_storage_root
+            lab_root = get_lab_storage_root(lab_id)
+            if hasattr(self, 'lab_library_edit'):
+                self.lab_library_edit.setText(str(lab_root) if lab_root else "")
+            self._update_lab_status_badge(lab_id)
+        except Exception as e:
+            self.log_bus.log(f"Error refreshing lab storage root: {e}", "error", "LabView")
+
+    def _on_user_changed(self):
+        """The lab list and member permissions depend on the active user."""
+        if self.lab_service:
+            self.refresh_lab_data()
 
     # --- Lifecycle hooks ---
     def on_services_ready(self, services):
@@ -235,6 +283,71 @@ class LabView(BaseView):
 
         # Note: Data loading happens in on_activated(), not during setup
 
+    def setup_lab_queries_page(self):
+        """Setup the Lab Queries page for aggregates across all lab projects."""
+        self.lab_queries_page = QWidget()
+        layout = self.setup_page_layout(self.lab_queries_page)
+
+        query_group, query_layout = self.create_form_section("Cross-Project Summary", layout)
+
+        self.lab_query_group_combo = QComboBox()
+        self.lab_query_group_combo.setProperty("class", "mus1-combo-box")
+        for label, key in [("Experiment Type", "experiment_type"), ("Project", "project"),
+                           ("Genotype", "genotype"), ("Processing Stage", "processing_stage"),
+                           ("Sex", "sex"), ("Experiment Subtype", "experiment_subtype")]:
+            self.lab_query_group_combo.addItem(label, key)
+        self.create_labeled_input_row("Group by:", self.lab_query_group_combo, query_layout)
+
+        self.lab_query_type_edit = QLineEdit()
+        self.lab_query_type_edit.setProperty("class", "mus1-text-input")
+        self.lab_query_type_edit.setPlaceholderText("All experiment types")
+        self.create_labeled_input_row("Experiment type:", self.lab_query_type_edit, query_layout)
+
+        button_row = self.create_button_row(layout)
+        run_btn = QPushButton("Run Query")
+        run_btn.setProperty("class", "mus1-primary-button")
+        run_btn.clicked.connect(self.handle_run_lab_query)
+        button_row.addWidget(run_btn)
+
+        self.lab_query_summary_label = QLabel("")
+        self.lab_query_summary_label.setWordWrap(True)
+        layout.addWidget(self.lab_query_summary_label)
+
+        self.lab_query_results_list = QListWidget()
+        self.lab_query_results_list.setProperty("class", "mus1-list-widget")
+        self.create_form_with_list("Results", self.lab_query_results_list, layout)
+
+        layout.addStretch(1)
+        self.add_page(self.lab_queries_page, "Lab Queries")
+
+    def handle_run_lab_query(self):
+        """Run the cross-project summary for the selected lab."""
+        from ..core.utils.formatting import format_bytes
+
+        current_lab_item = self.labs_list.currentItem() if hasattr(self, 'labs_list') else None
+        if not self.lab_service or not current_lab_item:
+            QMessageBox.warning(self, "Lab Queries", "Please select a lab first.")
+            return
+
+        lab_id = current_lab_item.data(Qt.ItemDataRole.UserRole)
+        group_by = self.lab_query_group_combo.currentData()
+        result = self.lab_service.summarize_lab_projects(
+            lab_id, group_by=group_by, experiment_type=self.lab_query_type_edit.text().strip()
+        )
+
+        self.lab_query_results_list.clear()
+        for row in result["rows"]:
+            group = row["group"] if row["group"] is not None else "(none)"
+            self.lab_query_results_list.addItem(QListWidgetItem(
+                f"{group}: {row['experiments']} experiments, {row['subjects']} subjects, "
+                f"{row['projects']} projects, {row['videos']} videos ({format_bytes(row['video_bytes'])})"
+            ))
+        summary = f"Queried {result['projects_queried']} project(s)."
+        if result["errors"]:
+            summary += f" Skipped {len(result['errors'])}: {', '.join(result['errors'])}"
+        self.lab_query_summary_label.setText(summary)
+        self.log_bus.log(summary, "info", "LabView")
+
     def setup_lab_library_page(self):
         """Setup the Lab Library page to browse shared recordings and lab subjects.
         The Lab Shared Library controls are placed first for visibility.
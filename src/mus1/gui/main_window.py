@@ -8,7 +8,7 @@ from .qt import (
     QAction,
     QIcon,
 )
-from .qt import Signal
+from .qt import Signal, QThread
 from .project_view import ProjectView
 from .subject_view import SubjectView
 from .experiment_view import ExperimentView
@@ -16,7 +16,7 @@ from .lab_view import LabView
 from .settings_view import SettingsView
 from .user_lab_selection_dialog import UserLabSelectionDialog
 from ..core.logging_bus import LoggingEventBus
-from ..core.service_factory import ProjectServiceFactory
+from ..core.service_factory import ProjectContextCache
 from .theme_manager import ThemeManager
 from ..core.setup_service import get_setup_service
 import logging
@@ -38,8 +38,28 @@ class GlobalServices:
             self._lab_service.set_services(get_setup_service())
         return self._lab_service
 
+class SnapshotThread(QThread):
+    """Runs a project snapshot task off the GUI thread, reporting copied pages."""
+
+    progress = Signal(int, int)
+
+    def __init__(self, task, parent=None):
+        super().__init__(parent)
+        self._task = task
+        self.result = None
+        self.error = None
+
+    def run(self):
+        try:
+            self.result = self._task(self.progress.emit)
+        except Exception as e:
+            self.error = e
+
 logger = logging.getLogger(__name__)
 
+# How often cached projects are checked against ProjectContextCache.idle_timeout
+IDLE_PROJECT_CHECK_MS = 60 * 1000
+
 class MainWindow(QMainWindow):
     """
     # Broadcast context changes (user/lab/project)
@@ -67,6 +87,7 @@ class MainWindow(QMainWindow):
         # Initialize project manager and services
         self.project_path = Path(project_path) if project_path else None
         self.service_factory = None
+        self.project_contexts = ProjectContextCache()
         self.selected_project_name = selected_project
         self.setup_completed = setup_completed
 
@@ -100,6 +121,12 @@ class MainWindow(QMainWindow):
         
         # Apply theme during initialization
         self.apply_theme()
+
+        # Follow configuration changes made elsewhere (CLI, other windows)
+        self._watch_config_changes()
+
+        # Close cached projects left idle, also while no other project is being opened
+        self._watch_idle_projects()
         
         # Set initial window title before project selection
         self.update_window_title()
@@ -384,8 +411,10 @@ class MainWindow(QMainWindow):
             return False
 
         try:
-            # Initialize project service factory (standardized pattern)
-            self.service_factory = ProjectServiceFactory(project_path)
+            # Reuse the project's services if it was opened recently and is unchanged on disk
+            self.service_factory = self.project_contexts.get(project_path)
+            self.service_factory.project_manager.snapshot_runner = self._run_snapshot
+            self._report_read_only(self.service_factory.project_manager)
 
             # Update UI state
             self.selected_project_name = project_name
@@ -444,8 +473,10 @@ class MainWindow(QMainWindow):
         try:
             project_name = project_path.name
 
-            # Initialize project service factory (standardized pattern)
-            self.service_factory = ProjectServiceFactory(project_path)
+            # Reuse the project's services if it was opened recently and is unchanged on disk
+            self.service_factory = self.project_contexts.get(project_path)
+            self.service_factory.project_manager.snapshot_runner = self._run_snapshot
+            self._report_read_only(self.service_factory.project_manager)
 
             # Update UI state
             self.selected_project_name = project_name
@@ -664,4 +695,96 @@ class MainWindow(QMainWindow):
             self.style().polish(self)
             self.propagate_theme_to_views(effective_theme)
 
+    def _watch_config_changes(self):
+        """Subscribe to theme changes and poll the config database for external writes."""
+        from .qt import QTimer
+        from ..core.config_manager import get_config_manager
+        self._config_manager = self.theme_manager.config_manager if self.theme_manager else get_config_manager()
+        # Deferred so a local change_theme() finishes applying before the check
+        self._config_unsubscribe = self._config_manager.subscribe(
+            "ui.theme", lambda _changes: QTimer.singleShot(0, self._on_theme_config_changed))
+        self._config_poll_timer = QTimer(self)
+        self._config_poll_timer.timeout.connect(self._poll_config_changes)
+        self._config_poll_timer.start(self._config_manager.POLL_INTERVAL_MS)
+
+    def _watch_idle_projects(self):
+        """Periodically close cached projects unused for their idle timeout."""
+        from .qt import QTimer
+        self._idle_projects_timer = QTimer(self)
+        self._idle_projects_timer.timeout.connect(self._evict_idle_projects)
+        self._idle_projects_timer.start(IDLE_PROJECT_CHECK_MS)
+
+    def _evict_idle_projects(self):
+        try:
+            closed = self.project_contexts.evict_idle()
+        except Exception as e:
+            self.log_bus.log(f"Closing idle projects failed: {e}", "warning", "MainWindow")
+            return
+        for key in closed:
+            self.log_bus.log(f"Closed idle project {key}", "info", "MainWindow")
+
+    def _poll_config_changes(self):
+        try:
+            self._config_manager.poll_changes()
+        except Exception as e:
+            self.log_bus.log(f"Config change check failed: {e}", "warning", "MainWindow")
+
+    def _on_theme_config_changed(self):
+        """Re-apply the theme if the configured one differs from what is shown."""
+        if not self.theme_manager:
+            return
+        effective_theme = self.theme_manager.get_effective_theme()
+        if effective_theme != self.property("theme"):
+            from .qt import QApplication
+            self.theme_manager.apply_theme(QApplication.instance())
+            self.apply_theme()
+
+    def _report_read_only(self, project_manager):
+        """Tell the user when a shared project is being written by someone else."""
+        if project_manager.read_only:
+            self.log_bus.log(f"Project opened read-only: {project_manager.read_only_reason}. "
+                             "Reopen it once they have closed it to make changes.", "warning", "MainWindow")
+
+    def _run_snapshot(self, reason: str, task):
+        """snapshot_runner for open projects: copy the database on a worker thread.
+
+        A window-modal progress dialog blocks input while a nested event loop
+        keeps the window painting; the bulk operation resumes once the copy is done.
+        """
+        from .qt import QEventLoop, QProgressDialog, Qt
+        thread = SnapshotThread(task, self)
+        dialog = QProgressDialog(f"Saving a project snapshot before {reason}...", "", 0, 0, self)
+        dialog.setWindowTitle("Project Snapshot")
+        dialog.setCancelButton(None)
+        dialog.setWindowModality(Qt.WindowModality.WindowModal)
+        dialog.setMinimumDuration(500)
+
+        def on_progress(done: int, total: int):
+            dialog.setMaximum(total)
+            dialog.setValue(done)
+
+        thread.progress.connect(on_progress)
+        loop = QEventLoop()
+        thread.finished.connect(loop.quit)
+        thread.start()
+        loop.exec()
+        thread.wait()
+        dialog.close()
+        thread.deleteLater()
+        if thread.error is not None:
+            raise thread.error
+        return thread.result
+
+    def closeEvent(self, event):
+        """Flush and close every open project before the window closes."""
+        self._config_poll_timer.stop()
+        self._idle_projects_timer.stop()
+        self._config_unsubscribe()
+        for view in [self.lab_view, self.project_view, self.subject_view, self.experiment_view, self.settings_view]:
+            if view and hasattr(view, 'unsubscribe_config'):
+                view.unsubscribe_config()
+        self.project_contexts.clear()
+        self.service_factory = None
+        super().closeEvent(event)
+
     # Additional methods for hooking up signals, responding to user actions, etc.
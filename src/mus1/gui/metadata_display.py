@@ -108,6 +108,27 @@ class MetadataTreeView(QTreeWidget):
         # New header includes Genotype and Colony columns
         self.setHeaderLabels(["Subject ID", "Sex", "Genotype", "Colony", "Experiments", "Recordings"])
 
+        # Group experiments by subject in a single pass
+        experiments_by_subject = {}
+        for exp in experiments_dict.values():
+            if isinstance(exp, dict):
+                exp_subject_id = exp.get('subject_id')
+            else:
+                exp_subject_id = getattr(exp, 'subject_id', None)
+            experiments_by_subject.setdefault(exp_subject_id, []).append(exp)
+
+        # Aggregate counts: one GROUP BY query each instead of one query per experiment
+        experiment_counts = {}
+        video_counts_by_experiment = {}
+        video_counts_by_subject = {}
+        if project_manager is not None:
+            try:
+                experiment_counts = project_manager.experiment_counts_by_subject()
+                video_counts_by_experiment = project_manager.video_counts_by_experiment()
+                video_counts_by_subject = project_manager.video_counts_by_subject()
+            except Exception:
+                pass
+
         for subject_id, subject in subjects_dict.items():
             item = SubjectTreeWidgetItem(self)
             # Disable editing to prevent data corruption - use proper workflows instead
@@ -126,31 +147,13 @@ class MetadataTreeView(QTreeWidget):
             item.setText(2, str(genotype_value))
             item.setText(3, str(colony_value))
 
-            # Count experiments
-            subject_experiments = []
-            for exp in experiments_dict.values():
-                if isinstance(exp, dict):
-                    exp_subject_id = exp.get('subject_id')
-                else:
-                    exp_subject_id = getattr(exp, 'subject_id', None)
-                if exp_subject_id == subject_id:
-                    subject_experiments.append(exp)
+            subject_experiments = experiments_by_subject.get(subject_id, [])
             # Column 4 is "Experiments"
-            item.setText(4, str(len(subject_experiments)))
+            item.setText(4, str(experiment_counts.get(subject_id, 0)))
+
+            # Recording count per subject - videos across all experiments of this subject
+            item.setText(5, str(video_counts_by_subject.get(subject_id, 0)))
 
-            # Recording count per subject - count videos for all experiments of this subject
-            rec_count = 0
-            if project_manager is not None:
-                try:
-                    for exp in subject_experiments:
-                        exp_id = exp.get('id') if isinstance(exp, dict) else getattr(exp, 'id', None)
-                        if exp_id:
-                            videos = project_manager.get_videos_for_experiment(exp_id)
-                            rec_count += len(videos)
-                except Exception:
-                    pass
-            item.setText(5, str(rec_count))
-            
             # Add experiment children
             for experiment in subject_experiments:
                 exp_item = SubjectTreeWidgetItem(item)
@@ -168,15 +171,8 @@ class MetadataTreeView(QTreeWidget):
                 exp_item.setText(4, str(exp_type))
 
                 # Column 5 – recordings per experiment
-                exp_rec_count = 0
-                if project_manager is not None and exp_id != 'Unknown':
-                    try:
-                        videos = project_manager.get_videos_for_experiment(exp_id)
-                        exp_rec_count = len(videos)
-                    except Exception:
-                        pass
-                exp_item.setText(5, str(exp_rec_count))
-        
+                exp_item.setText(5, str(video_counts_by_experiment.get(exp_id, 0)))
+
         # Expand all items for better visibility
         self.expandAll()
         
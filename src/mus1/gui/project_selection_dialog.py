@@ -319,13 +319,12 @@ class ProjectSelectionDialog(QDialog):
                 try:
                     project_manager.set_lab_id(chosen_lab_id)
                     # Add project to lab using SQL repository
-                    from ..core.schema import Database
+                    from ..core.schema import get_database
                     from ..core.repository import get_repository_factory
                     from ..core.config_manager import get_config_manager
 
                     config_manager = get_config_manager()
-                    db = Database(str(config_manager.db_path))
-                    db.create_tables()
+                    db = get_database(config_manager.db_path)
                     repo_factory = get_repository_factory(db)
                     repo_factory.labs.add_project(
                         lab_id=chosen_lab_id,
@@ -93,9 +93,11 @@ class ProjectView(BaseView):
         self.setup_project_settings_page()
         self.setup_scan_ingest_page()
         self.setup_targets_page()
+        self.setup_storage_reclaim_page()
         # Add navigation buttons for newly added pages to keep nav and pages aligned
         self.add_navigation_button("Scan & Ingest")
         self.add_navigation_button("Targets")
+        self.add_navigation_button("Storage Reclaim")
         self.change_page(0)
 
     # --- Lifecycle hooks ---
@@ -1329,6 +1331,70 @@ class ProjectView(BaseView):
 
         self.refresh_targets_admin_list()
 
+    def setup_storage_reclaim_page(self):
+        """Setup a page reporting space held by duplicate videos."""
+        self.reclaim_page = QWidget()
+        layout = self.setup_page_layout(self.reclaim_page)
+
+        self.reclaim_summary_label = QLabel("Build the report to see reclaimable space.")
+        self.reclaim_summary_label.setWordWrap(True)
+        layout.addWidget(self.reclaim_summary_label)
+
+        self.reclaim_roots_list = QListWidget()
+        self.reclaim_roots_list.setProperty("class", "mus1-list-widget")
+        self.create_form_list_section("Reclaimable by Root", self.reclaim_roots_list, layout)
+
+        self.reclaim_groups_list = QListWidget()
+        self.reclaim_groups_list.setProperty("class", "mus1-list-widget")
+        self.create_form_list_section("Largest Duplicate Groups", self.reclaim_groups_list, layout)
+
+        btn_row = self.create_button_row(layout)
+        report_btn = QPushButton("Build Report")
+        report_btn.setProperty("class", "mus1-primary-button")
+        report_btn.clicked.connect(self.handle_build_reclaim_report)
+        btn_row.addWidget(report_btn)
+
+        layout.addStretch(1)
+        self.add_page(self.reclaim_page, "Storage Reclaim")
+
+    def handle_build_reclaim_report(self):
+        from ..core.utils.formatting import format_bytes
+        try:
+            pm = self.window().project_manager
+            if not pm:
+                QMessageBox.warning(self, "Storage Reclaim", "No project is currently loaded. Please load a project first.")
+                return
+            report = pm.storage_reclaim_report(top=50)
+        except Exception as e:
+            self.log_bus.log(f"Storage reclaim report failed: {e}", "error", "ProjectView")
+            QMessageBox.critical(self, "Storage Reclaim", f"Failed to build report: {e}")
+            return
+
+        summary = (
+            f"{report['groups']} duplicate group(s), {report['redundant_copies']} redundant copies, "
+            f"{format_bytes(report['reclaimable_bytes'])} reclaimable."
+        )
+        if report['suspect_groups']:
+            summary += (
+                f" {report['suspect_groups']} group(s) share a sample hash but differ in size "
+                f"({format_bytes(report['suspect_bytes'])}); likely collisions, not counted."
+            )
+        self.reclaim_summary_label.setText(summary)
+
+        self.reclaim_roots_list.clear()
+        for root, size in sorted(report['by_root'].items(), key=lambda kv: kv[1], reverse=True):
+            self.reclaim_roots_list.addItem(QListWidgetItem(f"{format_bytes(size):>12}  {root}"))
+
+        self.reclaim_groups_list.clear()
+        for group in report['top_groups'] + report['suspect']:
+            flag = "  [size mismatch]" if group['size_mismatch'] else ""
+            item = QListWidgetItem(
+                f"{format_bytes(group['wasted_bytes']):>12}  x{group['count']}  keep {group['keep']}{flag}"
+            )
+            item.setToolTip("\n".join(v['path'] for v in group['videos']))
+            self.reclaim_groups_list.addItem(item)
+        self.log_bus.log(summary, "info", "ProjectView")
+
     def refresh_targets_admin_list(self):
         if not hasattr(self, 'targets_admin_list'):
             return
@@ -38,6 +38,7 @@ if QT_BACKEND == "PySide6":
         QSize,
         QThread,
         QObject,
+        QEventLoop,
         Signal,
     )
     from PySide6.QtGui import (
@@ -82,6 +83,7 @@ if QT_BACKEND == "PySide6":
         QScrollArea,
         QSlider,
         QProgressBar,
+        QProgressDialog,
         QTreeWidget,
         QTreeWidgetItem,
         QAbstractItemView,
@@ -107,6 +109,7 @@ elif QT_BACKEND == "PyQt6":
         QSize,
         QThread,
         QObject,
+        QEventLoop,
         pyqtSignal as Signal,
     )
     from PyQt6.QtGui import (
@@ -151,6 +154,7 @@ elif QT_BACKEND == "PyQt6":
         QScrollArea,
         QSlider,
         QProgressBar,
+        QProgressDialog,
         QTreeWidget,
         QTreeWidgetItem,
         QAbstractItemView,
@@ -197,10 +201,10 @@ __all__ = [
     # Widgets/layouts
     "QWidget", "QVBoxLayout", "QHBoxLayout", "QGridLayout", "QSplitter", "QStackedWidget", "QLabel", "QGroupBox", "QFrame",
     "QPushButton", "QListWidget", "QListWidgetItem", "QFormLayout", "QLineEdit", "QComboBox", "QDateTimeEdit", "QCheckBox", "QTextEdit",
-    "QScrollArea", "QSlider", "QProgressBar",
+    "QScrollArea", "QSlider", "QProgressBar", "QProgressDialog",
     "QTreeWidget", "QTreeWidgetItem", "QAbstractItemView", "QSizePolicy", "QHeaderView", "QTableWidget", "QTableWidgetItem", "QSpinBox", "QDoubleSpinBox", "QLayout",
     "QWizard", "QWizardPage", "QDialogButtonBox", "QRadioButton", "QButtonGroup",
     # Core types/utilities
-    "QTimer", "QDateTime", "QSize", "QThread", "QObject", "QFileDialog", "QPalette", "QColor", "QFont", "QTextCharFormat", "QPainter", "QImage", "QBrush", "QTextOption",
+    "QTimer", "QDateTime", "QSize", "QThread", "QObject", "QEventLoop", "QFileDialog", "QPalette", "QColor", "QFont", "QTextCharFormat", "QPainter", "QImage", "QBrush", "QTextOption",
 ]
 
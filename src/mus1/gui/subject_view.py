@@ -189,6 +189,17 @@ class SubjectView(BaseView):
         
         # Create a grid for displaying all subjects
         subjects_group, subjects_layout = self.create_form_section("All Subjects", add_layout)
+        self.subject_search_edit = QLineEdit()
+        self.subject_search_edit.setProperty("class", "mus1-text-input")
+        self.subject_search_edit.setPlaceholderText("Search subjects (e.g. S-01, genotype:ko, treatment:saline, notes:lesion)")
+        self.subject_search_edit.setClearButtonEnabled(True)
+        subjects_layout.addWidget(self.subject_search_edit)
+        # Debounce typing so each keystroke does not hit the database
+        self._subject_search_timer = QTimer(self)
+        self._subject_search_timer.setSingleShot(True)
+        self._subject_search_timer.setInterval(250)
+        self._subject_search_timer.timeout.connect(self.refresh_subject_list_display)
+        self.subject_search_edit.textChanged.connect(lambda _text: self._subject_search_timer.start())
         self.subjects_grid = MetadataGridDisplay()
         subjects_layout.addWidget(self.subjects_grid)
         # Enable quick edit via double-click activation
@@ -334,6 +345,12 @@ class SubjectView(BaseView):
         # Get subjects using GUI services
         subjects_display_dto = self.subject_service.get_subjects_for_display()
 
+        # Narrow to full-text search matches when a query is entered
+        query = self.subject_search_edit.text().strip() if hasattr(self, 'subject_search_edit') else ""
+        if query:
+            matching_ids = set(self.subject_service.search_subject_ids(query))
+            subjects_display_dto = [s for s in subjects_display_dto if s.id in matching_ids]
+
         # Log the refresh activity
         self.log_bus.log(f"Refreshing subject list: {len(subjects_display_dto)} subjects found", "info", "SubjectView")
 
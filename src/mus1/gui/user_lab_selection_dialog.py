@@ -6,7 +6,7 @@ from .qt import (
     QGridLayout, QFrame, QListWidget, QListWidgetItem, QFileDialog, QWidget, QApplication, QCheckBox,
     Qt, QSize, QPixmap, QPalette, QBrush, QColor, QPainter, QImage, QIcon
 )
-from ..core.config_manager import get_config, set_config
+from ..core.config_manager import get_config, set_config, config_batch
 from ..core.setup_service import get_setup_service
 
 
@@ -250,10 +250,11 @@ class UserLabSelectionDialog(QDialog):
 
         # Persist selections to config
         try:
-            set_config("app.selected_user_id", self.selected_user_id, scope="user")
-            set_config("app.selected_lab_id", self.selected_lab_id, scope="user")
-            if self.selected_project_path:
-                set_config("app.selected_project_path", self.selected_project_path, scope="user")
+            with config_batch():
+                set_config("app.selected_user_id", self.selected_user_id, scope="user")
+                set_config("app.selected_lab_id", self.selected_lab_id, scope="user")
+                if self.selected_project_path:
+                    set_config("app.selected_project_path", self.selected_project_path, scope="user")
         except Exception:
             # Silently ignore persistence errors
             pass
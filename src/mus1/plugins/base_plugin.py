@@ -1,7 +1,6 @@
 from abc import ABC, abstractmethod
 from typing import Optional, Dict, Any, List, Set, Tuple, Union
 from pathlib import Path
-import pandas as pd
 
 # Forward reference for type hint
 from typing import TYPE_CHECKING
@@ -111,6 +110,23 @@ class BasePlugin(ABC):
         """
         return {}
 
+    def cache_inputs(self, experiment: Experiment, plugin_service: 'PluginService',
+                     capability: str, project_config: ProjectConfig) -> Optional[Dict[str, Any]]:
+        """
+        Return the inputs of a capability that results are memoized on, beyond the defaults.
+
+        Memoization is opt-in. The cache key already covers the plugin name and version,
+        the capability, the experiment record (including its processing stage), the
+        hashes of its linked videos, the experiment's other stored plugin results and the
+        analysis-relevant project settings. Override this to enable caching and return
+        anything else the result depends on (JSON-serialisable): parameters, hashes of
+        files read, and so on; {} if there is nothing else. Bump the plugin version when
+        the analysis code changes.
+
+        Default: None, results are always recomputed.
+        """
+        return None
+
     # -------------------------------
     # Project-level action contracts
     # -------------------------------
@@ -0,0 +1,37 @@
+"""Shared fixtures: a temporary project database filled with experiments."""
+
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+from mus1.core.metadata import ProcessingStage, Sex, SubjectDesignation
+from mus1.core.schema import ExperimentModel, SubjectModel, dispose_database, get_database
+
+BASE_DATE = datetime(2024, 1, 1)
+
+
+def populate(db, count: int) -> list:
+    """Insert count subjects with one experiment each; returns the experiment ids."""
+    with db.engine.begin() as conn:
+        conn.execute(SubjectModel.__table__.insert(), [
+            {"id": f"S{i:03d}", "colony_id": None, "sex": Sex.MALE, "designation": SubjectDesignation.EXPERIMENTAL,
+             "birth_date": BASE_DATE, "death_date": None, "individual_genotype": "WT", "individual_treatment": None,
+             "notes": "", "date_added": BASE_DATE}
+            for i in range(count)
+        ])
+        conn.execute(ExperimentModel.__table__.insert(), [
+            {"id": f"E{i:03d}", "subject_id": f"S{i:03d}", "experiment_type": "OpenField",
+             "date_recorded": BASE_DATE + timedelta(minutes=i), "processing_stage": ProcessingStage.RECORDED,
+             "experiment_subtype": None, "notes": "", "date_added": BASE_DATE}
+            for i in range(count)
+        ])
+    return [f"E{i:03d}" for i in range(count)]
+
+
+@pytest.fixture
+def project_db(tmp_path: Path):
+    db_path = tmp_path / "mus1.db"
+    db = get_database(db_path)
+    yield db
+    dispose_database(db_path)
@@ -0,0 +1,88 @@
+"""BatchAnalysisExecutor: results, worker start-up failures."""
+
+import multiprocessing
+import os
+from datetime import datetime
+
+import pytest
+
+from conftest import populate
+from mus1.core.batch_analysis import MAX_IDLE_RESPAWNS, BatchAnalysisExecutor
+from mus1.core.metadata import PluginMetadata, ProjectConfig
+from mus1.core.plugin_manager_clean import PluginManagerClean
+from mus1.plugins.base_plugin import BasePlugin
+
+
+class CountingPlugin(BasePlugin):
+    """Stores the experiment id; in workers, MUS1_TEST_WORKER_INIT can make start-up fail."""
+
+    def __init__(self):
+        super().__init__()
+        if multiprocessing.parent_process() is not None:
+            mode = os.environ.get("MUS1_TEST_WORKER_INIT")
+            if mode == "exit":
+                os._exit(3)
+            if mode == "raise":
+                raise RuntimeError("cannot start")
+
+    def plugin_self_metadata(self) -> PluginMetadata:
+        return PluginMetadata(name="counting", date_created=datetime(2024, 1, 1), version="1.0",
+                              description="test plugin", author="tests", plugin_type="analysis",
+                              analysis_capabilities=["count"])
+
+    def validate_experiment(self, experiment, project_config):
+        pass
+
+    def readable_data_formats(self):
+        return []
+
+    def analysis_capabilities(self):
+        return ["count"]
+
+    def analyze_experiment(self, experiment, plugin_service, capability, project_config):
+        return {"status": "success", "capability_executed": capability,
+                "result_data": {"experiment": experiment.id}}
+
+
+@pytest.fixture
+def executor_for(project_db):
+    manager = PluginManagerClean(project_db)
+    manager.register_plugin(CountingPlugin())
+
+    def make(**kwargs):
+        return BatchAnalysisExecutor(manager, "counting", "count", ProjectConfig(name="tests"), **kwargs)
+    return make
+
+
+def test_runs_every_experiment_and_stores_results(project_db, executor_for):
+    ids = populate(project_db, 5)
+    report = executor_for(workers=2).run(ids)
+
+    assert report["success"]
+    assert report["succeeded"] == 5
+    assert [r["experiment_id"] for r in report["results"]] == ids
+    stored = executor_for().plugin_service.get_analysis_result("E003", "counting", "count")
+    assert stored.status == "success"
+    assert stored.result_data == {"experiment": "E003"}
+
+
+def test_worker_crashing_on_startup_is_not_respawned_forever(project_db, executor_for, monkeypatch):
+    ids = populate(project_db, 4)
+    monkeypatch.setenv("MUS1_TEST_WORKER_INIT", "exit")
+    report = executor_for(workers=1).run(ids)
+
+    assert not report["success"]
+    assert f"{MAX_IDLE_RESPAWNS} times in a row" in report["message"]
+    assert report["failed"] == 4
+    assert {r["status"] for r in report["results"]} == {"failed"}
+
+
+def test_plugin_init_failure_reports_pending_experiments(project_db, executor_for, monkeypatch):
+    ids = populate(project_db, 4)
+    monkeypatch.setenv("MUS1_TEST_WORKER_INIT", "raise")
+    report = executor_for(workers=2).run(ids)
+
+    assert not report["success"]
+    assert "cannot start" in report["message"]
+    assert [r["experiment_id"] for r in report["results"]] == ids
+    assert all(r["status"] == "failed" and "cannot start" in r["error"] for r in report["results"])
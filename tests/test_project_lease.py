@@ -0,0 +1,137 @@
+"""Project write lease: exclusivity, expiry, renewal, release, read-only fallback."""
+
+import json
+import time
+
+import pytest
+
+from mus1.core.metadata import Subject
+from mus1.core.project_lease import LEASE_FILENAME, ProjectLease, ProjectReadOnlyError
+from mus1.core.project_manager_clean import ProjectManagerClean
+from mus1.core.schema import dispose_database
+
+
+def write_record(project_dir, owner="other-host:1:abc", expires_in=60.0):
+    (project_dir / LEASE_FILENAME).write_text(json.dumps(
+        {"owner": owner, "host": "other-host", "pid": 1, "user": "someone", "expires_at": time.time() + expires_in}))
+
+
+def test_only_one_client_holds_the_lease(tmp_path):
+    first, second = ProjectLease(tmp_path), ProjectLease(tmp_path)
+    try:
+        assert first.try_acquire()
+        assert not second.try_acquire()
+        first.release()
+        assert not (tmp_path / LEASE_FILENAME).exists()
+        assert second.try_acquire()
+    finally:
+        first.release()
+        second.release()
+
+
+def test_expired_lease_is_taken_over(tmp_path):
+    write_record(tmp_path, expires_in=-1)
+    lease = ProjectLease(tmp_path)
+    try:
+        assert lease.try_acquire()
+        assert lease.read()["owner"] == lease.owner
+        assert list(tmp_path.iterdir()) == [tmp_path / LEASE_FILENAME]  # no tombstones left behind
+    finally:
+        lease.release()
+
+
+def test_heartbeat_renews_the_lease_past_its_ttl(tmp_path):
+    lease = ProjectLease(tmp_path, ttl=0.3)
+    try:
+        assert lease.try_acquire()
+        time.sleep(0.8)
+        assert lease.verify()
+        assert not ProjectLease(tmp_path, ttl=0.3).try_acquire()
+    finally:
+        lease.release()
+
+
+def test_lost_lease_is_reported_and_release_keeps_the_new_holder(tmp_path):
+    lease = ProjectLease(tmp_path)
+    lost = []
+    lease.subscribe(lambda: lost.append(True))
+    assert lease.try_acquire()
+
+    write_record(tmp_path, owner="thief")
+    assert not lease.verify()
+    assert lost == [True] and not lease.held
+
+    lease.release()
+    assert lease.read()["owner"] == "thief"
+
+
+# ===========================================
+# PROJECT MANAGER
+# ===========================================
+
+@pytest.fixture
+def shared_project(tmp_path):
+    """A project directory inside its shared root; yields a function opening it."""
+    project_dir = tmp_path / "shared" / "Projects" / "lab_project"
+    project_dir.mkdir(parents=True)
+    managers = []
+
+    def open_project():
+        pm = ProjectManagerClean(project_dir)
+        managers.append(pm)
+        return pm
+
+    pm = open_project()
+    pm.set_shared_root(tmp_path / "shared")
+    pm.cleanup()
+    yield project_dir, open_project
+    for pm in managers:
+        pm.cleanup()
+    dispose_database(project_dir / "mus1.db")
+
+
+def test_shared_project_takes_the_lease_and_releases_it_on_cleanup(shared_project):
+    project_dir, open_project = shared_project
+    pm = open_project()
+
+    assert pm.write_lease is not None and not pm.read_only
+    pm.update_master_body_parts(["nose"])
+    assert pm.get_master_body_parts() == ["nose"]
+    pm.cleanup()
+    assert not (project_dir / LEASE_FILENAME).exists()
+
+
+def test_project_held_elsewhere_opens_read_only(shared_project):
+    project_dir, open_project = shared_project
+    write_record(project_dir)
+    pm = open_project()
+
+    assert pm.read_only and pm.write_lease is None
+    assert pm.list_subjects() == []
+    with pytest.raises(ProjectReadOnlyError, match="someone on other-host"):
+        pm.add_subject(Subject(id="SUB001"))
+    with pytest.raises(ProjectReadOnlyError):
+        pm.update_master_body_parts(["nose"])
+    # Writes that bypass the manager are refused by the database
+    with pytest.raises(Exception, match="readonly"):
+        pm.repos.subjects.save(Subject(id="SUB002"))
+
+
+def test_losing_the_lease_switches_the_project_to_read_only(shared_project):
+    project_dir, open_project = shared_project
+    pm = open_project()
+    write_record(project_dir, owner="thief")
+
+    with pytest.raises(ProjectReadOnlyError, match="lost"):
+        pm.add_subject(Subject(id="SUB001"))
+    assert pm.read_only
+
+
+def test_released_lease_stops_writes(shared_project):
+    from mus1.core.project_lease import release_project_leases
+    _, open_project = shared_project
+    pm = open_project()
+    release_project_leases()  # what the CLI daemon does after each command
+
+    with pytest.raises(ProjectReadOnlyError):
+        pm.update_master_body_parts(["nose"])
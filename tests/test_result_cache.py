@@ -0,0 +1,134 @@
+"""Memoized plugin results: hits, misses, invalidation and what the key depends on."""
+
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from conftest import populate
+from mus1.core.metadata import PluginMetadata, ProcessingStage, ProjectConfig, VideoFile
+from mus1.core.plugin_manager_clean import PluginManagerClean
+from mus1.core.schema import ExperimentModel
+from mus1.plugins.base_plugin import BasePlugin
+
+
+class TallyPlugin(BasePlugin):
+    """Counts its runs; memoized only when constructed with cacheable=True."""
+
+    def __init__(self, name: str = "tally", cacheable: bool = True):
+        super().__init__()
+        self.name = name
+        self.cacheable = cacheable
+        self.runs = 0
+
+    def plugin_self_metadata(self) -> PluginMetadata:
+        return PluginMetadata(name=self.name, date_created=datetime(2024, 1, 1), version="1.0",
+                              description="test plugin", author="tests", plugin_type="analysis",
+                              analysis_capabilities=["tally"])
+
+    def validate_experiment(self, experiment, project_config):
+        pass
+
+    def readable_data_formats(self):
+        return []
+
+    def analysis_capabilities(self):
+        return ["tally"]
+
+    def cache_inputs(self, experiment, plugin_service, capability, project_config):
+        return {} if self.cacheable else None
+
+    def analyze_experiment(self, experiment, plugin_service, capability, project_config):
+        self.runs += 1
+        return {"status": "success", "capability_executed": capability,
+                "result_data": {"run": self.runs},
+                "result_arrays": {"track": np.arange(6, dtype=np.float32)}}
+
+
+@pytest.fixture
+def manager(project_db):
+    populate(project_db, 2)
+    manager = PluginManagerClean(project_db)
+    manager.register_plugin(TallyPlugin())
+    return manager
+
+
+CONFIG = ProjectConfig(name="tests")
+
+
+def run(manager, experiment_id="E000", plugin="tally", **kwargs):
+    return manager.run_plugin_analysis(experiment_id, plugin, "tally", CONFIG, **kwargs)
+
+
+def link_video(manager, experiment_id: str, video_hash: str, path: str = "/videos/a.mp4"):
+    repos = manager.plugin_service.repos
+    repos.videos.save(VideoFile(path=Path(path), hash=video_hash, size_bytes=1, last_modified=0.0))
+    repos.experiments.add_video_to_experiment_by_path(experiment_id, Path(path))
+
+
+def test_second_run_is_a_hit_with_the_same_response_shape(manager):
+    miss = run(manager)
+    hit = run(manager)
+
+    assert not miss["cached"] and hit["cached"]
+    assert manager.get_plugin_by_name("tally").runs == 1
+    assert hit.keys() == miss.keys()
+    assert hit["result_data"] == miss["result_data"] == {"run": 1}
+    assert np.array_equal(hit["result_arrays"]["track"], miss["result_arrays"]["track"])
+
+
+def test_results_are_per_experiment_and_recompute_bypasses_the_cache(manager):
+    run(manager, "E000")
+    assert not run(manager, "E001")["cached"]
+    assert not run(manager, "E000", use_cache=False)["cached"]
+    assert manager.get_plugin_by_name("tally").runs == 3
+
+
+def test_plugins_that_do_not_opt_in_are_never_memoized(manager):
+    manager.register_plugin(TallyPlugin(name="plain", cacheable=False))
+    run(manager, plugin="plain")
+
+    assert not run(manager, plugin="plain")["cached"]
+    assert manager.get_plugin_by_name("plain").runs == 2
+
+
+def test_invalidation_forces_a_recompute(manager):
+    run(manager, "E000")
+    run(manager, "E001")
+
+    assert manager.plugin_service.invalidate_cached_results(["E000"]) == 1
+    assert not run(manager, "E000")["cached"]
+    assert run(manager, "E001")["cached"]
+
+
+def test_key_changes_when_a_linked_video_hash_changes(manager):
+    link_video(manager, "E000", "hash-1")
+    run(manager)
+    assert run(manager)["cached"]
+
+    # Same file path, new content
+    link_video(manager, "E000", "hash-2")
+    assert not run(manager)["cached"]
+    assert run(manager)["cached"]
+
+
+def test_key_changes_with_processing_stage_and_upstream_results(manager, project_db):
+    run(manager)
+    with project_db.engine.begin() as conn:
+        conn.execute(ExperimentModel.__table__.update().where(ExperimentModel.id == "E000")
+                     .values(processing_stage=ProcessingStage.TRACKED))
+    assert not run(manager)["cached"]
+
+    # A new tracking result on the experiment is an input too
+    manager.plugin_service.save_analysis_result("E000", "tracker", "load_tracking", {"rows": 10})
+    assert not run(manager)["cached"]
+    assert run(manager)["cached"]
+
+
+def test_drop_tables_removes_the_cache_table(manager, project_db):
+    run(manager)
+    project_db.drop_tables()
+    with project_db.engine.connect() as conn:
+        tables = {row[0] for row in conn.exec_driver_sql("SELECT name FROM sqlite_master WHERE type='table'")}
+    assert "plugin_result_cache" not in tables
@@ -0,0 +1,58 @@
+"""Automatic snapshots before bulk project operations."""
+
+import threading
+
+import pytest
+
+from mus1.core.project_manager_clean import ProjectManagerClean
+from mus1.core.schema import dispose_database
+
+
+@pytest.fixture
+def project(tmp_path):
+    pm = ProjectManagerClean(tmp_path)
+    yield pm
+    pm.cleanup()
+    dispose_database(pm.db_path)
+
+
+def test_auto_snapshot_runs_on_the_calling_thread_by_default(project):
+    project.register_unlinked_videos(iter([("/videos/a.mp4", "hash-a")]))
+    project.register_unlinked_videos(iter([]))
+
+    reasons = [snapshot["reason"] for snapshot in project.list_snapshots()]
+    assert reasons == ["video-registration", "video-registration"]
+
+
+def test_snapshot_runner_copies_before_the_operation_continues(project):
+    calls = []
+
+    def runner(reason, task):
+        # What the GUI does: run the copy on another thread and wait for it
+        result = {}
+
+        def copy():
+            result["info"] = task(lambda done, total: None)
+            result["thread"] = threading.current_thread()
+
+        worker = threading.Thread(target=copy)
+        worker.start()
+        worker.join()
+        calls.append((reason, result["thread"] is worker))
+        return result["info"]
+
+    project.snapshot_runner = runner
+    project.register_unlinked_videos(iter([("/videos/a.mp4", "hash-a")]))
+
+    assert calls == [("video-registration", True)]
+    snapshot, = project.list_snapshots()
+    assert snapshot["reason"] == "video-registration"
+    assert project.repos.videos.find_by_hash("hash-a") is not None
+
+
+def test_failing_snapshot_does_not_block_the_operation(project):
+    def runner(reason, task):
+        raise OSError("disk full")
+
+    project.snapshot_runner = runner
+    assert project.register_unlinked_videos(iter([("/videos/a.mp4", "hash-a")])) == 1